@@ -1,13 +1,32 @@
-from openant.easy.node import Node
-from openant.devices import ANTPLUS_NETWORK_KEY
-from openant.devices.heart_rate import HeartRate, HeartRateData
-
+import time
 import threading
 
+try:
+    from openant.easy.node import Node
+    from openant.devices import ANTPLUS_NETWORK_KEY
+    from openant.devices.heart_rate import HeartRate, HeartRateData
+except ImportError:
+    print("Das Modul 'openant' konnte nicht importiert werden. ANT+ Herzfrequenz ist nicht verfügbar.")
+    Node = None
+
+from raw_log import EVENT_HEART_RATE
+
 
 class HeartRateSensor:
-    def __init__(self):
+    def __init__(self, backend=None):
+        """`backend`: optionale Sensorquelle aus `sensor_backends` statt ANT+ (Simulation, Wiedergabe)."""
         self.current_heart_rate = 0
+        self.backend = backend
+        self.node = None
+        self.raw_log = None  # optional RawLogWriter: jede Meldung des Sensors wird mitgeschrieben
+        self.clock_ns = backend.clock_ns if backend is not None else time.perf_counter_ns  # wie bei den Flanken
+        if backend is not None:
+            backend.heart_rate_sink = self._set_heart_rate
+            backend.start()
+            return
+        if Node is None:
+            return  # ohne openant bleibt die Herzfrequenz 0
+
         self.node = Node()
         self.node.set_network_key(0x00, ANTPLUS_NETWORK_KEY)
         self.device = HeartRate(self.node, device_id=0)
@@ -26,7 +45,7 @@ class HeartRateSensor:
 
     def _on_device_data(self, page: int, page_name: str, data):
         if isinstance(data, HeartRateData):
-            self.current_heart_rate = data.heart_rate
+            self._set_heart_rate(data.heart_rate)
 
     def _run_node(self):
         try:
@@ -34,10 +53,20 @@ class HeartRateSensor:
         except Exception as e:
             print(f"Error in heart rate sensor: {e}")
 
+    def _set_heart_rate(self, heart_rate):
+        self.current_heart_rate = heart_rate
+        raw_log = self.raw_log
+        if raw_log is not None:
+            raw_log.append(self.clock_ns(), EVENT_HEART_RATE, heart_rate)
+
     def get_heart_rate(self):
         return self.current_heart_rate
 
     def stop(self):
+        if self.backend is not None:
+            self.backend.stop()
+        if self.node is None:
+            return
         try:
             self.device.close_channel()
             self.node.stop()
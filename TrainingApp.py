@@ -14,18 +14,23 @@ from datetime import datetime
 
 
 # Third-party library imports
-import usb.util
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import numpy as np
+# matplotlib wird erst beim ersten Aufbau von StartPage/GraphsPage geladen (schnellerer Start)
 
 # Local application imports
 from HeartRateSensor import HeartRateSensor
 from rpm_calculator import RPMCalculator
 from cadence_sensor_manager import CadenceSensorManager
+import sensor_backends
 #from CalculationEngine import CalculationEngine
 from TrainingDataManager import TrainingDataManager
+from sampling_scheduler import TkSamplingScheduler
+from acquisition import AcquisitionThread
+import power_model
+from live_chart import LiveStripChart
+from decimation import pixel_width, minmax_decimate
+from session_trends import trend_points, DEFAULT_LAST_SESSIONS
+from session_rollups import choose_tier, envelope
+from background_jobs import BackgroundJobs
 
 
 class TrainingApp(tk.Tk):
@@ -45,17 +50,19 @@ class TrainingApp(tk.Tk):
         self.frames = {}
         self.resistance_level = 1
         self.cadence = 0
-        self.power_values = []  # To store power values for average calculation
         self.total_distance = 0.0  # Initialize total distance
 
-        # Initialize training manager
-        self.training_manager = TrainingDataManager()
-        self.training_sessions = self.training_manager.load_training_sessions()  # gets data from saved files
+        # Initialize training manager (Trainings werden erst nach dem ersten Anzeigen geladen)
+        self.training_manager = TrainingDataManager()  # gemeinsam für alle Seiten, hält auch den Session-Katalog
+        # Speichern, Laden und Löschen laufen im Hintergrund, damit die Anzeige nicht einfriert
+        self.jobs = BackgroundJobs(self)
 
         # Initialize the sensors
-        self.sensor_manager = CadenceSensorManager()
+        # BERKELBIKE_SENSORS=synthetic / replay:<datei> ersetzt die Hardware (siehe sensor_backends)
+        sensor_backend = sensor_backends.from_environment()
+        self.sensor_manager = CadenceSensorManager(backend=sensor_backend)
         self.sensor_manager.start_SensorRead()
-        self.heart_rate_sensor = HeartRateSensor()
+        self.heart_rate_sensor = HeartRateSensor(backend=sensor_backend)
 
         # Create top navigation bar first (will stay on top)
         top_nav = ttk.Frame(self)
@@ -78,24 +85,51 @@ class TrainingApp(tk.Tk):
         #container.grid_columnconfigure(0, weight=1)
 
 
-        # Create and pack frames
-        for F in (StartPage, TrainingPage, StatisticsPage, GraphsPage):
-            page_name = F.__name__
-            frame = F(parent=container, controller=self)
-            self.frames[page_name] = frame
-            frame.pack(fill="both", expand=True)  # Change grid() to pack()
+        # Nur die TrainingPage wird sofort gebaut, die anderen Seiten beim ersten show_frame()
+        self.page_container = container
+        self.page_classes = {F.__name__: F for F in (StartPage, TrainingPage, StatisticsPage, GraphsPage)}
 
         # Show initial frame
         self.show_frame("TrainingPage")
-
-    def get_next_training_name(self):
-        """Gibt den nächsten Trainingsnamen basierend auf Datum & Uhrzeit zurück."""
-        return time.strftime("%Y-%m-%d %H:%M:%S")
+        self.after_idle(self.load_sessions)
+
+    def load_sessions(self, recover=True):
+        """Lädt die Übersicht im Hintergrund (beim Start nachdem die TrainingPage schon angezeigt wird).
+
+        Nach Speichern/Löschen ist das nicht nötig, dann wird der Katalog direkt angepasst.
+        """
+        def work():
+            if recover:
+                self.training_manager.recover_partial_sessions()  # abgebrochene Trainings (Stromausfall) retten
+            return self.training_manager.load_training_sessions()  # gets data from saved files
+
+        # set_sessions im Tk-Thread, die Seiten aktualisieren sich über ihre Katalog-Abos
+        self.jobs.submit(work, on_done=self.training_manager.set_sessions, key="load_sessions",
+                         description="Loading trainings...")
+
+    @property
+    def training_sessions(self):
+        """Alle Trainings, nach Datum sortiert (Katalog des TrainingDataManager)."""
+        return self.training_manager.sessions
+
+    def show_job_status(self, text):
+        self.status_label.config(text=text)
+
+    def get_frame(self, page_name):
+        """Gibt die Seite zurück und baut sie beim ersten Aufruf."""
+        frame = self.frames.get(page_name)
+        if frame is None:
+            page_class = self.page_classes.get(page_name)
+            if page_class is None:
+                return None
+            frame = page_class(parent=self.page_container, controller=self)
+            self.frames[page_name] = frame
+        return frame
 
     def show_frame(self, page_name):
         #print(f"DEBUG: show_frame({page_name}) wird aufgerufen.")
 
-        if page_name not in self.frames:
+        if self.get_frame(page_name) is None:
             print(f"ERROR: Frame {page_name} not found!")
             return
 
@@ -123,6 +157,11 @@ class TrainingApp(tk.Tk):
         logo_label.image = logo_image
         logo_label.pack(side="left")
 
+        # Statusanzeige für Hintergrundarbeit (Speichern, Laden, ...)
+        self.status_label = ttk.Label(top_nav_frame, text="", foreground='white', font=("Helvetica", 10))
+        self.status_label.pack(side="left", padx=10)
+        self.jobs.add_status_listener(self.show_job_status)
+
         exit_image = tk.PhotoImage(file="/home/pi/MedUniTrainer/images/exit.png")
         exit_button = ttk.Button(top_nav_frame, image=exit_image, style='Navigation.TButton', command=self.confirm_exit)
         exit_button.image = exit_image
@@ -182,19 +221,23 @@ class TrainingApp(tk.Tk):
 
     def quit_app(self):
         # Stoppe alle Threads und führe eine saubere Beendigung durch
+        self.frames["TrainingPage"].stop_acquisition()  # laufendes Training bleibt als Aufnahme erhalten
         if self.sensor_manager:
             self.sensor_manager.stop()  # Stoppt den Simulationsthread
         if self.heart_rate_sensor:
             self.heart_rate_sensor.stop()
+        self.jobs.shutdown(wait=True)  # laufendes Speichern noch fertig machen
         self.destroy()  # Schließt das Tkinter Fenster
         sys.exit()  # Beendet das Programm vollständig
 
 
 class StartPage(ttk.Frame):
     # this was the AllStatisticsPage, it has been changed in it location
+    OVERVIEW_PAGE_SIZE = 4  # Trainings pro Seite in der Übersicht
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        controller.training_manager.subscribe(self.on_sessions_changed)
         # Main container
         self.main_container = ttk.Frame(self)
         self.main_container.pack(fill='both', expand=True)
@@ -228,197 +271,167 @@ class StartPage(ttk.Frame):
         self.update_graph()
         self.update_all_stats()  # Your existing stats update method
 
+    def on_sessions_changed(self, event, session):
+        """Katalog hat sich geändert (geladen, Training gespeichert oder gelöscht)."""
+        self.update_all_stats()
+        self.update_graph()
+
     def create_graph_view(self):
         # Add title label for the graph view
         title_label = ttk.Label(self.graph_frame, text="All Trainings - Overview Charts", font=("Helvetica", 16, "bold"), foreground='white')
         title_label.pack(pady=10)
 
-        # Create Figure and Canvas for the graph
+        # Auswahl des Zeitfensters
+        self.trend_mode = "last"
+        self.trend_key = None  # was zuletzt gezeichnet wurde, um unnötiges Neuzeichnen zu sparen
+        mode_frame = ttk.Frame(self.graph_frame)
+        mode_frame.pack()
+        self.trend_mode_buttons = {}
+        for mode, text in (("last", f"Last {DEFAULT_LAST_SESSIONS}"), ("week", "Weekly"), ("month", "Monthly")):
+            button = ttk.Button(mode_frame, text=text, command=lambda m=mode: self.set_trend_mode(m))
+            button.pack(side=tk.LEFT, padx=5)
+            self.trend_mode_buttons[mode] = button
+
+        # Create Figure and Canvas for the graph (Achsen und Linien werden nur einmal angelegt)
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
         self.fig = Figure(figsize=(5, 4))
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.graph_frame)
         self.canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._create_trend_axes()
 
         # Update the graph
         self.update_graph()
 
-    def shorten_name(self, name, max_length=5):
-        """Zeigt Tag und Monat aus dem Timestamp (Format: 'YYYY-MM-DD HH:MM:SS') an."""
-        try:
-            date_part = name[:10]  # Beispiel: '2025-02-11'
-            date_obj = datetime.strptime(date_part, "%Y-%m-%d")
-            return date_obj.strftime("%d.%m.")
-        except Exception as e:
-            print(f"Fehler beim Kürzen des Namens ({name}): {e}")
-            return name
-
-    def update_graph(self):
-        self.fig.clear()
-
-        # ------------------- Daten extrahieren -------------------
-        if not self.controller.training_sessions:
-            ax = self.fig.add_subplot(111)
-            ax.text(0.5, 0.5, "No training data available", ha='center', va='center')
-            self.canvas.draw()
-            return
-
-        training_names = []
-        max_heartrates = []
-        avg_powers = []
-        resistance_levels_per_training = []
-        all_resistance_levels = set()
-
-        for training in self.controller.training_sessions:
-            training_name = training.get('training_name', 'Unknown')
-            shortened_name = self.shorten_name(training_name)
-            training_names.append(shortened_name)
-
-            # Max HR
-            max_heartrates.append(
-                max(entry['heartrate'] for entry in training['data']) if training['data'] else 0
-            )
-
-            # Avg Power
-            avg_power = sum(entry['power'] for entry in training['data']) / len(training['data']) if training[
-                'data'] else 0
-            avg_powers.append(avg_power)
-
-            # Resistance Times
-            resistance_summary = training.get('resistance_summary', [])
-            if not isinstance(resistance_summary, list):
-                resistance_summary = []
-
-            time_in_levels = {}
-            for entry in resistance_summary:
-                level = entry['resistance_level']
-                time_in_levels[level] = entry['total_time'] / 60  # Minuten
-                all_resistance_levels.add(level)
-
-            resistance_levels_per_training.append(time_in_levels)
-
+    def _create_trend_axes(self):
         # ------------------- Plot: Max HR & Avg Power (Linien) -------------------
-        ax1 = self.fig.add_subplot(211)
-
-        x = np.arange(len(training_names))
-
-        # Max HR als Linie
-        ax1.plot(x, max_heartrates, 'r-o', label='Max Heart Rate', linewidth=2, alpha=0.7)
-        ax1.set_ylabel('Max HR (BPM)', color='r')
-        ax1.tick_params(axis='y', labelcolor='r')
-        ax1.set_ylim(bottom=0)
+        self.ax1 = self.fig.add_subplot(211)
+        self.hr_line, = self.ax1.plot([], [], 'r-o', label='Max Heart Rate', linewidth=2, alpha=0.7)
+        self.ax1.set_ylabel('Max HR (BPM)', color='r')
+        self.ax1.tick_params(axis='y', labelcolor='r')
 
         # Avg Power als Linie (zweite Y-Achse)
-        ax2 = ax1.twinx()
-        ax2.plot(x, avg_powers, 'b-s', label='Avg Power', linewidth=2, alpha=0.7)
-        ax2.set_ylabel('Avg Power (W)', color='b')
-        ax2.tick_params(axis='y', labelcolor='b')
-        ax2.set_ylim(bottom=0)
-
-        # X-Achsen-Ticks & Label
-        ax1.set_xticks(x)
-        ax1.set_xticklabels(training_names, rotation=45, ha="right", fontsize=7)
+        self.ax2 = self.ax1.twinx()
+        self.power_line, = self.ax2.plot([], [], 'b-s', label='Avg Power', linewidth=2, alpha=0.7)
+        self.ax2.set_ylabel('Avg Power (W)', color='b')
+        self.ax2.tick_params(axis='y', labelcolor='b')
 
         # Legende kombinieren
-        ax1_lines, ax1_labels = ax1.get_legend_handles_labels()
-        ax2_lines, ax2_labels = ax2.get_legend_handles_labels()
-        ax1.legend(ax1_lines + ax2_lines, ax1_labels + ax2_labels, loc='lower center', bbox_to_anchor=(0.5, 1.05), ncol=2,  handletextpad=0.5)
-
-        ax1.grid(True, linestyle='--', alpha=0.5)
+        self.ax1.legend([self.hr_line, self.power_line], ['Max Heart Rate', 'Avg Power'], loc='lower center', bbox_to_anchor=(0.5, 1.05), ncol=2,  handletextpad=0.5)
+        self.ax1.grid(True, linestyle='--', alpha=0.5)
 
         # ------------------- Plot: Resistance Level Time (Bars) -------------------
-        ax3 = self.fig.add_subplot(212)
+        self.ax3 = self.fig.add_subplot(212)
+        self.ax3.set_ylabel('Time in Resistance Levels (minutes)')
+        self.ax3.grid(True, linestyle='--', alpha=0.5)
+        self.level_bars = []  # BarContainer der Stufen, werden beim Aktualisieren ersetzt
+        self.level_legend = None
 
-        colors = ['#343cca', '#e29531', '#e6e446', '#a746e6', '#4be646', '#46c8e6', '#dc2727', '#180808']
-        cumulative_time = np.zeros(len(training_names))
+        self.no_data_text = self.ax1.text(0.5, 0.5, "No training data available", ha='center', va='center',
+                                          transform=self.ax1.transAxes, visible=False)
 
-        sorted_levels = sorted(set(all_resistance_levels)) if all_resistance_levels else []
+    def set_trend_mode(self, mode):
+        self.trend_mode = mode
+        self.update_graph()
 
-        for i, level in enumerate(sorted_levels):
-            level_times = [
-                resistance_levels.get(level, 0) for resistance_levels in resistance_levels_per_training
-            ]
+    def update_graph(self):
+        """Zeichnet den Verlauf im gewählten Fenster (letzte N Trainings, pro Woche oder pro Monat).
+
+        Grundlage sind die gespeicherten Kennzahlen der Trainings. Figure, Achsen und Linien
+        bleiben bestehen; neu gesetzt werden nur Liniendaten, Balken und Achsenbeschriftung, und
+        nur wenn sich das Fenster geändert hat (Training hinzugefügt/gelöscht, anderer Modus).
+        """
+        sessions = self.controller.training_sessions
+        trend_key = (self.trend_mode, len(sessions), sessions[-1].filename if sessions else None,
+                     sessions[0].filename if sessions else None, datetime.now().date())  # Fenster endet heute
+        if trend_key == self.trend_key:
+            return
+        self.trend_key = trend_key
 
-            ax3.bar(
+        for mode, button in self.trend_mode_buttons.items():
+            button.state(['pressed'] if mode == self.trend_mode else ['!pressed'])
+
+        # ------------------- Daten extrahieren -------------------
+        points = trend_points(sessions, self.trend_mode)
+        self.no_data_text.set_visible(not any(point.sessions for point in points))
+
+        x = list(range(len(points)))
+        labels = [point.label for point in points]
+        # Wochen/Monate ohne Training als Lücke in der Linie (NaN), nicht als 0
+        max_heartrates = [point.max_heartrate if point.sessions else float('nan') for point in points]
+        avg_powers = [point.avg_power if point.sessions else float('nan') for point in points]
+
+        # ------------------- Linien: nur Daten austauschen -------------------
+        self.hr_line.set_data(x, max_heartrates)
+        self.power_line.set_data(x, avg_powers)
+        self.ax1.set_ylim(0, max(max((p.max_heartrate for p in points), default=0) * 1.1, 1))
+        self.ax2.set_ylim(0, max(max((p.avg_power for p in points), default=0) * 1.1, 1))
+
+        # ------------------- Balken: Zeit pro Stufe -------------------
+        for bars in self.level_bars:
+            bars.remove()
+        self.level_bars = []
+        if self.level_legend is not None:
+            self.level_legend.remove()
+            self.level_legend = None
+
+        colors = ['#343cca', '#e29531', '#e6e446', '#a746e6', '#4be646', '#46c8e6', '#dc2727', '#180808']
+        sorted_levels = sorted({level for point in points for level in point.level_minutes})
+        cumulative_time = [0] * len(points)
+        for i, level in enumerate(sorted_levels):
+            level_times = [point.level_minutes.get(level, 0) for point in points]
+            self.level_bars.append(self.ax3.bar(
                 x,
                 level_times,
                 bottom=cumulative_time,
                 color=colors[i % len(colors)],
                 label=f"{level}",
                 alpha=0.7
-            )
-
-            cumulative_time += np.array(level_times)
+            ))
+            cumulative_time = [bottom + t for bottom, t in zip(cumulative_time, level_times)]
+        self.ax3.set_ylim(0, max(max(cumulative_time, default=0) * 1.1, 1))
+        if sorted_levels:
+            self.level_legend = self.ax3.legend(title="Level", loc='upper right', bbox_to_anchor=(1.2, 1), borderaxespad=0, fontsize='small', title_fontsize='small')
 
-        ax3.set_ylabel('Time in Resistance Levels (minutes)')
-        ax3.set_xticks(x)
-        ax3.set_xticklabels(training_names, rotation=45, ha="right", fontsize=7)
-        ax3.legend(title="Level", loc='upper right', bbox_to_anchor=(1.2, 1), borderaxespad=0, fontsize='small', title_fontsize='small')
-        ax3.grid(True, linestyle='--', alpha=0.5)
+        # X-Achsen-Ticks & Label
+        for ax in (self.ax1, self.ax3):
+            ax.set_xlim(-0.5, max(len(points), 1) - 0.5)
+            ax.set_xticks(x)
+            ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=7)
 
         # ------------------- Layout & Anzeige -------------------
         self.fig.tight_layout(h_pad=0.5)
-        self.canvas.draw()
-
-    def update_all_stats(self):
-        """Aktualisiert die Anzeige der Statistiken, neueste Trainings zuerst."""
-        self.stats_text.delete(1.0, tk.END)
-
-        # ✅ Sortiere die Trainings (neueste zuerst)
-        training_sessions = sorted(
-            self.controller.training_sessions,
-            key=lambda x: parse_training_timestamp(x["timestamp"]),
-            reverse=True
-        )
-
-        if not training_sessions:
-            self.stats_text.insert(tk.END, "No training data available.\n")
-            return
-
-        for training in training_sessions:
-            training_name = training.get('training_name', 'Unknown Training')
-            timestamp = training.get('timestamp', 'Unknown Time')
-
-            total_time = max((entry['time_seconds'] for entry in training['data']), default=0)
-            total_distance = max((entry['distance'] for entry in training['data']), default=0)
-            avg_cadence = sum(
-                entry['cadence'] for entry in training['data']
-            ) / len(training['data']) if training['data'] else 0
-
-            stats_summary = (
-                f"--------------------------------------\n"
-                f"Training Name: {training_name}\n"
-                f"Timestamp: {timestamp}\n"
-                f"Total Time: {total_time:.0f} sec\n"
-                f"Total Distance: {total_distance:.0f} m\n"
-                f"Avg. Cadence: {avg_cadence:.1f} RPM\n"
-            )
-
-            self.stats_text.insert(tk.END, stats_summary + "\n\n")
-
-            btn = ttk.Button(
-                self.stats_frame,
-                text=f"View Training {training_name}",
-                command=lambda t=training: self.show_training_details(t)
-            )
-            self.stats_text.window_create(tk.END, window=btn)
-            self.stats_text.insert(tk.END, "\n\n")
-
-    def show_training_details(self, training):
-        details = f"Training Details for {training['training_name']}:\n"
-        tk.messagebox.showinfo("Training Details", details)
+        self.canvas.draw_idle()
 
     def create_stats_view(self):
         # Add title label for the stats view
         title_label = ttk.Label(self.stats_frame, text="All Trainings - Overview Details", font=("Helvetica", 16, "bold"), foreground='white')
         title_label.pack(pady=10)
 
-        # Your existing stats view code
-        self.stats_text = tk.Text(self.stats_frame, height=30, width=50)
-        self.stats_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-        self.scrollbar = tk.Scrollbar(self.stats_frame, orient="vertical", command=self.stats_text.yview, width=30)
-        self.scrollbar.pack(side=tk.RIGHT, fill='y')
-
-        self.stats_text.config(yscrollcommand=self.scrollbar.set)
+        # Feste Anzahl Zeilen, die nur neu beschriftet werden (egal wie viele Trainings es gibt)
+        self.overview_page = 0
+        self.overview_rows = []
+        rows_frame = ttk.Frame(self.stats_frame)
+        rows_frame.pack(fill='both', expand=True)
+        for _ in range(self.OVERVIEW_PAGE_SIZE):
+            row = ttk.Frame(rows_frame)
+            summary_label = ttk.Label(row, text="", foreground='white', justify='left', font=("Helvetica", 10))
+            summary_label.pack(side=tk.LEFT, fill='x', expand=True, padx=5)
+            details_button = ttk.Button(row, text="Details")
+            details_button.pack(side=tk.RIGHT, padx=5)
+            self.overview_rows.append((row, summary_label, details_button))
+
+        self.no_stats_label = ttk.Label(rows_frame, text="No training data available.", foreground='white')
+
+        # Blättern
+        pager_frame = ttk.Frame(self.stats_frame)
+        pager_frame.pack(pady=5)
+        self.prev_page_button = ttk.Button(pager_frame, text="< Newer", command=lambda: self.change_overview_page(-1))
+        self.prev_page_button.pack(side=tk.LEFT, padx=5)
+        self.page_label = ttk.Label(pager_frame, text="", foreground='white')
+        self.page_label.pack(side=tk.LEFT, padx=10)
+        self.next_page_button = ttk.Button(pager_frame, text="Older >", command=lambda: self.change_overview_page(1))
+        self.next_page_button.pack(side=tk.LEFT, padx=5)
 
     def show_graph_view(self):
         self.stats_frame.pack_forget()
@@ -442,22 +455,15 @@ class StartPage(ttk.Frame):
         self.controller.show_frame("StatisticsPage")
 
     def delete_all_trainings(self):
+        def deleted(_):
+            self.controller.training_manager.clear_sessions()
+            self.controller.show_message("All trainings have been deleted.")
+
         def confirmed_delete():
             if self.controller.training_sessions:
-                try:
-                    for filename in os.listdir(self.controller.training_manager.directory):
-                        if filename.startswith("training_") and filename.endswith(".json"):
-                            os.remove(os.path.join(self.controller.training_manager.directory, filename))
-
-                    self.controller.training_sessions.clear()
-                    self.controller.frames["StatisticsPage"].update_stats()
-                    self.controller.frames["StartPage"].update_all_stats()
-                    self.controller.frames["StartPage"].update_graph()
-                    self.controller.frames["GraphsPage"].update_graphs()
-
-                    self.controller.show_message("All trainings have been deleted.")
-                except Exception as e:
-                    print(f"Error: {e}")
+                self.controller.jobs.submit(self.controller.training_manager.delete_all_training_sessions,
+                                            on_done=deleted, on_error=lambda e: print(f"Error: {e}"),
+                                            description="Deleting trainings...")
             else:
                 print("Error: No training data available.")
 
@@ -467,71 +473,81 @@ class StartPage(ttk.Frame):
             callback_yes=confirmed_delete
         )
 
+    def change_overview_page(self, step):
+        self.overview_page += step
+        self.update_all_stats()
+
     def update_all_stats(self):
-        if self.stats_text:
-            try:
-                self.stats_text.delete(1.0, tk.END)
-
-                # Check for data availability
-                if not self.controller.training_sessions:
-                    self.stats_text.insert(tk.END, "No training data available.")
-                    return
-
-                # Display training statistics in reverse order (newest first)
-                for training in reversed(self.controller.training_sessions):
-                    training_name = training.get('training_name', 'Unknown Training')  # Use get to avoid KeyError
-                    total_time = max(entry['time_seconds'] for entry in training['data']) if training['data'] else 0
-                    total_time += 1  # erhöht die angefangene Sekunde in der statistic damit logik erhalten bleibt
-                    moving_time = sum(1 for entry in training['data'] if entry['cadence'] > 0)
-                    total_distance = max(entry['distance'] for entry in training['data']) if training['data'] else 0
-                    avg_cadence = sum(entry['cadence'] for entry in training['data']) / len(training['data']) if training['data'] else 0
-                    avg_power = sum(entry['power'] for entry in training['data']) / len(training['data']) if training['data'] else 0
-                    max_power = max(entry['power'] for entry in training['data']) if training['data'] else 0
-                    avg_speed = sum(entry['speed'] for entry in training['data']) / len(training['data']) if training['data'] else 0
-                    max_speed = max(entry['speed'] for entry in training['data']) if training['data'] else 0
-                    max_heartrate = max(entry['heartrate'] for entry in training['data']) if training['data'] else 0
-
-                    stats_summary = (
-                        f"{'-' * 50}\n"
-                        f"Training: {training_name}\n"
-                        f"Total Time: {int(total_time // 3600):02}:{int((total_time % 3600) // 60):02}:{int(total_time % 60):02}\n"
-                        f"Moving Time: {int(moving_time // 3600):02}:{int((moving_time % 3600) // 60):02}:{int(moving_time % 60):02}\n"
-                        f"Total Distance: {total_distance:.0f} m\n"
-                        f"Avg. Cadence: {avg_cadence:.0f} RPM\n"
-                        f"Avg. Power: {avg_power:.1f} W\n"
-                        f"Max. Power: {max_power:.1f} W\n"
-                        f"Avg. Speed: {avg_speed:.2f} km/h\n"
-                        f"Max. Speed: {max_speed:.2f} km/h\n"
-                        f"Max. Heartrate: {max_heartrate:.0f} BPM\n"
-                    )
-
-                    self.stats_text.insert(tk.END, stats_summary)
-
-                    # Button for more details
-                    btn = ttk.Button(self.stats_frame, text=f"Details for Training {training_name}",
-                                     command=lambda t=training: self.show_training_details(t))
-                    self.stats_text.window_create(tk.END, window=btn)
-                    self.stats_text.insert(tk.END, "\n\n")
-
-            except tk.TclError as e:
-                print(f"Error updating stats_text: {e}")
+        """Zeigt eine Seite der Trainingsübersicht (neueste zuerst).
+
+        Es werden nur die OVERVIEW_PAGE_SIZE Zeilen neu beschriftet; die Kennzahlen kommen aus
+        dem Session-Index (`training.aggregates`), Messwerte werden nicht geladen.
+        """
+        sessions = self.controller.training_sessions
+        page_count = max(1, -(-len(sessions) // self.OVERVIEW_PAGE_SIZE))
+        self.overview_page = min(max(self.overview_page, 0), page_count - 1)
+
+        # Check for data availability
+        if not sessions:
+            self.no_stats_label.pack(pady=20)
+        else:
+            self.no_stats_label.pack_forget()
+
+        first = len(sessions) - 1 - self.overview_page * self.OVERVIEW_PAGE_SIZE  # neueste zuerst
+        for i, (row, summary_label, details_button) in enumerate(self.overview_rows):
+            index = first - i
+            if index < 0:
+                row.pack_forget()
+                continue
+            training = sessions[index]
+            summary_label.config(text=self.format_overview_row(training))
+            details_button.config(command=lambda t=training: self.show_training_details(t))
+            row.pack(fill='x', pady=4)
+
+        self.page_label.config(text=f"Page {self.overview_page + 1} / {page_count}")
+        self.prev_page_button.state(['!disabled'] if self.overview_page > 0 else ['disabled'])
+        self.next_page_button.state(['!disabled'] if self.overview_page < page_count - 1 else ['disabled'])
+
+    def format_overview_row(self, training):
+        aggregates = training.aggregates  # beim Speichern berechnete Kennzahlen, ohne Messwerte zu laden
+        total_time = aggregates.get('total_time', 0)  # enthält schon die angefangene Sekunde
+        moving_time = aggregates.get('moving_time', 0)
+        total_distance = aggregates.get('total_distance', 0)
+        avg_cadence = aggregates.get('avg_cadence', 0)
+        avg_power = aggregates.get('avg_power', 0)
+        max_power = aggregates.get('max_power', 0)
+        avg_speed = aggregates.get('avg_speed', 0)
+        max_speed = aggregates.get('max_speed', 0)
+        max_heartrate = aggregates.get('max_heartrate', 0)
+
+        return (
+            f"Training: {training.training_name}\n"
+            f"Total Time: {int(total_time // 3600):02}:{int((total_time % 3600) // 60):02}:{int(total_time % 60):02}"
+            f"  Moving: {int(moving_time // 3600):02}:{int((moving_time % 3600) // 60):02}:{int(moving_time % 60):02}"
+            f"  Distance: {total_distance:.0f} m\n"
+            f"Cadence: {avg_cadence:.0f} RPM  Power: {avg_power:.1f} / {max_power:.1f} W (avg/max)\n"
+            f"Speed: {avg_speed:.2f} / {max_speed:.2f} km/h (avg/max)  Max. HR: {max_heartrate:.0f} BPM"
+        )
 
     def show_training_details(self, training):
-        details = f"Training Details for Training Number {training['training_name']}:\n"
+        details = f"Training Details for Training Number {training.training_name}:\n"
         # Training Details vorbereiten
-        training_name = training['training_name']
-        total_time = max((entry['time_seconds'] for entry in training['data']), default=0)
-        moving_time = sum(1 for entry in training['data'] if entry['cadence'] > 0)
-        total_distance = max(entry['distance'] for entry in training['data']) if training['data'] else 0
-        avg_cadence = sum(entry['cadence'] for entry in training['data']) / len(training['data']) if training['data'] else 0
-        avg_power = sum(entry['power'] for entry in training['data']) / len(training['data']) if training['data'] else 0
-        max_power = max(entry['power'] for entry in training['data']) if training['data'] else 0
-        avg_speed = sum(entry['speed'] for entry in training['data']) / len(training['data']) if training['data'] else 0
-        max_speed = max(entry['speed'] for entry in training['data']) if training['data'] else 0
-        max_heartrate = max(entry['heartrate'] for entry in training['data']) if training['data'] else 0
+        training_name = training.training_name
+        aggregates = training.aggregates
+        total_time = aggregates.get('total_time', 0)
+        moving_time = aggregates.get('moving_time', 0)
+        total_distance = aggregates.get('total_distance', 0)
+        avg_cadence = aggregates.get('avg_cadence', 0)
+        avg_power = aggregates.get('avg_power', 0)
+        max_power = aggregates.get('max_power', 0)
+        avg_speed = aggregates.get('avg_speed', 0)
+        max_speed = aggregates.get('max_speed', 0)
+        max_heartrate = aggregates.get('max_heartrate', 0)
+        normalized_power = aggregates.get('normalized_power', avg_power)
+        best_power_30s = aggregates.get('max_avg_power_30s', 0)
 
         # Zusammenfassung der Widerstandsdaten (falls verfügbar)
-        resistance_summary = training.get('resistance_summary', [])
+        resistance_summary = training.resistance_summary
         resistance_info = "Resistance Level Summary:\nLevel -- Avg. Power -- Max. Power -- Time\n"
         for entry in sorted(resistance_summary, key=lambda x: x['resistance_level']):
             level = entry['resistance_level']
@@ -553,6 +569,8 @@ class StartPage(ttk.Frame):
             f"Total Distance: {total_distance:.0f} m\n"
             f"Avg. Cadence: {avg_cadence:.0f} RPM\n"
             f"Avg. Power: {avg_power:.1f} W\n"
+            f"Normalized Power: {normalized_power:.1f} W\n"
+            f"Best 30s Power: {best_power_30s:.1f} W\n"
             f"Avg. Speed: {avg_speed:.2f} km/h\n"
             f"Max. Speed: {max_speed:.2f} km/h\n"
             f"Max. Heartrate: {max_heartrate:.0f} BPM\n\n"
@@ -565,29 +583,21 @@ class StartPage(ttk.Frame):
 
     def delete_training(self, training, window):
         def confirmed_delete():
-            timestamp = training.get('timestamp')
-            if not timestamp:
-                messagebox.showerror("Error", "No timestamp found for this training.")
-                return
-
-            filename = f"training_{timestamp.replace(':', '').replace(' ', '_')}.json"
+            filename = training.filename
             filepath = os.path.join(self.controller.training_manager.directory, filename)
 
             if os.path.exists(filepath):
-                try:
-                    os.remove(filepath)
-                    self.controller.training_sessions.remove(training)
-                    self.controller.training_sessions = self.controller.training_manager.load_training_sessions()
-
-                    self.update_all_stats()
-                    self.update_graph()
-                    self.controller.frames["GraphsPage"].update_graphs()
-
+                def deleted(_):
                     window.destroy()
-
+                    self.controller.training_manager.remove_session(training)
                     messagebox.showinfo("Success", "Training session deleted successfully.")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to delete training session: {e}")
+
+                self.controller.jobs.submit(
+                    lambda: self.controller.training_manager.delete_training_session(training),
+                    on_done=deleted,
+                    on_error=lambda e: messagebox.showerror("Error", f"Failed to delete training session: {e}"),
+                    description="Deleting training..."
+                )
             else:
                 messagebox.showerror("Error", f"Training file '{filename}' not found.")
 
@@ -644,12 +654,13 @@ class TrainingPage(ttk.Frame):
         self.running = False
         self.paused = False # Add a paused flag
         self.elapsed_time = 0
-        self.last_update_time = 0
         self.last_3s_update = 0  # Separate variable for 3s interval
-        self.resistance_data = {}  # Initialize resistance_data attribute
         self.moving_time = 0  # Initialisiere moving_time hier
-        self.training_sessions_manager = TrainingDataManager()
-        #self.training_sessions_manager.training_name = self.controller.get_next_training_name()
+        self.power_display_window = 3  # Fenster (Sekunden) für die Power-Anzeige, siehe power_smoothing.DEFAULT_WINDOWS
+        self.training_sessions_manager = controller.training_manager  # derselbe Manager wie die anderen Seiten
+        self.acquisition = None  # Abtast-Thread, läuft nur während eines Trainings
+        self.display_refresh = TkSamplingScheduler(self, self.refresh_display, interval=0.25)  # Bildrate der Anzeige
+        self.last_displayed_sequence = 0
 
         self.current_training_data = []  # array für trainingsdaten
         self.resistance_buttons = {}  # iwas für die buttons 1-8 beim training
@@ -706,7 +717,7 @@ class TrainingPage(ttk.Frame):
         self.distance_label = ttk.Label(grid_frame, text="m", font=("Helvetica", 14), style='White.TLabel', width=30)
         self.distance_label.grid(row=6, column=1, padx=2, pady=5, sticky='sw')
 
-        self.power_label_text = ttk.Label(grid_frame, text="POWER (3s)", font=("Helvetica", 10, "normal"),
+        self.power_label_text = ttk.Label(grid_frame, text=f"POWER ({self.power_display_window}s)", font=("Helvetica", 10, "normal"),
                                           foreground='darkgrey', anchor='center')
         self.power_label_text.grid(row=5, column=2, padx=10, columnspan=2, sticky='sew')
         self.power_label_value = ttk.Label(grid_frame, text='--', font=("Helvetica", 35, "bold"), style='White.TLabel',
@@ -724,6 +735,10 @@ class TrainingPage(ttk.Frame):
         self.heartrate_label = ttk.Label(grid_frame, text="BPM", font=("Helvetica", 14), style='White.TLabel', width=30)
         self.heartrate_label.grid(row=8, column=3, padx=2, pady=5, columnspan=2, sticky='sw')
 
+        # Live-Verlauf der letzten 5 Minuten (Power, HR, Kadenz), feste Kosten pro Update
+        self.live_chart = LiveStripChart(grid_frame, capacity=300)
+        self.live_chart.grid(row=9, column=0, columnspan=4, padx=5, pady=2, sticky='nsew')
+
         self.resistance_label = ttk.Label(grid_frame, text=f"RESISTANCE LEVEL:", font=("Helvetica", 10, "normal"),
                                           foreground='darkgrey', anchor='center')
         self.resistance_label.grid(row=10, column=0, padx=10, pady=5, columnspan=4, sticky='nswe')
@@ -778,7 +793,7 @@ class TrainingPage(ttk.Frame):
 
     def get_next_training_name(self):
         """Holt den nächsten verfügbaren Trainingsnamen aus TrainingDataManager."""
-        return self.training_manager.get_next_training_name()
+        return self.training_sessions_manager.get_next_training_name()
 
     def handle_training_button(self):
         if not self.running:
@@ -793,6 +808,9 @@ class TrainingPage(ttk.Frame):
     def pause_training(self):
         self.paused = True
         self.running = False
+        if self.acquisition:
+            self.acquisition.pause()
+        self.display_refresh.stop()
 
     def show_stop_popup(self):
         popup = tk.Toplevel(self)
@@ -842,17 +860,33 @@ class TrainingPage(ttk.Frame):
     def resume_training(self):
         self.paused = False
         self.running = True
-        self.last_update_time = time.time()
-        self.last_3s_update = time.time()
-        self.update_values()
+        self.acquisition.start_sampling()
+        self.display_refresh.start()
         self.training_button.config(image=self.stop_icon)
 
     def discard_training(self):
         self.running = False
         self.paused = False
-        self.training_sessions_manager.reset_values()
+        acquisition = self.acquisition
+        self.stop_acquisition()
+        self.training_sessions_manager.reset_values()  # ein noch laufender Messwert wird danach verworfen
         self.controller.frames["TrainingPage"].reset_values()
         self.training_button.config(image=self.start_icon)
+
+        # wie beim Speichern: erst ein neues Training zulassen, wenn der alte Abtast-Thread beendet ist,
+        # sonst könnte sein letzter Messwert im neuen Training landen
+        self.training_button.state(['disabled'])
+
+        def wait_stopped():
+            if acquisition is not None and not acquisition.wait_stopped(timeout=10.0):
+                raise RuntimeError("Abtastung läuft noch")
+
+        self.controller.jobs.submit(
+            wait_stopped,
+            on_done=lambda _: self.training_button.state(['!disabled']),
+            on_error=lambda e: self.training_button.state(['!disabled']),
+            description="Discarding training..."
+        )
         self.controller.show_frame("TrainingPage")
         self.training_sessions_manager.training_name = self.training_sessions_manager.get_next_training_name()
         #training_page.update_idletasks()
@@ -879,12 +913,12 @@ class TrainingPage(ttk.Frame):
 
         self.set_resistance(1)  # setzte resistance level auf 1
         self.elapsed_time = 0  # Setze die vergangene Zeit zurück
-        self.last_update_time = time.time()  # Setze den letzten Update-Zeitstempel zurück
-        self.last_3s_update = time.time()  # Setze den 3-Sekunden-Update-Zeitstempel zurück
+        self.last_3s_update = 0  # Setze den 3-Sekunden-Update-Zeitstempel zurück (Trainingszeit)
+        self.last_displayed_sequence = 0
+        self.live_chart.clear()
         self.moving_time = 0  # Setze moving_time zurück
 
         self.controller.total_distance = 0
-        self.controller.power_values.clear()  # Reset the power values when resetting
         self.controller.sensor_manager.reset()  # Diese Zeile ruft den Reset im CadenceSensorManager auf
 
         # Setzt die im DataManager gespeicherten Daten zurück
@@ -897,40 +931,91 @@ class TrainingPage(ttk.Frame):
     def start_training(self):
         if not self.running:
             self.running = True
-            self.training_sessions_manager.training_name = self.controller.get_next_training_name()
+            self.training_sessions_manager.training_name = self.training_sessions_manager.get_next_training_name()
             self.reset_values()  # Reset values when starting new training
-            self.start_timer()
-            self.update_values()  # Startet das Speichern der Werte
+            self.start_timer()  # Startet das Speichern der Werte
 
     def stop_training(self):
         if self.running or self.paused:
             self.running = False
             self.paused = False
+            acquisition = self.acquisition
+            sampling = self.stop_acquisition()
 
-            filepath = self.training_sessions_manager.save_training_session()
-
-            if not filepath:
-                print("FEHLER: Kein Trainingsfile wurde gespeichert!")
-                return
-
-            self.training_sessions_manager.save_training_session()  # Nur EIN Aufruf
-            self.controller.training_sessions = self.controller.training_manager.load_training_sessions()
+            # Speichern im Hintergrund; bis es fertig ist, kann kein neues Training gestartet werden
             self.training_button.config(image=self.start_icon)
-            self.reset_values()
+            self.training_button.state(['disabled'])
+            manager = self.training_sessions_manager
+
+            def save():
+                # erst speichern, wenn kein Messwert mehr hinzukommt
+                if acquisition is not None and not acquisition.wait_stopped(timeout=10.0):
+                    raise RuntimeError("Abtastung läuft noch, Training wurde nicht gespeichert")
+                filepath = manager.save_training_session(sampling=sampling)
+                return manager.session_for_file(os.path.basename(filepath)) if filepath else None
+
+            self.controller.jobs.submit(
+                save,
+                on_done=self.training_saved,
+                on_error=lambda e: self.training_button.state(['!disabled']),
+                description="Saving training..."
+            )
 
-            # Statistikseite aktualisieren und anzeigen
-            self.controller.frames["StatisticsPage"].update_stats()
-            self.controller.frames["StartPage"].update_all_stats()
-            self.controller.frames["StartPage"].update_graph()
+            # Statistikseite anzeigen, sie wird nach dem Speichern aktualisiert
             self.controller.show_frame("StatisticsPage")
 
-            #self.training_sessions_manager.reset_values()
+    def training_saved(self, session):
+        """Läuft im Tk-Thread, sobald das Training gespeichert ist."""
+        self.training_button.state(['!disabled'])
+        if session is None:
+            print("FEHLER: Kein Trainingsfile wurde gespeichert!")
+            return
+
+        self.reset_values()
+        # nur das neue Training einsortieren statt alle Dateien neu zu lesen
+        self.training_sessions_manager.insert_session(session)
 
     def start_timer(self):
         self.running = True
-        self.last_update_time = time.time()
-        self.last_3s_update = time.time()  # Initialize the last update time for pace and avg_power
-        #self.update_values()
+        # optional jede Flanke und Herzfrequenz-Meldung roh mitschreiben (BERKELBIKE_RAW_CAPTURE=1);
+        # vorher noch wartende Flanken abholen, damit das Log nicht mit Flanken vor seinem Start beginnt
+        sensor_manager = self.controller.sensor_manager
+        sensor_manager.process_edges()
+        self._attach_raw_log(self.training_sessions_manager.start_raw_capture(
+            start_ns=int(sensor_manager.clock() * 1e9)))
+        self.training_sessions_manager.start_session()
+        # Abtastung, Berechnung und Speicherung laufen im eigenen Thread, die Anzeige holt sich nur Snapshots
+        self.acquisition = AcquisitionThread(
+            sensor_manager=self.controller.sensor_manager,
+            heart_rate_sensor=self.controller.heart_rate_sensor,
+            training_manager=self.training_sessions_manager,
+            get_resistance_level=lambda: self.controller.resistance_level,
+            power_model=power_model.lookup_power,  # vorberechnete Tabelle pro Stufe und RPM
+            speed_model=power_model.calculate_speed,
+        )
+        self.acquisition.start_sampling()  # erster Messwert sofort, danach jede Sekunde auf festen Zeitpunkten
+        self.display_refresh.start()
+
+    def stop_acquisition(self):
+        """Beendet den Abtast-Thread und gibt seine Taktstatistik zurück."""
+        self.display_refresh.stop()
+        if not self.acquisition:
+            return None
+        if not self.acquisition.stop():
+            print("⚠️ Abtast-Thread hat sich noch nicht beendet (Messwert wird noch gespeichert).")
+        raw_log = self.controller.sensor_manager.raw_log
+        if raw_log is not None:
+            self.controller.sensor_manager.process_edges()  # restliche Flanken noch mitschreiben
+            self._attach_raw_log(None)
+            raw_log.close()  # wird beim Speichern umbenannt bzw. beim Verwerfen gelöscht
+        sampling = self.acquisition.clock.stats()
+        self.acquisition = None
+        return sampling
+
+    def _attach_raw_log(self, raw_log):
+        self.controller.sensor_manager.raw_log = raw_log
+        if self.controller.heart_rate_sensor:
+            self.controller.heart_rate_sensor.raw_log = raw_log
 
     def stop_timer(self):
         self.running = False
@@ -938,120 +1023,51 @@ class TrainingPage(ttk.Frame):
         self.controller.save_training_data()  # Save to JSON file
         self.controller.show_frame("StatisticsPage")  # Show statistics page after stopping
 
-    def update_values(self):
-        if not self.running:
-            #print("⏸ DEBUG: Training pausiert, update_values() wird nicht ausgeführt.")
+    def refresh_display(self, frame_time=None):
+        """Zeigt den neuesten Snapshot des Abtast-Threads an (läuft im Tk-Thread mit eigener Bildrate)."""
+        if not self.running or not self.acquisition:
             return
 
-        #current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        #self.datetime_label.config(text=f"{current_datetime}")
-
-        current_time = time.time()
-        elapsed = current_time - self.last_update_time
-        self.elapsed_time += elapsed
-        self.last_update_time = current_time
-
-        # Get real cadence value from SensorManager
-        cadence = self.controller.sensor_manager.get_cadence() #für sensor diese zeile verwenden!!
-        #cadence = randint(50, 55)
+        # alle neuen Messwerte in den Live-Verlauf, aber nur einmal pro Frame zeichnen
+        new_snapshots = self.acquisition.drain()
+        for new_snapshot in new_snapshots:
+            self.live_chart.add_snapshot(new_snapshot)
+        if new_snapshots:
+            self.live_chart.redraw()
 
-        # Get resistance level
-        resistance_level = self.controller.resistance_level
+        snapshot = self.acquisition.latest
+        if snapshot is None or snapshot.sequence == self.last_displayed_sequence:
+            return  # noch kein neuer Messwert
+        self.last_displayed_sequence = snapshot.sequence
 
-        # Power calculation
-        power = self.calculate_power(cadence, resistance_level)
-
-        # Speed calculation
-        speed = 0.2555 * power + (-0.0009104) * power ** 2 - 1.133 * 10 ** -6 * power ** 3
-        speed = max(speed, 0)  # Stellt sicher, dass speed nicht negativ ist
-
-        # Distance calculation
-        distance_increment = speed * (elapsed / 3600) * 1000
-        self.controller.total_distance += distance_increment
-
-        # Get heart rate from sensor
-        heart_rate = self.controller.heart_rate_sensor.get_heart_rate()
-        if heart_rate == 0:  # If no heart rate is detected, use default value
-            heart_rate = 0
+        self.elapsed_time = snapshot.time_seconds
+        self.controller.total_distance = snapshot.distance
 
         # Update display labels
-        self.speed_label_value.config(text=f"{speed:.1f}")
-        self.distance_label_value.config(text=f"{self.controller.total_distance:.0f}")
+        self.speed_label_value.config(text=f"{snapshot.speed:.1f}")
+        self.distance_label_value.config(text=f"{snapshot.distance:.0f}")
         self.time_label.config(text=f"{int(self.elapsed_time // 3600):02}:{int((self.elapsed_time % 3600) // 60):02}:{int(self.elapsed_time % 60):02}")
-        # self.power_label_value.config(text=f"{power:.1f}")
-        self.heartrate_label_value.config(text=f"{heart_rate}")
-        self.cadence_label_value.config(text=f"{cadence}")
-        # self.avg_power_label_value.config(text=f"{power:.1f}")
-
-        # Speichere die Messwerte in den DataManager
-        measurement = {
-            "time_seconds": self.elapsed_time,
-            "cadence": cadence,
-            "resistance_level": resistance_level,
-            "power": power,
-            "speed": speed,
-            "distance": self.controller.total_distance,
-            "heartrate": heart_rate
-        }
-
-
-        self.training_sessions_manager.add_measurement(measurement)
-
-        # Hier die Widerstandsdaten direkt speichern
-        if cadence > 0:
-            if resistance_level not in self.training_sessions_manager.resistance_data:
-                self.training_sessions_manager.resistance_data[resistance_level] = {
-                    'total_time': 0,
-                    'total_power': 0,
-                    'count': 0,
-                }
-
-            self.training_sessions_manager.resistance_data[resistance_level]['total_time'] += 1
-            self.training_sessions_manager.resistance_data[resistance_level]['total_power'] += power
-            self.training_sessions_manager.resistance_data[resistance_level]['count'] += 1
-
-        #Speichern der Powerwerte für die 3 Sekunden Durchschnittsberechnung
-        self.controller.power_values.append(power)
+        self.heartrate_label_value.config(text=f"{snapshot.heartrate}")
+        self.cadence_label_value.config(text=f"{snapshot.cadence}")
 
         # Check if 3 seconds have passed since the last pace and avg_power update
-        if current_time - self.last_3s_update >= 3:
-            self.update_3sek_interval(power, speed)
-            self.last_3s_update = current_time
-
-        if self.running:  # Verhindert Mehrfachaufruf
-            self.after(1000, self.update_values)
+        if snapshot.time_seconds - self.last_3s_update >= 3:
+            self.update_3sek_interval(snapshot)
+            self.last_3s_update = snapshot.time_seconds
 
-    def update_3sek_interval(self, power, speed):
+    def update_3sek_interval(self, snapshot):
 
         # Prevent division by zero for pace calculation
-        pace = 60 / speed if speed > 0 else float('inf')
+        pace = 60 / snapshot.speed if snapshot.speed > 0 else float('inf')
 
-        # avg. power calculation
-        recent_powers = self.controller.power_values[-2:]  # get last 3 power values
-        avg_power3 = sum(recent_powers) / len(recent_powers) if recent_powers else 0
+        # avg. power calculation (gleitender Mittelwert, im Abtast-Thread berechnet)
+        avg_power3 = snapshot.power_smoothed.get(self.power_display_window, snapshot.power)
 
         # self.pace_label.config(text=f"MIN/KM\n{pace:.2f} min")
         self.power_label_value.config(text=f"{avg_power3:.1f}")
 
 
 
-    # werte der Hoetrainer messungen um Power zu berechnen
-    def calculate_power(self, cadence, level):
-        coefficients = {
-            1: [-0.09886, 0.008774, -4.482e-5],
-            2: [-0.0914, 0.01357, -6.128e-5],
-            3: [0.03131, 0.014, -4.07e-5],
-            4: [0.06623, 0.01848, -4.885e-5],
-            5: [0.0339, 0.0255, -8.2e-5],
-            6: [0.01525, 0.03527, -0.0001293],
-            7: [0.08092, 0.04164, -0.0001593],
-            8: [0.08516, 0.04835, -0.0001871]
-        }
-
-        a, b, c = coefficients[level]
-        power = a * cadence + b * cadence ** 2 + c * cadence ** 3
-        return max(0, power)  # Ensure power is non-negative
-
     def update_datetime_label(self):
         current_datetime = datetime.now().strftime("%d.%m.%Y %H:%M")
         self.datetime_label.config(text=f"  {current_datetime}  ")
@@ -1064,6 +1080,7 @@ class StatisticsPage(ttk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        controller.training_manager.subscribe(lambda event, session: self.update_stats())
 
         self.main_frame = ttk.Frame(self)
         self.main_frame.pack(expand=True, fill='both')
@@ -1203,28 +1220,20 @@ class StatisticsPage(ttk.Frame):
                 return
 
             last_training = self.controller.training_sessions[-1]
-            timestamp = last_training.get('timestamp')
-            if not timestamp:
-                messagebox.showerror("Error", "Timestamp not found for the last training.")
-                return
-
-            filename = f"training_{timestamp.replace(':', '').replace(' ', '_')}.json"
+            filename = last_training.filename
             filepath = os.path.join(self.controller.training_manager.directory, filename)
 
             if os.path.exists(filepath):
-                try:
-                    os.remove(filepath)
-                    self.controller.training_sessions.pop()
-                    self.controller.training_sessions = self.controller.training_manager.load_training_sessions()
-
-                    self.update_stats()
-                    self.controller.frames["StartPage"].update_all_stats()
-                    self.controller.frames["StartPage"].update_graph()
-                    self.controller.frames["GraphsPage"].update_graphs()
-
+                def deleted(_):
+                    self.controller.training_manager.remove_session(last_training)
                     messagebox.showinfo("Success", "Last training session deleted successfully.")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to delete training session: {e}")
+
+                self.controller.jobs.submit(
+                    lambda: self.controller.training_manager.delete_training_session(last_training),
+                    on_done=deleted,
+                    on_error=lambda e: messagebox.showerror("Error", f"Failed to delete training session: {e}"),
+                    description="Deleting training..."
+                )
             else:
                 messagebox.showerror("Error", f"Training file '{filename}' not found.")
 
@@ -1255,9 +1264,9 @@ class StatisticsPage(ttk.Frame):
             return
 
         last_training = training_sessions[-1]  # Latest training session
-        resistance_summary = last_training.get('resistance_summary', [])
+        resistance_summary = last_training.resistance_summary
 
-        training_name = last_training.get('training_name', 'Unnamed Training')
+        training_name = last_training.training_name
         self.training_name_label.config(text=f"Training: {training_name}")
 
         # Format resistance level summary
@@ -1277,17 +1286,17 @@ class StatisticsPage(ttk.Frame):
                     f"-- {int(total_time_level // 3600):02}:{int((total_time_level % 3600) // 60):02}:{int(total_time_level % 60):02}\n"
                 )
 
-        # Verwende die gespeicherten Widerstandsdaten, falls vorhanden
-        total_time = max(entry['time_seconds'] for entry in last_training['data'])+1 if last_training['data'] else 0
-        #total_time += 1  # erhöht die angefangene Sekunde in der statistic damit logik erhalten bleibt
-        total_distance = max(entry['distance'] for entry in last_training['data']) if last_training['data'] else 0
-        avg_cadence = sum(entry['cadence'] for entry in last_training['data']) / len(last_training['data']) if last_training['data'] else 0
-        avg_power = sum(entry['power'] for entry in last_training['data']) / len(last_training['data']) if last_training['data'] else 0
-        max_power = max(entry['power'] for entry in last_training['data']) if last_training['data'] else 0
-        avg_speed = sum(entry['speed'] for entry in last_training['data']) / len(last_training['data']) if last_training['data'] else 0
-        max_heartrate = max(entry['heartrate'] for entry in last_training['data']) if last_training['data'] else 0
-        moving_time = sum(1 for entry in last_training['data'] if entry['cadence']-1 > 0)
-        #moving_time = sum(entry['total_time'] for entry in resistance_summary) if resistance_summary else 0
+        # Verwende die beim Speichern berechneten Kennzahlen
+        aggregates = last_training.aggregates
+        count = aggregates.get('sample_count', 0)
+        total_time = aggregates.get('total_time', 0)  # enthält schon die angefangene Sekunde
+        total_distance = aggregates.get('total_distance', 0)
+        avg_cadence = aggregates.get('avg_cadence', 0)
+        avg_power = aggregates.get('avg_power', 0)
+        max_power = aggregates.get('max_power', 0)
+        avg_speed = aggregates.get('avg_speed', 0)
+        max_heartrate = aggregates.get('max_heartrate', 0)
+        moving_time = aggregates.get('moving_time', 0)  # Sekunden mit cadence > 0, wie auf allen Seiten
 
         #Befüllen der Labels mit den Werten
         self.total_time_value_label.config(text=f"{int(total_time // 3600):02}:{int((total_time % 3600) // 60):02}:{int(total_time % 60):02}")
@@ -1305,7 +1314,7 @@ class StatisticsPage(ttk.Frame):
             return
 
         # Falls das letzte Training keine Daten enthält
-        if not last_training.get("data"):
+        if not count:
             print("❌ WARNUNG: Das letzte Training hat keine Daten oder ist None!")
             return
 
@@ -1316,14 +1325,16 @@ class StatisticsPage(ttk.Frame):
             return
 
     def show_graphs(self):
-        self.controller.frames["GraphsPage"].update_graphs()
         self.controller.show_frame("GraphsPage")
+        self.controller.frames["GraphsPage"].update_graphs()
 
 class GraphsPage(ttk.Frame):    #Graphs in StatisticsPage from LastTraining
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
         self.graph_widgets = []  # Store graph widgets to manage updates
+        self.displayed_training = False  # Dateiname des angezeigten Trainings (False = noch nichts gezeichnet)
+        controller.training_manager.subscribe(lambda event, session: self.update_graphs())
 
         # Main container
         main_container = ttk.Frame(self)
@@ -1353,79 +1364,121 @@ class GraphsPage(ttk.Frame):    #Graphs in StatisticsPage from LastTraining
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         self.canvas.configure(yscrollcommand=scrollbar.set)
 
-    def update_graphs(self):
-        """Clears old graphs and regenerates them with the latest data."""
-        #for widget in self.graph_widgets:
-        #   widget.get_tk_widget().destroy()
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        self.graph_widgets.clear()
+        # Hinweis, falls keine Daten vorhanden sind
+        self.no_data_label = ttk.Label(self.scrollable_frame, text="No training data available")
 
-        if not self.controller.training_sessions:
-            ttk.Label(self.scrollable_frame, text="No training data available").pack()
+        # Figures werden nur einmal erstellt und danach nur noch mit neuen Daten befüllt
+        self.charts_frame = ttk.Frame(self.scrollable_frame)
+        self.title_label = ttk.Label(self.charts_frame, text="", font=('Arial', 14, 'bold'), foreground='white')
+        self.title_label.pack(pady=(20, 5))
+
+        # Power & Heart Rate Graph
+        self.power_chart = self._create_dual_axis_graph("Power and Heartrate", 'Power (W)', 'Heart Rate (BPM)', 'b', 'r')
+        # Cadence & Resistance Graph
+        self.cadence_chart = self._create_dual_axis_graph("Cadence and Resistance Level", 'Cadence (RPM)', 'Resistance Level', 'g', 'gray', resistance=True)
+        # Speed & Resistance Graph
+        self.speed_chart = self._create_dual_axis_graph("Speed and Resistance Level", 'Speed (km/h)', 'Resistance Level', 'orange', 'gray', resistance=True)
+
+    def update_graphs(self):
+        """Zeigt das letzte Training an. Die Figures bleiben bestehen, es werden nur die Linien aktualisiert."""
+        last_training = self.controller.training_sessions[-1] if self.controller.training_sessions else None
+        training_key = last_training.filename if last_training else None
+        if training_key == self.displayed_training:
+            return  # gleiches Training wird schon angezeigt
+        self.displayed_training = training_key
+
+        if last_training is None:
+            self._show_no_data("No training data available")
             return
 
-        # Get latest training data
-        last_training_data = self.controller.training_sessions[-1]['data']
-        times = [entry['time_seconds'] / 60 for entry in last_training_data]
-        power_values = [entry['power'] for entry in last_training_data]
-        heartrate_values = [entry['heartrate'] for entry in last_training_data]
-        cadence_values = [entry['cadence'] for entry in last_training_data]
-        speed_values = [entry['speed'] for entry in last_training_data]
-        resistance_values = [entry['resistance_level'] for entry in last_training_data]
-
-        if not times:  # Falls die Liste leer ist
+        # Höchstens 2 Punkte (Min/Max) pro Pixelspalte, Spitzen bleiben erhalten
+        max_points = 2 * pixel_width(self.power_chart['figure'], 0.8)
+
+        def prepare():
+            # läuft im Hintergrund: Datei lesen und Kurven reduzieren, gezeichnet wird danach im Tk-Thread
+            if last_training.aggregates.get('sample_count', 0) > max_points:
+                # Langes Training: vorberechnete Stufe statt aller Rohdaten (ein Bucket pro Pixelspalte)
+                return self._series_from_rollups(last_training, max_points)
+            return self._series_from_samples(last_training, max_points)
+
+        def failed(error):
+            self.displayed_training = False  # beim nächsten Mal erneut versuchen
+
+        self.controller.jobs.submit(prepare, on_done=lambda series: self._show_series(last_training, series),
+                                    on_error=failed, key="graphs", description="Preparing charts...")
+
+    def _show_series(self, last_training, series):
+        if last_training.filename != self.displayed_training:
+            return  # inzwischen wird ein anderes Training angezeigt
+        if series is None:
             #print("WARNING: No training data available, cannot show graph.")
-            ttk.Label(self.scrollable_frame, text="No valid training data available").pack()
+            self._show_no_data("No valid training data available")
             return  # Verlasse die Funktion ohne Fehler
 
-        min_time, max_time = min(times), max(times)
+        min_time, max_time = series.pop('time_range')
 
         #Header to show which training you are looking at
-        training_name = self.controller.training_sessions[-1].get('training_name', 'Unnamed Training')
-        ttk.Label(self.scrollable_frame, text=f"Charts of last Training:\n{training_name}",font=('Arial', 14, 'bold'), foreground='white').pack(pady=(20, 5))
-        # Power & Heart Rate Graph
-        ttk.Label(self.scrollable_frame, text="Power and Heartrate", font=('Arial', 12, 'bold'), foreground='white').pack(pady=(15, 5))
-        fig1, ax1 = self._create_dual_axis_graph(times, power_values, heartrate_values, 'Power (W)', 'Heart Rate (BPM)','b', 'r', min_time, max_time)
-        canvas1 = FigureCanvasTkAgg(fig1, self.scrollable_frame)
-        canvas1.draw()
-        canvas1.get_tk_widget().pack(pady=10, padx=5, fill='x')
-        self.graph_widgets.append(canvas1)
+        self.title_label.config(text=f"Charts of last Training:\n{last_training.training_name}")
+        self._update_dual_axis_graph(self.power_chart, series['power'], series['heartrate'], min_time, max_time)
+        self._update_dual_axis_graph(self.cadence_chart, series['cadence'], series['resistance_level'], min_time, max_time)
+        self._update_dual_axis_graph(self.speed_chart, series['speed'], series['resistance_level'], min_time, max_time)
 
-        # Cadence & Resistance Graph
-        ttk.Label(self.scrollable_frame, text="Cadence and Resistance Level", font=('Arial', 12, 'bold'), foreground='white').pack(pady=(15, 5))
-        fig2, ax2 = self._create_dual_axis_graph(times, cadence_values, resistance_values, 'Cadence (RPM)', 'Resistance Level', 'g', 'gray', min_time, max_time, resistance=True)
-        canvas2 = FigureCanvasTkAgg(fig2, self.scrollable_frame)
-        canvas2.draw()
-        canvas2.get_tk_widget().pack(pady=10, padx=5, fill='x')
-        self.graph_widgets.append(canvas2)
+        self.no_data_label.pack_forget()
+        self.charts_frame.pack(fill='x')
+
+    def _series_from_samples(self, training, max_points):
+        """Kurven (x, y) aus den Rohdaten, per Min/Max auf `max_points` reduziert."""
+        # Get latest training data
+        data = training.data
+        if not data:  # Falls die Liste leer ist
+            return None
+        times = [seconds / 60 for seconds in data.column('time_seconds')]
+        series = {
+            name: minmax_decimate(times, data.column(name), max_points)
+            for name in ('power', 'heartrate', 'cadence', 'speed', 'resistance_level')
+        }
+        series['time_range'] = (min(times), max(times))
+        return series
+
+    def _series_from_rollups(self, training, max_points):
+        """Kurven aus der passenden Rollup-Stufe (Min/Max pro Bucket), ohne die Rohdaten zu laden."""
+        tier = choose_tier(self.controller.training_manager.load_rollups(training), max_points // 2)
+        if tier is None:
+            return self._series_from_samples(training, max_points)
+        bucket_seconds, columns = tier
+        if not columns['time']:
+            return None
+        series = {
+            name: envelope(columns, name, bucket_seconds, scale=1 / 60)
+            for name in ('power', 'heartrate', 'cadence', 'speed', 'resistance_level')
+        }
+        series['time_range'] = (columns['time'][0] / 60, (columns['time'][-1] + bucket_seconds) / 60)
+        return series
+
+    def _show_no_data(self, text):
+        self.charts_frame.pack_forget()
+        self.no_data_label.config(text=text)
+        self.no_data_label.pack()
+
+    def _create_dual_axis_graph(self, title, primary_label, secondary_label, primary_color, secondary_color, resistance=False):
+        """Helper function to create a dual-axis chart once (Figure, Achsen, leere Linien, Canvas)."""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        ttk.Label(self.charts_frame, text=title, font=('Arial', 12, 'bold'), foreground='white').pack(pady=(15, 5))
 
-        # Speed & Resistance Graph
-        ttk.Label(self.scrollable_frame, text="Speed and Resistance Level", font=('Arial', 12, 'bold'), foreground='white').pack(pady=(15, 5))
-        fig3, ax3 = self._create_dual_axis_graph(times, speed_values, resistance_values, 'Speed (km/h)','Resistance Level', 'orange', 'gray', min_time, max_time,resistance=True)
-        canvas3 = FigureCanvasTkAgg(fig3, self.scrollable_frame)
-        canvas3.draw()
-        canvas3.get_tk_widget().pack(pady=10, padx=5, fill='x')
-        self.graph_widgets.append(canvas3)
-
-    def _create_dual_axis_graph(self, times, primary_values, secondary_values, primary_label, secondary_label,primary_color, secondary_color, min_time, max_time, resistance=False):
-        """Helper function to create dual-axis charts."""
         fig = Figure(figsize=(4.5, 3))
         ax1 = fig.add_subplot(111)
 
-        ax1.plot(times, primary_values, color=primary_color, label=primary_label)
+        primary_line, = ax1.plot([], [], color=primary_color, label=primary_label)
         ax1.set_xlabel('Time (min)')
         ax1.set_ylabel(primary_label, color=primary_color)
         ax1.tick_params(axis='y', labelcolor=primary_color)
-        ax1.set_xlim(min_time, max_time)
-        ax1.set_ylim(bottom=0)  # y-Achse beginnt bei 0
         #ax1.legend(loc='upper left')
 
         ax2 = ax1.twinx()
-        ax2.plot(times, secondary_values, color=secondary_color, linestyle='--', label=secondary_label)
+        secondary_line, = ax2.plot([], [], color=secondary_color, linestyle='--', label=secondary_label)
         ax2.set_ylabel(secondary_label, color=secondary_color)
         ax2.tick_params(axis='y', labelcolor=secondary_color)
-        ax2.set_ylim(bottom=0)  # y-Achse beginnt bei 0
         #ax2.legend(loc='upper right')
 
         if resistance:
@@ -1434,7 +1487,29 @@ class GraphsPage(ttk.Frame):    #Graphs in StatisticsPage from LastTraining
             ax2.grid(True, axis='y', linestyle=':', alpha=0.3)
 
         fig.tight_layout()
-        return fig, ax1
+        canvas = FigureCanvasTkAgg(fig, self.charts_frame)
+        canvas.get_tk_widget().pack(pady=10, padx=5, fill='x')
+        self.graph_widgets.append(canvas)
+
+        return {
+            'figure': fig, 'canvas': canvas, 'ax1': ax1, 'ax2': ax2,
+            'primary_line': primary_line, 'secondary_line': secondary_line, 'resistance': resistance,
+        }
+
+    def _update_dual_axis_graph(self, chart, primary, secondary, min_time, max_time):
+        """Setzt neue Daten (je ein (x, y)-Paar) in ein bestehendes Diagramm (set_data statt neuer Figure)."""
+        primary_values = primary[1]
+        secondary_values = secondary[1]
+        chart['primary_line'].set_data(*primary)
+        chart['secondary_line'].set_data(*secondary)
+
+        ax1, ax2 = chart['ax1'], chart['ax2']
+        ax1.set_xlim(min_time, max_time if max_time > min_time else min_time + 1)
+        ax1.set_ylim(0, max(max(primary_values, default=0) * 1.05, 1))  # y-Achse beginnt bei 0
+        if not chart['resistance']:
+            ax2.set_ylim(0, max(max(secondary_values, default=0) * 1.05, 1))  # y-Achse beginnt bei 0
+
+        chart['canvas'].draw_idle()
 
     def show_graphs(self):
         """Switch to GraphsPage and update graphs."""
@@ -1,7 +1,18 @@
 import os
 import json
 import time
-from datetime import datetime
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from live_statistics import LiveTrainingStatistics
+from measurement_store import MeasurementStore
+from session_aggregates import compute_session_summary
+from session_index import SessionIndex
+from session_rollups import ROLLUP_DIRECTORY, build_rollups, rollup_path, write_rollups, read_rollups
+from raw_log import RAW_DIRECTORY, RawLog, RawLogWriter, capture_enabled, find_captures, raw_log_path
+from session_recorder import SessionRecorder, find_recordings, read_recording, finalize_recording
+from training_session import SampleCache, TrainingSession
 
 # ✅ Die Funktion muss vor `TrainingDataManager` stehen!
 def parse_training_timestamp(timestamp):
@@ -16,49 +27,91 @@ def parse_training_timestamp(timestamp):
     return datetime.now()
 
 class TrainingDataManager:
-    def __init__(self, directory="/home/pi/MedUniTrainer/training_sessions"):
+    def __init__(self, directory="/home/pi/MedUniTrainer/training_sessions", raw_capture=None):
+        """`raw_capture`: Rohdaten-Log (jede Flanke) mitschreiben, None = laut BERKELBIKE_RAW_CAPTURE."""
         self.directory = directory
         if not os.path.exists(self.directory):
             os.makedirs(self.directory)
-        self.resistance_data = {}  # Widerstandsdaten sammeln
-        self.current_training_data = []  # Einzelne Messwerte pro Sekunde
+        self.live_stats = LiveTrainingStatistics()  # laufende Kennzahlen und Widerstandsdaten, O(1) pro Messwert
+        self.current_training_data = MeasurementStore()  # Einzelne Messwerte pro Sekunde (spaltenweise)
         self.training_name = ""
         self.timestamp = ""
+        self.recorder = None  # schreibt jeden Messwert sofort auf die Karte
+        self.session_open = False  # Messwerte werden nur zwischen start_session() und reset_values() angenommen
+        self._session_lock = threading.Lock()  # Abtast-Thread (add_measurement) gegen Verwerfen/Zurücksetzen
+        self.raw_capture = capture_enabled() if raw_capture is None else raw_capture
+        self.raw_log = None  # Rohdaten-Log des laufenden Trainings
+        self.index = SessionIndex(self.directory)  # Kennzahlen aller Trainings, damit nicht jede Datei geparst wird
+        self.sample_cache = SampleCache(max_sessions=3)  # nur die gerade angezeigten Messwerte im Speicher
+
+        # Katalog aller Trainings, nach Datum sortiert (älteste zuerst). Wird nur im Tk-Thread geändert,
+        # die Datei-Operationen (Speichern, Laden, Löschen) können dagegen im Hintergrund laufen.
+        self.sessions = []
+        self._session_keys = []  # (training_date, filename) parallel zu `sessions`, für bisect
+        self._listeners = []
+
+    def start_session(self):
+        """Ab jetzt werden Messwerte für ein neues Training angenommen."""
+        with self._session_lock:
+            self.session_open = True
 
     def add_measurement(self, measurement):
-        """Fügt einen Messwert zur aktuellen Trainingssession hinzu."""
+        """Fügt einen Messwert zur aktuellen Trainingssession hinzu.
+
+        Nach `reset_values()` (Training verworfen bzw. gespeichert) wird ein verspäteter Messwert
+        des Abtast-Threads verworfen, sonst legte er eine neue Aufnahmedatei an, die beim nächsten
+        Start als abgebrochenes Training wiederhergestellt würde.
+        """
         #print(f"📏 DEBUG: add_measurement() wurde aufgerufen mit {measurement}")
-        self.current_training_data.append(measurement)
+        with self._session_lock:
+            if not self.session_open:
+                return
+            self.current_training_data.append(measurement)
+            self.live_stats.add_measurement(measurement)
+            if self.recorder is None:
+                self.recorder = SessionRecorder.start(self.directory, self.training_name)
+            self.recorder.append(measurement)
+
+    def start_raw_capture(self, start_ns=None):
+        """Beginnt ein Rohdaten-Log für das neue Training. None, wenn die Aufnahme nicht eingeschaltet ist.
+
+        `start_ns`: Startzeit auf der Zeitbasis der Sensoren (siehe `RawLogWriter.start`).
+        """
+        if not self.raw_capture:
+            return None
+        if self.raw_log is not None:
+            self.raw_log.discard()
+        try:
+            self.raw_log = RawLogWriter.start(self.directory, start_ns=start_ns)
+        except OSError as e:
+            print(f"Fehler beim Anlegen des Rohdaten-Logs: {e}")
+            self.raw_log = None
+        return self.raw_log
 
     def get_resistance_summary(self):
         """Berechnet eine Zusammenfassung der Widerstandsdaten."""
-        resistance_summary = []
-        for level, data in self.resistance_data.items():
-            if data['count'] > 0:
-                avg_power = data['total_power'] / data['count']
-                max_power = max(
-                    entry['power'] for entry in self.current_training_data
-                    if entry['resistance_level'] == level
-                ) if data['count'] > 0 else 0
-
-                resistance_summary.append({
-                    'resistance_level': level,
-                    'total_time': data['total_time'],
-                    'avg_power': round(avg_power, 1),
-                    'max_power': round(max_power, 1)
-                })
-
-        return sorted(resistance_summary, key=lambda x: x['resistance_level'])
+        return self.live_stats.resistance_summary()
 
     def reset_values(self):
-        """Setzt die aktuellen Trainingsdaten zurück."""
+        """Setzt die aktuellen Trainingsdaten zurück. Bis zum nächsten `start_session()` werden keine Messwerte angenommen."""
+        with self._session_lock:
+            self.session_open = False
+            if self.recorder is not None:
+                self.recorder.discard()
+                self.recorder = None
+        if self.raw_log is not None:
+            self.raw_log.discard()
+            self.raw_log = None
         self.current_training_data.clear()
-        self.resistance_data.clear()
+        self.live_stats = LiveTrainingStatistics()
         self.training_name = ""
         self.timestamp = ""
 
-    def save_training_session(self):
-        """Speichert die aktuelle Trainingssession als JSON-Datei."""
+    def save_training_session(self, sampling=None):
+        """Speichert die aktuelle Trainingssession als JSON-Datei.
+
+        `sampling` sind optional die Taktstatistiken der Abtastung (verspätete/ausgefallene Ticks).
+        """
         if not self.current_training_data:
             #Hier wird überprüft, ob es aktuell Trainingsdaten (self.current_training_data) gibt. Wenn die Liste oder das Dictionary leer ist, wird die Funktion ohne eine Datei zu erstellen beendet.
             return None
@@ -68,49 +121,300 @@ class TrainingDataManager:
         self.training_name = self.timestamp
         filename = f"training_{self.timestamp.replace(':', '').replace(' ', '_')}.json"              #Dateiname genereieren
         filepath = os.path.join(self.directory, filename)           #Dateipfad zusammenführen
-        resistance_summary = self.get_resistance_summary()
-
-        training_data = {                                           #Dictionary für training erstellen
+        # Kennzahlen wurden während des Trainings laufend mitgerechnet und werden mit dem Training abgelegt
+        aggregates = self.live_stats.aggregates()
+        resistance_summary = self.live_stats.resistance_summary()
+        metadata = {                                                #Dictionary für training erstellen
             "training_name": self.training_name,                    #Name Trainingssession
             "timestamp": self.timestamp, # Aktuelle Uhrzeit und Datum lesbar
-            "data": self.current_training_data,                         #aktuelle Trainingsmesswerte
-            "resistance_summary": resistance_summary
+            "resistance_summary": resistance_summary,
+            "aggregates": aggregates
         }
+        if sampling is not None:
+            metadata["sampling"] = sampling
 
-        with open(filepath, "w") as f:                              #Speichern der Daten in JSON file
-            json.dump(training_data, f, indent=4)                   #indent für bessere lebarkeit
+        if self.recorder is not None:
+            # Messwerte liegen schon in der Aufnahmedatei, nur noch ins Trainingsformat umkopieren
+            self.recorder.finalize(filepath, metadata)
+            self.recorder = None
+        else:
+            training_data = dict(metadata, data=self.current_training_data.to_records())  #aktuelle Trainingsmesswerte
+            with open(filepath, "w") as f:                          #Speichern der Daten in JSON file
+                json.dump(training_data, f, indent=4)                   #indent für bessere lebarkeit
 
+        # Vorberechnete Stufen (10 s / 1 min / 5 min) für die Diagramme
+        self._write_rollups(filename, self.current_training_data)
+
+        if self.raw_log is not None:
+            try:
+                self.raw_log.finalize(raw_log_path(self.directory, filename))
+            except OSError as e:
+                print(f"Fehler beim Speichern des Rohdaten-Logs für {filename}: {e}")
+            self.raw_log = None
+
+        # Index gleich mitführen
+        self.index.load()
+        self.index.update(filename, os.stat(filepath), self.training_name, self.timestamp,
+                          resistance_summary, aggregates)
+        self.index.save()
 
         self.reset_values()
         return filepath
 
+    def recover_partial_sessions(self):
+        """Macht aus abgebrochenen Aufnahmen (z.B. Stromausfall) normale Trainingsdateien.
+
+        Läuft beim Start im Hintergrund; ein schon gestartetes Training wird dabei übersprungen.
+        """
+        recovered = []
+        recovered_starts = []  # (startzeit, dateiname) für die Zuordnung der Rohdaten-Logs
+        for recording_path in find_recordings(self.directory):
+            recorder = self.recorder
+            if recorder is not None and recording_path == recorder.filepath:
+                continue  # Aufnahme des laufenden Trainings
+            try:
+                header, measurements = read_recording(recording_path)
+                if not header or not measurements:
+                    os.remove(recording_path)
+                    continue
+
+                started = parse_training_timestamp(header.get("timestamp", ""))
+                recording_started = started
+                # Dateiname wird aus dem Zeitstempel abgeleitet, daher darf es keine Kollision geben
+                while True:
+                    timestamp = started.strftime("%Y-%m-%d %H:%M:%S")
+                    filename = f"training_{timestamp.replace(':', '').replace(' ', '_')}.json"
+                    filepath = os.path.join(self.directory, filename)
+                    if not os.path.exists(filepath):
+                        break
+                    started += timedelta(seconds=1)
+                aggregates, resistance_summary = compute_session_summary(measurements, LiveTrainingStatistics())
+                finalize_recording(recording_path, filepath, {
+                    "training_name": header.get("training_name", timestamp),
+                    "timestamp": timestamp,
+                    "resistance_summary": resistance_summary,
+                    "aggregates": aggregates
+                })
+                self._write_rollups(filename, measurements)
+                recovered.append(filepath)
+                recovered_starts.append((recording_started, filename))
+                print(f"Abgebrochenes Training wiederhergestellt: {filepath}")
+            except (OSError, ValueError) as e:
+                print(f"Fehler beim Wiederherstellen von {recording_path}: {e}")
+        self._recover_raw_captures(recovered_starts)
+        return recovered
+
+    def _recover_raw_captures(self, recovered_starts, tolerance=10):
+        """Ordnet Rohdaten-Logs abgebrochener Trainings (capture_*.bin) dem wiederhergestellten Training zu.
+
+        Aufnahme und Rohdaten-Log beginnen beim Start des Trainings fast gleichzeitig; passt kein
+        Training (höchstens `tolerance` Sekunden Abstand), wird das Log gelöscht.
+        """
+        for capture_path in find_captures(self.directory):
+            if self.raw_log is not None and capture_path == self.raw_log.filepath:
+                continue  # laufende Aufnahme
+            try:
+                try:
+                    with RawLog(capture_path) as log:
+                        started = datetime.fromtimestamp(log.wall_time_ns / 1e9)
+                except ValueError:
+                    started = None  # Header unvollständig, nichts zu retten
+                matches = []
+                if started is not None:
+                    for recording_started, filename in recovered_starts:
+                        distance = abs((started - recording_started).total_seconds())
+                        if distance <= tolerance:
+                            matches.append((distance, filename))
+                if matches:
+                    filename = min(matches)[1]
+                    os.replace(capture_path, raw_log_path(self.directory, filename))
+                    print(f"Rohdaten-Log wiederhergestellt: {filename}")
+                else:
+                    os.remove(capture_path)
+                    print(f"Rohdaten-Log ohne Training gelöscht: {capture_path}")
+            except OSError as e:
+                print(f"Fehler beim Wiederherstellen von {capture_path}: {e}")
+
+    # ------------------- Session-Katalog -------------------
+
+    def subscribe(self, callback):
+        """`callback(event, session)` wird bei jeder Änderung des Katalogs aufgerufen.
+
+        event ist "loaded" (ganzer Katalog neu, session=None), "added", "removed" oder "cleared".
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, event, session=None):
+        for callback in list(self._listeners):
+            try:
+                callback(event, session)
+            except Exception as e:  # eine Seite mit Fehler soll die anderen nicht blockieren
+                print(f"Fehler beim Aktualisieren nach '{event}': {e}")
+
+    @staticmethod
+    def _catalog_key(session):
+        return (session.training_date, session.filename)
+
+    def set_sessions(self, sessions):
+        """Ersetzt den ganzen Katalog (z.B. mit dem Ergebnis von `load_training_sessions()`)."""
+        self.sessions = sorted(sessions, key=self._catalog_key)
+        self._session_keys = [self._catalog_key(session) for session in self.sessions]
+        self._emit("loaded")
+
+    def insert_session(self, session):
+        """Fügt ein Training an der richtigen Stelle ein, O(log n) Suche."""
+        key = self._catalog_key(session)
+        position = bisect_right(self._session_keys, key)
+        self._session_keys.insert(position, key)
+        self.sessions.insert(position, session)
+        self._emit("added", session)
+
+    def remove_session(self, session):
+        """Nimmt ein Training aus dem Katalog, O(log n) Suche."""
+        key = self._catalog_key(session)
+        position = bisect_left(self._session_keys, key)
+        if position < len(self.sessions) and self._session_keys[position] == key:
+            del self._session_keys[position]
+            del self.sessions[position]
+            self._emit("removed", session)
+
+    def clear_sessions(self):
+        self.sessions = []
+        self._session_keys = []
+        self._emit("cleared")
+
+    def session_for_file(self, filename):
+        """TrainingSession zu einer gerade gespeicherten Datei, aus dem Index (ohne die Datei zu parsen)."""
+        entry = self.index.entries.get(filename)
+        if entry is None:
+            self.index.load()
+            entry = self.index.lookup(filename, os.stat(os.path.join(self.directory, filename)))
+        if entry is None:
+            return None
+        return self._session_from_entry(filename, entry)
+
     def get_next_training_name(self):
         """Generiert einen neuen, eindeutigen Trainingsnamen basierend auf Datum & Uhrzeit."""
         return time.strftime("%Y-%m-%d %H:%M:%S")
 
     def load_training_sessions(self):
-        """Lädt alle Trainingssessions aus dem Verzeichnis und sortiert nach Datum (neuste zuerst)."""
+        """Lädt die Übersicht aller Trainingssessions und sortiert nach Datum (älteste zuerst).
+
+        Die Kennzahlen kommen aus dem Session-Index; nur neue oder geänderte Dateien werden
+        vollständig gelesen. Die Messwerte selbst lädt `load_session_data()` bei Bedarf.
+        Der Katalog (`sessions`) wird dabei nicht verändert, dafür `set_sessions()` aufrufen.
+        """
         sessions = []
+        self.index.load()
+        filenames = [
+            filename for filename in os.listdir(self.directory)
+            if filename.startswith("training_") and filename.endswith(".json")
+        ]
 
-        for filename in os.listdir(self.directory):
-            if filename.startswith("training_") and filename.endswith(".json"):
-                filepath = os.path.join(self.directory, filename)
-                try:
+        for filename in filenames:
+            filepath = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(filepath)
+                entry = self.index.lookup(filename, stat)
+                if entry is None:
                     with open(filepath, "r") as f:
                         data = json.load(f)
+                    aggregates = data.get("aggregates")
+                    if aggregates is None:
+                        # ältere Dateien ohne gespeicherte Kennzahlen: einmal berechnen, dann im Index
+                        aggregates = compute_session_summary(data.get("data", []), LiveTrainingStatistics())[0]
+                    entry = self.index.update(
+                        filename, stat,
+                        data.get("training_name", "Unknown"),
+                        data.get("timestamp", ""),
+                        data.get("resistance_summary", []),
+                        aggregates
+                    )
+                sessions.append(self._session_from_entry(filename, entry))
 
-                    # Wenn kein Zeitstempel vorhanden, aktuelles Datum setzen
-                    if "timestamp" not in data:
-                        data["training_date"] = datetime.now()
-                    else:
-                        data["training_date"] = parse_training_timestamp(data["timestamp"])
-
-                    sessions.append(data)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Fehler beim Dekodieren von {filepath}: {e}")
 
-                except json.JSONDecodeError as e:
-                    print(f"Fehler beim Dekodieren von {filepath}: {e}")
+        self.index.prune(filenames)
+        try:
+            self.index.save()
+        except OSError as e:
+            print(f"Fehler beim Speichern des Session-Index: {e}")
 
         # Sessions nach Datum (neueste zuerst) sortieren
-        sessions.sort(key=lambda x: parse_training_timestamp(x["timestamp"])) #, reverse=True (Soll in die klammer wenn man es braucht
+        sessions.sort(key=lambda x: x.training_date) #, reverse=True (Soll in die klammer wenn man es braucht
 
         return sessions
+
+    def _session_from_entry(self, filename, entry):
+        timestamp = entry.get("timestamp")
+        return TrainingSession(
+            filename=filename,
+            training_name=entry.get("training_name", "Unknown"),
+            timestamp=timestamp,
+            # Wenn kein Zeitstempel vorhanden, aktuelles Datum setzen
+            training_date=parse_training_timestamp(timestamp) if timestamp else datetime.now(),
+            resistance_summary=entry.get("resistance_summary", []),
+            aggregates=entry.get("aggregates", {}),
+            loader=self.load_session_data,
+            cache=self.sample_cache,
+        )
+
+    def load_session_data(self, session):
+        """Lädt die Messwerte einer Session von der Karte (normalerweise über `session.data`)."""
+        filepath = os.path.join(self.directory, session.filename)
+        with open(filepath, "r") as f:
+            data = json.load(f)
+        return MeasurementStore.from_records(data.get("data", []))
+
+    def _write_rollups(self, filename, data):
+        try:
+            write_rollups(rollup_path(self.directory, filename), build_rollups(data))
+        except OSError as e:
+            print(f"Fehler beim Speichern der Rollups für {filename}: {e}")
+
+    def load_rollups(self, session):
+        """Rollups einer Session. Fehlen sie (ältere Trainings), werden sie einmal aus den Messwerten erzeugt."""
+        path = rollup_path(self.directory, session.filename)
+        rollups = read_rollups(path)
+        if rollups is None:
+            rollups = build_rollups(session.data)
+            try:
+                write_rollups(path, rollups)
+            except OSError as e:
+                print(f"Fehler beim Speichern der Rollups für {session.filename}: {e}")
+        return rollups
+
+    def delete_training_session(self, session):
+        """Löscht die Trainingsdatei einer Session, ihre Rollups, ihr Rohdaten-Log und ihren Index-Eintrag."""
+        filepath = os.path.join(self.directory, session.filename)
+        os.remove(filepath)
+        for sidecar in (rollup_path(self.directory, session.filename), raw_log_path(self.directory, session.filename)):
+            if os.path.exists(sidecar):
+                os.remove(sidecar)
+        session.release()
+        self.index.load()
+        self.index.remove(session.filename)
+        self.index.save()
+
+    def delete_all_training_sessions(self):
+        """Löscht alle Trainingsdateien samt Rollups und Rohdaten-Logs und leert den Index."""
+        for filename in os.listdir(self.directory):
+            if filename.startswith("training_") and filename.endswith(".json"):
+                os.remove(os.path.join(self.directory, filename))
+        for name in (ROLLUP_DIRECTORY, RAW_DIRECTORY):
+            sidecar_directory = os.path.join(self.directory, name)
+            if not os.path.isdir(sidecar_directory):
+                continue
+            for filename in os.listdir(sidecar_directory):
+                if self.raw_log is not None and os.path.join(sidecar_directory, filename) == self.raw_log.filepath:
+                    continue  # laufende Aufnahme
+                os.remove(os.path.join(sidecar_directory, filename))
+        self.sample_cache.clear()
+        self.index.load()
+        self.index.prune([])
+        self.index.save()
@@ -0,0 +1,168 @@
+import threading
+from collections import deque
+
+from sampling_scheduler import DeadlineClock
+
+
+class SensorSnapshot:
+    """Ein abgetasteter Messwert inkl. berechneter Werte, wie er an die Anzeige geht."""
+    __slots__ = ("sequence", "time_seconds", "cadence", "resistance_level", "power", "speed", "distance",
+                 "heartrate", "power_smoothed")
+
+    def __init__(self, sequence, time_seconds, cadence, resistance_level, power, speed, distance, heartrate,
+                 power_smoothed):
+        self.sequence = sequence
+        self.time_seconds = time_seconds
+        self.cadence = cadence
+        self.resistance_level = resistance_level
+        self.power = power
+        self.speed = speed
+        self.distance = distance
+        self.heartrate = heartrate
+        self.power_smoothed = power_smoothed  # {fenster_sekunden: mittelwert}
+
+    def as_measurement(self):
+        return {
+            "time_seconds": self.time_seconds,
+            "cadence": self.cadence,
+            "resistance_level": self.resistance_level,
+            "power": self.power,
+            "speed": self.speed,
+            "distance": self.distance,
+            "heartrate": self.heartrate
+        }
+
+
+class AcquisitionThread(threading.Thread):
+    """Eigener Thread für die Abtastung der Sensoren (Producer).
+
+    Liest im festen Takt (`DeadlineClock`) Kadenz und Herzfrequenz, berechnet Power, Speed und
+    Distanz und speichert den Messwert im TrainingDataManager. Die Anzeige (Consumer im
+    Tk-Thread) holt sich nur den neuesten Snapshot über `latest` oder alle neuen über `drain()`,
+    d.h. langsames Zeichnen im Tk-Thread verzögert die Abtastung nicht mehr.
+    """
+
+    def __init__(self, sensor_manager, heart_rate_sensor, training_manager, get_resistance_level,
+                 power_model, speed_model, interval=1.0, buffer_size=600):
+        super().__init__(name="acquisition", daemon=True)
+        self.sensor_manager = sensor_manager
+        self.heart_rate_sensor = heart_rate_sensor
+        self.training_manager = training_manager
+        self.get_resistance_level = get_resistance_level
+        self.power_model = power_model
+        self.speed_model = speed_model
+        self.clock = DeadlineClock(interval)
+
+        self._stop_event = threading.Event()
+        self._active = threading.Event()  # gesetzt = abtasten, gelöscht = Pause
+        self._restart = True
+        self._snapshots = deque(maxlen=buffer_size)  # deque.append/popleft sind threadsicher
+        self._latest = None  # Referenz-Zuweisung ist atomar, kein Lock nötig
+        self._sequence = 0
+
+        self.elapsed_time = 0.0
+        self.total_distance = 0.0
+        self.last_update_time = None
+
+    @property
+    def latest(self):
+        """Neuester Snapshot oder None."""
+        return self._latest
+
+    def drain(self):
+        """Gibt alle seit dem letzten Aufruf neuen Snapshots zurück (für Consumer, die jeden Wert brauchen)."""
+        snapshots = []
+        while True:
+            try:
+                snapshots.append(self._snapshots.popleft())
+            except IndexError:
+                return snapshots
+
+    def start_sampling(self):
+        """Startet bzw. setzt die Abtastung fort. Beim Start kommt der erste Messwert sofort, nach einer Pause nach einem Intervall."""
+        self._restart = True
+        self._active.set()
+        if not self.is_alive():
+            self.start()
+
+    def pause(self):
+        self._active.clear()
+
+    def stop(self, timeout=2.0):
+        """Beendet den Thread und wartet, bis ein laufender Messwert fertig gespeichert ist.
+
+        Gibt False zurück, wenn der Thread nach `timeout` Sekunden noch läuft (dann mit
+        `wait_stopped()` weiter warten, bevor das Training gespeichert oder verworfen wird).
+        """
+        self._stop_event.set()
+        self._active.set()  # aus dem Warten auf Fortsetzen aufwecken
+        return self.wait_stopped(timeout)
+
+    def wait_stopped(self, timeout=None):
+        """Wartet, bis der Thread beendet ist. True, wenn er nicht mehr läuft."""
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=timeout)
+        return not self.is_alive()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            if not self._active.wait(timeout=0.5):
+                continue
+            if self._stop_event.is_set():
+                break
+
+            if self._restart and self._sequence:
+                # Fortsetzen nach Pause: die Pause zählt nicht zur Trainingszeit, der nächste Messwert
+                # kommt nach einem Intervall (sonst gäbe es zwei Messwerte mit derselben Zeit)
+                self._restart = False
+                self.last_update_time = self.clock.restart()
+                continue
+            if self._restart:
+                self._restart = False
+                sample_time = self.clock.start()
+                self.last_update_time = sample_time
+            else:
+                if self._stop_event.wait(self.clock.delay()):
+                    break
+                if not self._active.is_set() or self._restart:
+                    continue
+                sample_time = self.clock.tick()
+
+            try:
+                self._sample(sample_time)
+            except Exception as e:  # Thread darf wegen eines einzelnen Messwerts nicht sterben
+                print(f"Fehler bei der Abtastung: {e}")
+
+    def _sample(self, sample_time):
+        elapsed = sample_time - self.last_update_time
+        self.elapsed_time += elapsed
+        self.last_update_time = sample_time
+
+        cadence = self.sensor_manager.get_cadence()
+        resistance_level = self.get_resistance_level()
+        power = self.power_model(cadence, resistance_level)
+        speed = self.speed_model(power)
+
+        # Distance calculation
+        self.total_distance += speed * (elapsed / 3600) * 1000
+
+        heart_rate = self.heart_rate_sensor.get_heart_rate()
+
+        self._sequence += 1
+        measurement = {
+            "time_seconds": self.elapsed_time,
+            "cadence": cadence,
+            "resistance_level": resistance_level,
+            "power": power,
+            "speed": speed,
+            "distance": self.total_distance,
+            "heartrate": heart_rate
+        }
+        # Speichert den Messwert (inkl. Aufnahmedatei) und aktualisiert die laufende Statistik
+        self.training_manager.add_measurement(measurement)
+
+        smoothing = self.training_manager.live_stats.power_smoothing
+        power_smoothed = {size: smoothing.mean(size) for size in smoothing.windows}
+        snapshot = SensorSnapshot(self._sequence, **measurement, power_smoothed=power_smoothed)
+        self._latest = snapshot
+        self._snapshots.append(snapshot)
@@ -0,0 +1,108 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundJobs:
+    """Führt langsame Arbeit (Speichern, Laden, Löschen, Datenaufbereitung) im Hintergrund aus.
+
+    `submit()` wird nur aus dem Tk-Thread aufgerufen. Die Arbeit läuft in einem Thread-Pool,
+    das Ergebnis kommt über eine Queue zurück und `on_done`/`on_error` werden per `after()`
+    wieder im Tk-Thread aufgerufen; nur dort wird gezeichnet.
+
+    Jobs mit gleichem `key` werden zusammengefasst: läuft schon einer, wird der neue nur vorgemerkt
+    (ein späterer ersetzt einen vorgemerkten) und nach dem laufenden genau einmal ausgeführt.
+
+    Standardmäßig gibt es nur einen Worker, damit Index und Trainingsdateien nie von zwei
+    Jobs gleichzeitig geschrieben werden.
+    """
+
+    def __init__(self, widget, max_workers=1, poll_interval_ms=50):
+        self.widget = widget
+        self.poll_interval_ms = poll_interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="background")
+        self._results = queue.Queue()
+        self._jobs = {}  # key -> {"description": ..., "next": vorgemerkter Job oder None}
+        self._anonymous = 0
+        self._after_id = None
+        self._status_listeners = []
+        self._status = ""
+
+    def submit(self, work, on_done=None, on_error=None, key=None, description=""):
+        """Startet `work()` im Hintergrund. Gibt False zurück, wenn der Job nur vorgemerkt wurde."""
+        job = (work, on_done, on_error, description)
+        if key is None:
+            self._anonymous += 1
+            key = ("anonymous", self._anonymous)
+        elif key in self._jobs:
+            self._jobs[key]["next"] = job
+            return False
+
+        self._start(key, job)
+        return True
+
+    def _start(self, key, job):
+        work, on_done, on_error, description = job
+        self._jobs[key] = {"description": description, "next": None}
+        future = self._executor.submit(work)
+        future.add_done_callback(lambda f: self._results.put((key, job, f)))  # läuft im Worker-Thread
+        self._notify_status()
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self):
+        self._after_id = None
+        while True:
+            try:
+                key, job, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            _, on_done, on_error, description = job
+            next_job = self._jobs.pop(key)["next"]
+
+            error = future.exception()
+            if error is not None:
+                print(f"Fehler im Hintergrund ({description or key}): {error}")
+                if on_error:
+                    on_error(error)
+            elif on_done:
+                try:
+                    on_done(future.result())
+                except Exception as e:  # ein Fehler beim Anzeigen darf die anderen Ergebnisse nicht blockieren
+                    print(f"Fehler beim Übernehmen von ({description or key}): {e}")
+
+            if next_job is not None:
+                self._start(key, next_job)
+
+        self._notify_status()
+        if self._jobs and self._after_id is None:
+            self._after_id = self.widget.after(self.poll_interval_ms, self._poll)
+
+    @property
+    def busy(self):
+        return bool(self._jobs)
+
+    def is_pending(self, key):
+        return key in self._jobs
+
+    def status_text(self):
+        """Beschreibung der laufenden Jobs für die Statusanzeige ("" wenn nichts läuft)."""
+        descriptions = [job["description"] for job in self._jobs.values() if job["description"]]
+        return " · ".join(dict.fromkeys(descriptions))
+
+    def add_status_listener(self, callback):
+        """`callback(text)` wird im Tk-Thread aufgerufen, wenn sich die laufenden Jobs ändern."""
+        self._status_listeners.append(callback)
+
+    def _notify_status(self):
+        text = self.status_text()
+        if text == self._status:
+            return
+        self._status = text
+        for callback in self._status_listeners:
+            callback(text)
+
+    def shutdown(self, wait=True):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,141 @@
+"""Misst die Erfassung ohne Hardware (synthetische Sensoren aus `sensor_backends`).
+
+1. Kadenz-Schätzung offline: alle Flanken eines Profils durch den RPMCalculator, Zeit pro
+   Flanke und Abweichung von der vorgegebenen Kadenz
+2. ganze Erfassung live: SyntheticBackend -> CadenceSensorManager/HeartRateSensor ->
+   AcquisitionThread -> TrainingDataManager (in einem temporären Verzeichnis)
+
+    python3 benchmarks/acquisition_benchmark.py [--seconds N] [--speed X] [--interval S]
+
+`--seconds` und `--interval` sind virtuelle Sekunden der Sensoren: mit `--speed 20` dauert ein
+Lauf über 60 s nur 3 s, Kadenz und Anzahl Messwerte bleiben gleich.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import power_model
+import sensor_backends
+from acquisition import AcquisitionThread
+from cadence_sensor_manager import CadenceSensorManager
+from HeartRateSensor import HeartRateSensor
+from rpm_calculator import RPMCalculator
+from TrainingDataManager import TrainingDataManager
+
+# für den Live-Lauf: wird von Anfang an getreten (DEFAULT_PROFILE beginnt mit 30 s Stillstand)
+PIPELINE_PROFILE = ((20, 40), (20, 55), (20, 30))
+
+
+def expected_rpm(profile, t):
+    for duration, rpm in profile:
+        if t < duration:
+            return rpm
+        t -= duration
+    return 0
+
+
+def benchmark_estimator(profile, jitter, bounce_probability):
+    events = list(sensor_backends.generate_edge_events(profile, jitter, bounce_probability, seed=1))
+    calculator = RPMCalculator()
+
+    started = time.perf_counter()
+    for timestamp_ns, _, _ in events:
+        calculator.add_edge(timestamp_ns / 1e9)
+    elapsed = time.perf_counter() - started
+    print(f"RPMCalculator: {len(events)} Flanken, {elapsed / len(events) * 1e6:.1f} µs pro Flanke, "
+          f"{calculator.rejected_edges} verworfen")
+
+    # Abweichung einmal pro Sekunde, Übergänge zwischen Profilabschnitten (je 5 s) ausgenommen
+    calculator = RPMCalculator()
+    errors = []
+    index = 0
+    boundaries = []
+    total = 0
+    for duration, _ in profile:
+        total += duration
+        boundaries.append(total)
+    for second in range(1, total):
+        while index < len(events) and events[index][0] <= second * 1e9:
+            calculator.add_edge(events[index][0] / 1e9)
+            index += 1
+        target = expected_rpm(profile, second)
+        if target and all(abs(second - boundary) > 5 for boundary in boundaries):
+            errors.append(abs(calculator.get_rpm(second) - target))
+    if errors:
+        print(f"  Abweichung: Median {statistics.median(errors):.1f} RPM, max {max(errors):.1f} RPM")
+
+
+def benchmark_pipeline(seconds, speed, interval):
+    backend = sensor_backends.SyntheticBackend(PIPELINE_PROFILE, speed=speed, seed=1)
+    sensor_manager = CadenceSensorManager(backend=backend)
+    heart_rate_sensor = HeartRateSensor(backend=backend)
+    sensor_manager.start_SensorRead()
+
+    with tempfile.TemporaryDirectory() as directory:
+        training_manager = TrainingDataManager(directory)
+        training_manager.training_name = "benchmark"
+        training_manager.start_session()
+
+        cadence_timings = []
+        get_cadence = sensor_manager.get_cadence
+
+        def timed_get_cadence():
+            started = time.perf_counter()
+            cadence = get_cadence()
+            cadence_timings.append(time.perf_counter() - started)
+            return cadence
+
+        sensor_manager.get_cadence = timed_get_cadence
+        acquisition = AcquisitionThread(
+            sensor_manager=sensor_manager,
+            heart_rate_sensor=heart_rate_sensor,
+            training_manager=training_manager,
+            get_resistance_level=lambda: 3,
+            power_model=power_model.lookup_power,
+            speed_model=power_model.calculate_speed,
+            interval=interval / speed,  # Abtastung läuft auf Echtzeit
+        )
+        acquisition.start_sampling()
+        time.sleep(seconds / speed)
+        acquisition.stop()
+        sensor_manager.stop()
+        heart_rate_sensor.stop()
+
+        aggregates = training_manager.live_stats.aggregates()
+        cadences = list(training_manager.current_training_data.column("cadence"))
+        expected = [expected_rpm(PIPELINE_PROFILE, (i * interval) % sum(d for d, _ in PIPELINE_PROFILE))
+                    for i in range(len(cadences))]
+        started = time.perf_counter()
+        training_manager.save_training_session(sampling=acquisition.clock.stats())
+        save_time = time.perf_counter() - started
+
+        print(f"Erfassung: {seconds}s mit speed={speed}, interval={interval}s")
+        print(f"  Takt: {acquisition.clock.stats()}")
+        print(f"  Flanken verarbeitet (CHN): {sensor_manager.get_Counter()}, verworfen (Puffer voll): "
+              f"{sensor_manager.dropped_edges}")
+        if cadence_timings:
+            print(f"  get_cadence: Median {statistics.median(cadence_timings) * 1e6:.0f} µs, "
+                  f"max {max(cadence_timings) * 1e6:.0f} µs")
+        if cadences:
+            print(f"  Kadenz: Mittel {statistics.mean(cadences):.1f} RPM (Profil {statistics.mean(expected):.1f} RPM)")
+        print(f"  Speichern: {save_time * 1000:.0f} ms {aggregates}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the acquisition path with synthetic sensors.")
+    parser.add_argument("--seconds", type=float, default=10, help="duration of the live pipeline run")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed of the synthetic sensors")
+    parser.add_argument("--interval", type=float, default=1.0, help="sampling interval of the acquisition thread")
+    args = parser.parse_args()
+
+    benchmark_estimator(sensor_backends.DEFAULT_PROFILE, jitter=0.02, bounce_probability=0.02)
+    benchmark_pipeline(args.seconds, args.speed, args.interval)
+
+
+if __name__ == "__main__":
+    main()
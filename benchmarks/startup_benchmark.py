@@ -0,0 +1,92 @@
+"""Misst die Startzeit der App.
+
+1. Import von TrainingApp in einem frischen Prozess (und ob matplotlib/numpy dabei schon geladen werden)
+2. mit --gui: Zeit bis die TrainingPage steht, bis die Trainings geladen sind und für den ersten
+   Aufbau jeder anderen Seite (braucht Display und Sensoren, also auf dem Pi ausführen)
+
+    python3 benchmarks/startup_benchmark.py [--runs N] [--gui]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import statistics
+
+REPO_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import sys, time, json
+started = time.perf_counter()
+import TrainingApp
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "import_seconds": elapsed,
+    "matplotlib_loaded": "matplotlib" in sys.modules,
+    "numpy_loaded": "numpy" in sys.modules,
+}))
+"""
+
+
+def measure_import(runs):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=REPO_DIRECTORY,
+                                capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    times = [result["import_seconds"] for result in results]
+    print(f"Import TrainingApp: median {statistics.median(times) * 1000:.0f} ms, "
+          f"min {min(times) * 1000:.0f} ms ({runs} runs)")
+    print(f"  matplotlib geladen: {results[-1]['matplotlib_loaded']}, numpy geladen: {results[-1]['numpy_loaded']}")
+
+
+def measure_gui():
+    sys.path.insert(0, REPO_DIRECTORY)
+    started = time.perf_counter()
+    import TrainingApp
+    imported = time.perf_counter()
+    app = TrainingApp.TrainingApp()
+    constructed = time.perf_counter()
+
+    timings = {}
+
+    def after_first_idle():
+        timings["sessions_loaded"] = time.perf_counter()
+        for page_name in ("StartPage", "StatisticsPage", "GraphsPage"):
+            page_started = time.perf_counter()
+            app.show_frame(page_name)
+            app.update_idletasks()
+            timings[page_name] = time.perf_counter() - page_started
+        app.show_frame("TrainingPage")
+        app.quit()
+
+    # läuft nach `load_sessions`, das die App selbst per after_idle einplant
+    app.after_idle(after_first_idle)
+    app.mainloop()
+
+    print(f"Import: {(imported - started) * 1000:.0f} ms")
+    print(f"TrainingPage sichtbar (Konstruktor): {(constructed - imported) * 1000:.0f} ms")
+    print(f"Trainings geladen ({len(app.training_sessions)}): {(timings['sessions_loaded'] - constructed) * 1000:.0f} ms")
+    for page_name in ("StartPage", "StatisticsPage", "GraphsPage"):
+        print(f"Erster Aufbau {page_name}: {timings[page_name] * 1000:.0f} ms")
+
+    app.frames["TrainingPage"].stop_acquisition()
+    if app.sensor_manager:
+        app.sensor_manager.stop()
+    app.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure application startup time.")
+    parser.add_argument("--runs", type=int, default=5, help="number of import measurements")
+    parser.add_argument("--gui", action="store_true", help="also start the app and time page construction")
+    args = parser.parse_args()
+
+    measure_import(args.runs)
+    if args.gui:
+        measure_gui()
+
+
+if __name__ == "__main__":
+    main()
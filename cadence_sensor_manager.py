@@ -10,56 +10,119 @@ except ImportError:
     GPIO = None
 
 from rpm_calculator import RPMCalculator
+from quadrature import QuadratureDecoder
+from edge_queue import EdgeQueue, EDGE_CHN, EDGE_AB
+from raw_log import EVENT_EDGE
+
+CHA_PIN = 5
+CHB_PIN = 6
+CHN_PIN = 22
 
 
 class CadenceSensorManager(object):
-    def __init__(self):
+    def __init__(self, counts_per_revolution=None, use_quadrature=True, backend=None):
+        """`counts_per_revolution`: Schritte des Encoders pro Umdrehung (4-fach dekodiert), None = an CHN messen.
+
+        `backend`: optionale Sensorquelle aus `sensor_backends` statt GPIO (Simulation, Wiedergabe).
+        """
         self._stop_event = threading.Event()
         self.sensor_thread = None
         self.rpm_calculator = RPMCalculator()
+        self.quadrature = QuadratureDecoder(counts_per_revolution)
+        self.edges = EdgeQueue()  # GPIO-Callbacks schreiben nur hier hinein, gerechnet wird in get_cadence()
+        self._consumer_lock = threading.Lock()  # nur zwischen Lesern, nie im GPIO-Callback
         self.last_valid_rpm = 0
+        self.raw_log = None  # optional RawLogWriter: jede Flanke wird mitgeschrieben
+        self.backend = backend
+        self.clock = backend.clock if backend is not None else time.perf_counter  # Zeitbasis der Flanken
+        self.uses_gpio = False
 
-        if GPIO:
+        if backend is not None:
+            self.Counter = 0
+            backend.cadence_sink = self.edges.push  # gleiche Verarbeitung wie die GPIO-Flanken
+        elif GPIO:
+            self.uses_gpio = True
             GPIO.setmode(GPIO.BCM)
             GPIO.setwarnings(False)
 
-            self.__port_CHN = 22
+            self.__port_CHN = CHN_PIN
             self.Counter = 0
-            self.CrankAngle = 0
             self.can_count = False
 
-            # CHA und CHB ruhig stellen
-            CHA_PIN = 5
-            CHB_PIN = 6
+            # CHA und CHB: Quadratur-Encoder für den Kurbelwinkel (ohne Encoder bleiben sie ruhig)
             GPIO.setup(CHA_PIN, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
             GPIO.setup(CHB_PIN, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+            if use_quadrature:
+                self.edges.push(time.perf_counter_ns(), EDGE_AB | (GPIO.input(CHA_PIN) << 1) | GPIO.input(CHB_PIN))
+                GPIO.add_event_detect(CHA_PIN, GPIO.BOTH, callback=self.__ENCODER_AB_callback)
+                GPIO.add_event_detect(CHB_PIN, GPIO.BOTH, callback=self.__ENCODER_AB_callback)
 
             GPIO.setup(self.__port_CHN, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
             GPIO.add_event_detect(self.__port_CHN, GPIO.RISING, callback=self.__ENCODER_CHN_callback, bouncetime=5)
         else:
             self.Counter = 0
 
-    def __ENCODER_CHN_callback(self, channel):
-        now = time.perf_counter()  # Aktuelle Zeit (hohe Auflösung)
+    @property
+    def CrankAngle(self):
+        """Kurbelwinkel in Grad (nur mit angeschlossenem Encoder, sonst 0)."""
+        self.process_edges()
+        return self.quadrature.crank_angle
+
+    # GPIO-Callbacks: laufen im Callback-Thread von RPi.GPIO und legen nur den Zeitstempel ab
 
-        self.last_chn_time = now  # Zeit des letzten gültigen Impulses merken
+    def __ENCODER_AB_callback(self, channel):
+        self.edges.push(time.perf_counter_ns(), EDGE_AB | (GPIO.input(CHA_PIN) << 1) | GPIO.input(CHB_PIN))
 
-        #self.CrankAngle = 0
+    def __ENCODER_CHN_callback(self, channel):
+        self.edges.push(time.perf_counter_ns(), EDGE_CHN)
+
+    def process_edges(self):
+        """Verarbeitet alle seit dem letzten Aufruf aufgezeichneten Flanken (Consumer-Seite)."""
+        with self._consumer_lock:
+            self.edges.drain(self._handle_edge)
+
+    def _handle_edge(self, timestamp_ns, kind):
+        raw_log = self.raw_log
+        if raw_log is not None:
+            raw_log.append(timestamp_ns, EVENT_EDGE, kind)
+        timestamp = timestamp_ns / 1e9  # gleiche Zeitbasis wie self.clock()
+        if kind & EDGE_AB:
+            self.quadrature.update((kind >> 1) & 1, kind & 1, timestamp)
+            return
+        self.last_chn_time = timestamp  # Zeit des letzten gültigen Impulses merken
         self.Counter += 1
-        #print(f"⚡️ CHN erkannt! Counter: {self.Counter} bei {now: .6f}")
-        self.rpm_calculator.increment_rounds()
+        if self.rpm_calculator.add_edge(timestamp):
+            self.quadrature.index()  # Kurbelwinkel auf 0, Schritte pro Umdrehung nachmessen (nicht bei Prellen)
+
+    @property
+    def dropped_edges(self):
+        """Flanken, die wegen vollem Puffer verworfen wurden."""
+        return self.edges.dropped
 
     def reset(self):
-        self.Counter = 0
+        """Vor einem neuen Training: Flanken aus der Zeit ohne Training verwerfen, Schätzer neu beginnen."""
+        with self._consumer_lock:
+            self.edges.clear()
+            self.rpm_calculator.reset()
+            self.quadrature.reset()
+            self.last_valid_rpm = 0
+            self.Counter = 0
 
     def get_Counter(self):
+        self.process_edges()
         return self.Counter
 
     def get_cadence(self):
-        now = time.perf_counter()
+        self.process_edges()
+        now = self.clock()
+
+        # Mit Encoder: Kadenz mehrmals pro Umdrehung, auch bei langsamem Treten sofort aktuell
+        if self.quadrature.active:
+            return round(self.quadrature.get_rpm(now))
 
+        # Ohne Encoder: nur über den CHN-Impuls einmal pro Umdrehung
         if self.rpm_calculator.last_round_time and (now - self.rpm_calculator.last_round_time) < 4.0:
-            raw_rpm = round(self.rpm_calculator.get_rpm())
+            raw_rpm = round(self.rpm_calculator.get_rpm(now))
             if raw_rpm > 10:
                 self.last_valid_rpm = raw_rpm  # Letzten sinnvollen Wert merken
             return self.last_valid_rpm
@@ -68,10 +131,14 @@ class CadenceSensorManager(object):
         
     def start_SensorRead(self):
         self._stop_event.clear()
+        if self.backend is not None:
+            self.backend.start()
 
 
     def stop(self):
         self._stop_event.set()
-        if not GPIO:
+        if self.backend is not None:
+            self.backend.stop()
+        if not self.uses_gpio:
             return
         GPIO.cleanup()
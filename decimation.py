@@ -0,0 +1,50 @@
+"""Reduziert lange Messreihen auf so viele Punkte, wie das Diagramm Pixel breit ist.
+
+Ein 3-Stunden-Training hat ~10.000 Messwerte pro Kurve, das Diagramm auf dem 480px-Display
+aber nur ein paar hundert Pixelspalten. Mehr Punkte als Spalten ändern das Bild nicht, kosten
+aber beim Zeichnen Zeit.
+
+`minmax_decimate` behält pro Pixelspalte Minimum und Maximum, Spitzen bleiben exakt erhalten.
+"""
+
+
+def pixel_width(figure, fraction=1.0):
+    """Breite einer matplotlib-Figure in Pixeln (bzw. des Anteils, den die Achsen einnehmen)."""
+    return max(int(figure.get_figwidth() * figure.dpi * fraction), 1)
+
+
+def minmax_decimate(x, y, max_points):
+    """Behält pro Bucket den kleinsten und größten Wert (in zeitlicher Reihenfolge).
+
+    Ergebnis hat höchstens `max_points` Punkte (2 pro Bucket plus erster und letzter Punkt).
+    Gibt bei kurzen Reihen die Eingabe unverändert zurück.
+    """
+    n = len(y)
+    if n <= max_points or max_points < 4:
+        return x, y
+
+    buckets = (max_points - 2) // 2  # 2 Punkte Reserve für Start und Ende
+    out_x = [x[0]]
+    out_y = [y[0]]
+    for b in range(buckets):
+        start = b * n // buckets
+        end = (b + 1) * n // buckets
+        if start >= end:
+            continue
+        i_min = i_max = start
+        y_min = y_max = y[start]
+        for i in range(start + 1, end):
+            value = y[i]
+            if value < y_min:
+                y_min, i_min = value, i
+            elif value > y_max:
+                y_max, i_max = value, i
+        for i in sorted({i_min, i_max}):
+            if 0 < i < n - 1:
+                out_x.append(x[i])
+                out_y.append(y[i])
+
+    # Start- und Endpunkt immer behalten, damit die x-Achse gleich bleibt
+    out_x.append(x[n - 1])
+    out_y.append(y[n - 1])
+    return out_x, out_y
@@ -0,0 +1,68 @@
+from array import array
+
+# Art der Flanke: CHN-Impuls, oder A/B mit den beiden Pegeln in den unteren Bits
+EDGE_CHN = 0
+EDGE_AB = 0x10
+
+
+class EdgeQueue:
+    """Vorab angelegter Ringpuffer für Sensor-Flanken (ein Producer, ein Consumer, ohne Lock).
+
+    Der GPIO-Callback ruft nur `push(zeitstempel_ns, art)` auf: zwei Array-Zuweisungen und ein
+    Zähler, kein Speicher wird angelegt, nichts wird berechnet oder ausgegeben. Der Consumer
+    holt die Flanken mit `drain()` ab und rechnet dort (oder verwirft sie mit `clear()`). Ist der
+    Puffer voll, wird die neue Flanke verworfen und in `dropped` gezählt.
+
+    Sicher ohne Lock, weil es genau einen Producer (RPi.GPIO ruft alle Callbacks aus einem
+    Thread auf) und einen Consumer gibt und jeder Zähler nur von einer Seite geschrieben wird.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.timestamps = array('q', bytes(8 * capacity))  # time.perf_counter_ns()
+        self.kinds = array('B', bytes(capacity))  # Kanal bzw. Pegel, siehe CadenceSensorManager
+        self._write = 0  # nur vom Producer geschrieben
+        self._read = 0  # nur vom Consumer geschrieben
+        self._dropped = 0  # nur vom Producer geschrieben
+        self._dropped_cleared = 0  # nur vom Consumer geschrieben: Stand von `_dropped` beim letzten clear()
+
+    @property
+    def dropped(self):
+        """Wegen vollem Puffer verworfene Flanken seit dem letzten `clear()`."""
+        return self._dropped - self._dropped_cleared
+
+    def push(self, timestamp_ns, kind=0):
+        write = self._write
+        if write - self._read >= self.capacity:
+            self._dropped += 1
+            return False
+        slot = write % self.capacity
+        self.timestamps[slot] = timestamp_ns
+        self.kinds[slot] = kind
+        self._write = write + 1  # erst jetzt sieht der Consumer den Eintrag
+        return True
+
+    def drain(self, callback):
+        """Ruft `callback(zeitstempel_ns, art)` für alle neuen Flanken auf (älteste zuerst).
+
+        Gibt die Anzahl verarbeiteter Flanken zurück.
+        """
+        start = read = self._read
+        write = self._write
+        capacity = self.capacity
+        timestamps = self.timestamps
+        kinds = self.kinds
+        while read < write:
+            slot = read % capacity
+            callback(timestamps[slot], kinds[slot])
+            read += 1
+        self._read = read  # Plätze erst nach dem Lesen freigeben
+        return read - start
+
+    def clear(self):
+        """Verwirft alle noch nicht abgeholten Flanken (Consumer-Seite) und setzt `dropped` zurück."""
+        self._dropped_cleared = self._dropped
+        self._read = self._write
+
+    def __len__(self):
+        return self._write - self._read
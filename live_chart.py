@@ -0,0 +1,75 @@
+import tkinter as tk
+
+from ring_buffer import RingBuffer
+
+
+# (Name im Snapshot, Farbe, Beschriftung, Mindest-Skalenmaximum)
+DEFAULT_SERIES = (
+    ("power", "#4da6ff", "Power", 50),
+    ("heartrate", "#ff4d4d", "HR", 120),
+    ("cadence", "#4be646", "Cadence", 60),
+)
+
+
+class LiveStripChart(tk.Canvas):
+    """Live-Streifendiagramm direkt auf einem Tk-Canvas (ohne matplotlib).
+
+    Jede Kurve hat einen Ringpuffer fester Größe und genau ein Canvas-Linienobjekt, dessen
+    Koordinaten bei jedem Update nur neu gesetzt werden. Die Kosten pro Update hängen damit
+    nur von `capacity` ab, nicht von der Trainingsdauer.
+    """
+
+    def __init__(self, parent, capacity=300, series=DEFAULT_SERIES, height=110, **kwargs):
+        kwargs.setdefault("bg", "#111d4e")
+        kwargs.setdefault("highlightthickness", 0)
+        super().__init__(parent, height=height, **kwargs)
+        self.capacity = capacity
+        self.series = series
+        self.buffers = {name: RingBuffer(capacity) for name, _, _, _ in series}
+        self.scale_max = {name: minimum for name, _, _, minimum in series}  # wächst nur, O(1)
+        self.lines = {}
+
+        for i, (name, color, label, _) in enumerate(series):
+            self.lines[name] = self.create_line(0, 0, 0, 0, fill=color, width=2)
+            self.create_text(8 + i * 80, 8, text=label, fill=color, anchor="nw", font=("Helvetica", 9, "bold"))
+
+        self._width = 1
+        self._height = height
+        self.bind("<Configure>", self._on_resize)
+
+    def _on_resize(self, event):
+        self._width = max(event.width, 1)
+        self._height = max(event.height, 1)
+        self.redraw()
+
+    def add_snapshot(self, snapshot):
+        """Übernimmt die Werte eines SensorSnapshot (ohne neu zu zeichnen)."""
+        for name in self.buffers:
+            value = getattr(snapshot, name, 0) or 0
+            self.buffers[name].append(value)
+            if value > self.scale_max[name]:
+                self.scale_max[name] = value
+
+    def redraw(self):
+        """Setzt die Koordinaten aller Linien neu (ein coords()-Aufruf pro Kurve)."""
+        top = 22  # Platz für die Legende
+        usable_height = max(self._height - top - 2, 1)
+        x_step = self._width / max(self.capacity - 1, 1)
+
+        for name, buffer in self.buffers.items():
+            if len(buffer) < 2:
+                self.coords(self.lines[name], 0, 0, 0, 0)
+                continue
+            y_factor = usable_height / self.scale_max[name]
+            x_offset = (self.capacity - len(buffer)) * x_step  # neueste Werte immer rechts
+            coords = []
+            for i, value in enumerate(buffer):
+                coords.append(x_offset + i * x_step)
+                coords.append(self._height - 2 - value * y_factor)
+            self.coords(self.lines[name], *coords)
+
+    def clear(self):
+        for name, _, _, minimum in self.series:
+            self.buffers[name].clear()
+            self.scale_max[name] = minimum
+        self.redraw()
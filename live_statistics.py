@@ -0,0 +1,62 @@
+from power_smoothing import DEFAULT_WINDOWS, PowerSmoother
+from session_aggregates import SessionAggregator
+
+
+class RunningStats:
+    """Mittelwert, Varianz (Welford), Minimum und Maximum mit O(1) pro Wert."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+
+class LiveTrainingStatistics(SessionAggregator):
+    """Laufende Statistik während des Trainings.
+
+    Jeder Messwert wird einmal verarbeitet (O(1)): die Kennzahlen und Widerstandsstufen aus
+    `SessionAggregator`, dazu Welford-Statistik für Power und Herzfrequenz und die gleitenden
+    Power-Mittelwerte (`PowerSmoother`) für Anzeige und gespeicherte Kennzahlen. Beim Stoppen
+    liefern `aggregates()` und `resistance_summary()` das fertige Ergebnis, ohne die Messwerte
+    nochmal durchzugehen.
+    """
+
+    def __init__(self, power_windows=DEFAULT_WINDOWS):
+        super().__init__()
+        self.power = RunningStats()
+        self.heartrate = RunningStats()
+        self.power_smoothing = PowerSmoother(power_windows)
+
+    def add(self, time_seconds, cadence, resistance_level, power, speed, distance, heartrate):
+        super().add(time_seconds, cadence, resistance_level, power, speed, distance, heartrate)
+        self.power.add(power)
+        if heartrate > 0:  # 0 = kein Brustgurt verbunden
+            self.heartrate.add(heartrate)
+        self.power_smoothing.add(power)
+
+    def aggregates(self):
+        aggregates = super().aggregates()
+        aggregates['power_std'] = self.power.std
+        aggregates['avg_heartrate'] = self.heartrate.mean
+        aggregates.update(self.power_smoothing.summary())
+        return aggregates
@@ -0,0 +1,134 @@
+from array import array
+
+
+# Spalten eines Messwerts mit Typcode (siehe array-Modul)
+FIELDS = (
+    ("time_seconds", "d"),
+    ("cadence", "i"),
+    ("resistance_level", "b"),
+    ("power", "d"),
+    ("speed", "d"),
+    ("distance", "d"),
+    ("heartrate", "h"),
+)
+FIELD_NAMES = tuple(name for name, _ in FIELDS)
+INT_FIELDS = frozenset(name for name, typecode in FIELDS if typecode != "d")
+
+CHUNK_SIZE = 600  # Platz für 10 Minuten bei 1 Hz
+
+
+class Measurement:
+    """Leichte Sicht auf eine Zeile im MeasurementStore, verhält sich lesend wie das alte Dict."""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key):
+        try:
+            return self._store._columns[key][self._index]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        column = self._store._columns.get(key)
+        return default if column is None else column[self._index]
+
+    def keys(self):
+        return FIELD_NAMES
+
+    def items(self):
+        return ((name, self[name]) for name in FIELD_NAMES)
+
+    def __iter__(self):
+        return iter(FIELD_NAMES)
+
+    def __contains__(self, key):
+        return key in self._store._columns
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"Measurement({self.to_dict()})"
+
+
+class MeasurementStore:
+    """Spaltenweiser Speicher für die 1-Hz-Messwerte eines Trainings.
+
+    Jede Größe liegt in einem eigenen typisierten `array`, das in Blöcken von `CHUNK_SIZE`
+    wächst. Statt ~500 Byte pro Dict braucht ein Messwert so nur ~40 Byte, und Statistiken
+    bzw. Graphen können direkt mit `column()` arbeiten.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._length = 0
+        self._capacity = 0
+        self._columns = {name: array(typecode) for name, typecode in FIELDS}
+
+    @classmethod
+    def from_records(cls, records):
+        """Baut einen Store aus einer Liste von Dicts (z.B. aus einer JSON-Datei)."""
+        store = cls()
+        store.extend(records)
+        return store
+
+    def _grow(self, minimum):
+        while self._capacity < minimum:
+            self._capacity += self.chunk_size
+        for name, typecode in FIELDS:
+            column = self._columns[name]
+            column.extend(array(typecode, bytes(column.itemsize * (self._capacity - len(column)))))
+
+    def append(self, measurement):
+        """Fügt einen Messwert (Dict oder Measurement) hinzu."""
+        index = self._length
+        if index >= self._capacity:
+            self._grow(index + 1)
+        for name in FIELD_NAMES:
+            value = measurement.get(name, 0) or 0
+            self._columns[name][index] = int(round(value)) if name in INT_FIELDS else float(value)
+        self._length += 1
+
+    def extend(self, records):
+        records = list(records)
+        if self._length + len(records) > self._capacity:
+            self._grow(self._length + len(records))
+        for record in records:
+            self.append(record)
+
+    def clear(self):
+        self._length = 0
+        self._capacity = 0
+        self._columns = {name: array(typecode) for name, typecode in FIELDS}
+
+    def column(self, name):
+        """Gibt die gefüllten Werte einer Spalte als `array` zurück (Kopie, daher sicher beim Weiterschreiben)."""
+        return self._columns[name][:self._length]
+
+    def as_numpy(self, name):
+        """Spalte als NumPy-Array (nur falls NumPy installiert ist)."""
+        import numpy as np
+        return np.frombuffer(self.column(name), dtype=self._columns[name].typecode)
+
+    def to_records(self):
+        """Wandelt den Store zurück in eine Liste von Dicts (für JSON)."""
+        columns = [self.column(name) for name in FIELD_NAMES]
+        return [dict(zip(FIELD_NAMES, values)) for values in zip(*columns)]
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Measurement(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("measurement index out of range")
+        return Measurement(self, index)
+
+    def __iter__(self):
+        return (Measurement(self, i) for i in range(self._length))
@@ -0,0 +1,98 @@
+# Power- und Speed-Modell für das BerkelBike
+# numpy wird erst für die vektorisierte Berechnung geladen, die Live-Anzeige braucht es nicht
+np = None
+
+
+# Koeffizienten aus den Messungen am Hometrainer: power = a * rpm + b * rpm^2 + c * rpm^3
+POWER_COEFFICIENTS = {
+    1: (-0.09886, 0.008774, -4.482e-5),
+    2: (-0.0914, 0.01357, -6.128e-5),
+    3: (0.03131, 0.014, -4.07e-5),
+    4: (0.06623, 0.01848, -4.885e-5),
+    5: (0.0339, 0.0255, -8.2e-5),
+    6: (0.01525, 0.03527, -0.0001293),
+    7: (0.08092, 0.04164, -0.0001593),
+    8: (0.08516, 0.04835, -0.0001871),
+}
+RESISTANCE_LEVELS = tuple(sorted(POWER_COEFFICIENTS))
+
+# Speed-Modell (ICE-VTX Trike): speed = a * power + b * power^2 + c * power^3
+SPEED_COEFFICIENTS = (0.2555, -0.0009104, -1.133e-6)
+
+MAX_TABLE_RPM = 200  # Lookup-Tabelle für ganzzahlige Kadenzen 0..200 RPM
+
+
+def calculate_power(cadence, level):
+    """Power (W) für eine Kadenz (RPM) und Widerstandsstufe, nie negativ."""
+    a, b, c = POWER_COEFFICIENTS[level]
+    power = a * cadence + b * cadence ** 2 + c * cadence ** 3
+    return max(0, power)
+
+
+def calculate_speed(power):
+    """Speed (km/h) aus der Power, nie negativ."""
+    a, b, c = SPEED_COEFFICIENTS
+    speed = a * power + b * power ** 2 + c * power ** 3
+    return max(speed, 0)
+
+
+def _build_power_table():
+    return {
+        level: [calculate_power(rpm, level) for rpm in range(MAX_TABLE_RPM + 1)]
+        for level in RESISTANCE_LEVELS
+    }
+
+
+POWER_TABLE = _build_power_table()  # POWER_TABLE[level][rpm]
+
+
+def lookup_power(cadence, level):
+    """Wie `calculate_power`, aber für ganzzahlige Kadenzen aus der vorberechneten Tabelle (live pro Sekunde)."""
+    if isinstance(cadence, int) and 0 <= cadence <= MAX_TABLE_RPM:
+        return POWER_TABLE[level][cadence]
+    return calculate_power(cadence, level)
+
+
+def _require_numpy():
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            print("Das Modul 'numpy' konnte nicht importiert werden. Vektorisierte Berechnung ist nicht verfügbar.")
+            raise RuntimeError("numpy is required for vectorized power/speed evaluation")
+        np = numpy
+
+
+def power_coefficient_array():
+    """Koeffizienten als Array mit Zeile = Widerstandsstufe (Zeile 0 ist leer)."""
+    _require_numpy()
+    table = np.zeros((max(RESISTANCE_LEVELS) + 1, 3))
+    for level, coefficients in POWER_COEFFICIENTS.items():
+        table[level] = coefficients
+    return table
+
+
+def power_array(cadence, levels):
+    """Power für ganze Arrays von Kadenzen und Widerstandsstufen (z.B. ein gespeichertes Training)."""
+    _require_numpy()
+    cadence = np.asarray(cadence, dtype=float)
+    coefficients = power_coefficient_array()[np.asarray(levels, dtype=int)]
+    power = cadence * (coefficients[..., 0] + cadence * (coefficients[..., 1] + cadence * coefficients[..., 2]))
+    return np.maximum(power, 0.0)
+
+
+def speed_array(power):
+    """Speed für ein ganzes Array von Power-Werten."""
+    _require_numpy()
+    power = np.asarray(power, dtype=float)
+    a, b, c = SPEED_COEFFICIENTS
+    return np.maximum(power * (a + power * (b + power * c)), 0.0)
+
+
+def distance_array(times, speeds):
+    """Kumulierte Distanz (m) wie live berechnet: speed des Messwerts mal Zeit seit dem vorherigen."""
+    _require_numpy()
+    times = np.asarray(times, dtype=float)
+    elapsed = np.diff(times, prepend=times[:1])
+    return np.cumsum(np.asarray(speeds, dtype=float) * elapsed / 3600 * 1000)
@@ -0,0 +1,56 @@
+from ring_buffer import RollingMean
+
+
+DEFAULT_WINDOWS = (3, 10, 30)  # Fenstergrößen in Sekunden (1 Messwert pro Sekunde)
+NORMALIZED_POWER_WINDOW = 30
+
+
+class PowerSmoother:
+    """Mehrere gleitende Power-Mittelwerte gleichzeitig, jeweils mit festem Ringpuffer.
+
+    Jeder neue Power-Wert kostet O(1) pro Fenster, der Speicher bleibt unabhängig von der
+    Trainingsdauer konstant. Zusätzlich wird die Normalized Power berechnet: 30-s-Mittelwert,
+    davon die vierte Potenz laufend gemittelt und am Ende die vierte Wurzel.
+    """
+
+    def __init__(self, windows=DEFAULT_WINDOWS, np_window=NORMALIZED_POWER_WINDOW):
+        self.windows = {size: RollingMean(size) for size in windows}
+        self.best = {size: 0.0 for size in windows}  # höchster Mittelwert je Fenster
+        self._np_window = self.windows.get(np_window) or RollingMean(np_window)
+        self._np_separate = np_window not in self.windows
+        self._fourth_power_sum = 0.0
+        self._fourth_power_count = 0
+
+    def add(self, power):
+        for size, window in self.windows.items():
+            mean = window.add(power)
+            if window.buffer.full() and mean > self.best[size]:
+                self.best[size] = mean
+
+        if self._np_separate:
+            self._np_window.add(power)
+        if self._np_window.buffer.full():
+            self._fourth_power_sum += self._np_window.mean ** 4
+            self._fourth_power_count += 1
+
+    def mean(self, size):
+        """Aktueller gleitender Mittelwert für ein Fenster."""
+        return self.windows[size].mean
+
+    @property
+    def normalized_power(self):
+        if not self._fourth_power_count:
+            # Training kürzer als das NP-Fenster: Mittelwert der bisherigen Werte
+            return self._np_window.mean
+        return (self._fourth_power_sum / self._fourth_power_count) ** 0.25
+
+    def best_mean(self, size):
+        """Höchster Mittelwert für ein Fenster; Training kürzer als das Fenster: Mittelwert der bisherigen Werte."""
+        window = self.windows[size]
+        return self.best[size] if window.buffer.full() else window.mean
+
+    def summary(self):
+        """Werte für die gespeicherten Kennzahlen des Trainings."""
+        summary = {f'max_avg_power_{size}s': self.best_mean(size) for size in self.windows}
+        summary['normalized_power'] = self.normalized_power
+        return summary
@@ -0,0 +1,130 @@
+from ring_buffer import RingBuffer
+
+
+# Zustandswechsel (vorher << 2 | nachher) der Kanäle A/B -> Schritt. Gray-Code: 00 -> 01 -> 11 -> 10 -> 00
+# ist vorwärts, umgekehrt rückwärts. Ein Sprung über zwei Zustände (z.B. 00 -> 11) ist ein Fehler.
+_STEPS = {
+    0b0001: 1, 0b0111: 1, 0b1110: 1, 0b1000: 1,
+    0b0010: -1, 0b1011: -1, 0b1101: -1, 0b0100: -1,
+}
+_INVALID = {0b0011, 0b1100, 0b0110, 0b1001}
+
+
+class QuadratureDecoder:
+    """Dekodiert die Encoder-Kanäle CHA/CHB (4-fach) zu Kurbelwinkel und Winkelgeschwindigkeit.
+
+    Jede Flanke auf A oder B ist ein Schritt; die Anzahl Schritte pro Umdrehung wird zwischen
+    zwei CHN-Index-Impulsen gemessen, falls sie nicht angegeben ist. Gezählt werden nur
+    Umdrehungen ganz ohne Rückwärtsschritt (Pendeln der Kurbel verfälscht sonst die Zahl); weicht
+    eine Messung um mehr als `calibration_tolerance` ab, gilt sie erst, wenn die nächste Umdrehung
+    sie bestätigt (ein Prell-Impuls auf CHN verstellt die Kalibrierung so nicht). Die Kadenz ergibt sich aus
+    den letzten Schritten (höchstens `window_seconds` zurück) und ist damit schon nach einem
+    Bruchteil einer Umdrehung da, auch bei den langsamen Kadenzen im FES-Training.
+    """
+
+    def __init__(self, counts_per_revolution=None, window_seconds=0.5, buffer_size=64, timeout=1.0,
+                 calibration_tolerance=0.05):
+        self.configured_counts = counts_per_revolution
+        self.calibration_tolerance = calibration_tolerance  # relative Abweichung, mindestens 2 Schritte
+        self.window_seconds = window_seconds
+        self.timeout = timeout  # so lange ohne Schritt: Encoder steht (bzw. ist nicht angeschlossen)
+        self.step_times = RingBuffer(buffer_size)  # Zeitpunkte der letzten Vorwärtsschritte
+        self.reset()
+
+    def reset(self):
+        self.state = None
+        self.position = 0  # Schritte seit dem Start (vorwärts positiv)
+        self.index_position = None  # Position beim letzten CHN-Impuls
+        self.forward_steps = 0  # Vorwärtsschritte seit dem letzten CHN-Impuls
+        self.backward_steps = 0  # Rückwärtsschritte seit dem letzten CHN-Impuls
+        self.candidate_counts = None  # abweichende Messung, die noch bestätigt werden muss
+        self.counts_per_revolution = self.configured_counts
+        self.invalid_transitions = 0
+        self.last_step_time = None
+        self.step_times.clear()
+
+    def update(self, a, b, timestamp):
+        """Neuer Pegel der Kanäle A und B (0/1) zum Zeitpunkt `timestamp` (Sekunden)."""
+        state = (a << 1) | b
+        if self.state is None:
+            self.state = state
+            return
+        transition = (self.state << 2) | state
+        self.state = state
+        step = _STEPS.get(transition)
+        if step is None:
+            if transition in _INVALID:
+                self.invalid_transitions += 1  # Flanke verpasst, Richtung unbekannt
+            return
+        self.position += step
+        self.last_step_time = timestamp
+        if step > 0:
+            self.forward_steps += 1
+            self.step_times.append(timestamp)
+        else:
+            self.backward_steps += 1
+            self.step_times.clear()  # rückwärts (z.B. Pendeln der Kurbel) zählt nicht als Kadenz
+
+    def index(self):
+        """CHN-Index-Impuls (nur gültige, nicht geprellte): Winkel auf 0 setzen, Schritte pro Umdrehung nachmessen."""
+        if self.index_position is not None and self.configured_counts is None:
+            if self.forward_steps == 0 and self.backward_steps == 0:
+                # ohne Schritte zwischen zwei Impulsen ist der Encoder nicht angeschlossen
+                self.counts_per_revolution = None
+                self.candidate_counts = None
+            elif self.backward_steps == 0:
+                self._calibrate(self.forward_steps)
+        self.index_position = self.position
+        self.forward_steps = 0
+        self.backward_steps = 0
+
+    def _similar(self, counts, reference):
+        return abs(counts - reference) <= max(2, self.calibration_tolerance * reference)
+
+    def _calibrate(self, counts):
+        if self.counts_per_revolution is None or self._similar(counts, self.counts_per_revolution):
+            self.counts_per_revolution = counts
+            self.candidate_counts = None
+        elif self.candidate_counts is not None and self._similar(counts, self.candidate_counts):
+            self.counts_per_revolution = counts  # zweimal hintereinander gemessen: Kalibrierung war falsch
+            self.candidate_counts = None
+        else:
+            self.candidate_counts = counts
+
+    @property
+    def active(self):
+        """True, wenn der Encoder angeschlossen und kalibriert ist (sonst Kadenz nur über CHN)."""
+        return bool(self.counts_per_revolution)
+
+    @property
+    def crank_angle(self):
+        """Kurbelwinkel in Grad seit dem letzten Index-Impuls (0, wenn nicht kalibriert)."""
+        if not self.active or self.index_position is None:
+            return 0
+        steps = (self.position - self.index_position) % self.counts_per_revolution
+        return steps * 360 / self.counts_per_revolution
+
+    def get_rpm(self, now):
+        """Kadenz aus den Schritten im Zeitfenster. 0, wenn der Encoder steht."""
+        if not self.active or self.last_step_time is None or len(self.step_times) < 2:
+            return 0
+        elapsed = now - self.last_step_time
+        if elapsed > self.timeout:
+            return 0
+
+        newest = self.step_times[-1]
+        steps = 0
+        oldest = newest
+        for i in range(len(self.step_times) - 2, -1, -1):
+            timestamp = self.step_times[i]
+            if newest - timestamp > self.window_seconds and steps:
+                break
+            oldest = timestamp
+            steps += 1
+        if newest <= oldest:
+            return 0
+        rpm = 60 * steps / self.counts_per_revolution / (newest - oldest)
+        # bleibt der nächste Schritt aus, kann die Kadenz höchstens einen Schritt pro `elapsed` sein
+        if elapsed > 0:
+            rpm = min(rpm, 60 / self.counts_per_revolution / elapsed)
+        return rpm
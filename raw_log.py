@@ -0,0 +1,265 @@
+"""Rohdaten-Log: jede Sensor-Flanke und jede Herzfrequenz-Meldung mit Zeitstempel (Binärformat).
+
+Gespeichert wird sonst nur die Kadenz einmal pro Sekunde. Mit dem Rohdaten-Log lässt sich ein
+Training später mit einem anderen Kadenz-Algorithmus neu auswerten (`replay_cadence`) oder über
+`sensor_backends.ReplayBackend` wieder abspielen.
+
+Format (Byte-Reihenfolge little-endian, wie auf dem Pi):
+
+- Header, 32 Bytes: Kennung b"BBRAWLOG", Version, Start (time.perf_counter_ns), Start (time.time_ns)
+- danach Records aus je zwei int64: Abstand in ns zum vorherigen Record (der erste zum Start;
+  kann negativ sein, weil Flanken erst beim Abholen aus der EdgeQueue geschrieben werden) und
+  (art << 32) | payload
+
+Die Records haben feste Größe, die Datei lässt sich daher direkt mit mmap lesen (`RawLog`).
+Eingeschaltet wird die Aufnahme mit der Umgebungsvariable BERKELBIKE_RAW_CAPTURE=1; die Datei
+liegt dann unter raw/<trainingsdatei>.bin neben den Trainingsdateien.
+
+    python3 raw_log.py /pfad/raw/training_2025-02-11_101500.bin [--interval 1]
+"""
+import os
+import sys
+import mmap
+import time
+import struct
+import argparse
+import threading
+from array import array
+
+from edge_queue import EDGE_CHN, EDGE_AB
+from rpm_calculator import RPMCalculator
+
+RAW_DIRECTORY = "raw"  # Unterordner neben den Trainingsdateien
+RAW_SUFFIX = ".bin"
+RAW_MAGIC = b"BBRAWLOG"
+RAW_VERSION = 1
+CAPTURE_PREFIX = "capture_"  # laufende Aufnahme, wird beim Speichern umbenannt
+
+EVENT_EDGE = 0  # payload = Art der Flanke (EDGE_CHN bzw. EDGE_AB | Pegel)
+EVENT_HEART_RATE = 1  # payload = Herzfrequenz in BPM
+
+_HEADER = struct.Struct("<8sqqq")
+_RECORD_SIZE = 16
+
+
+def capture_enabled(environ=os.environ):
+    """True, wenn BERKELBIKE_RAW_CAPTURE gesetzt ist (und nicht "0")."""
+    return environ.get("BERKELBIKE_RAW_CAPTURE", "").strip() not in ("", "0")
+
+
+def raw_log_path(directory, filename):
+    """Pfad des Rohdaten-Logs zu einer Trainingsdatei (gleicher Name mit .bin im Unterordner `raw`)."""
+    return os.path.join(directory, RAW_DIRECTORY, os.path.splitext(filename)[0] + RAW_SUFFIX)
+
+
+class RawLogWriter:
+    """Schreibt Ereignisse gepuffert in ein Rohdaten-Log.
+
+    `append` wird vom Consumer der EdgeQueue (im Abtast-Thread) und vom Herzfrequenz-Thread
+    aufgerufen und hängt nur an einen Puffer im Speicher an. Auf die Karte geschrieben (inkl.
+    fsync) wird in einem eigenen Thread alle `flush_interval` Sekunden, damit ein langsames
+    fsync der SD-Karte nie die Abtastung aufhält.
+    """
+
+    def __init__(self, filepath, flush_interval=5.0):
+        self.filepath = filepath
+        self.flush_interval = flush_interval
+        self.events = 0
+        self._lock = threading.Lock()  # schützt nur den Puffer, nie während Datei-Operationen gehalten
+        self._io_lock = threading.Lock()  # Flush-Thread gegen close()
+        self._buffer = array('q')
+        self._file = None
+        self._last_time_ns = 0
+        self._stop_event = threading.Event()
+        self._flush_thread = None
+
+    @classmethod
+    def start(cls, directory, start_ns=None, **kwargs):
+        """Legt eine neue Aufnahme im Unterordner `raw` an und schreibt den Header.
+
+        `start_ns` ist die Startzeit auf der Zeitbasis der Ereignisse (Standard: time.perf_counter_ns()).
+        """
+        raw_directory = os.path.join(directory, RAW_DIRECTORY)
+        os.makedirs(raw_directory, exist_ok=True)
+        started = time.strftime("%Y-%m-%d_%H%M%S")
+        writer = cls(os.path.join(raw_directory, f"{CAPTURE_PREFIX}{started}{RAW_SUFFIX}"), **kwargs)
+        writer._file = open(writer.filepath, "wb")
+        writer._last_time_ns = time.perf_counter_ns() if start_ns is None else start_ns
+        writer._file.write(_HEADER.pack(RAW_MAGIC, RAW_VERSION, writer._last_time_ns, time.time_ns()))
+        writer._flush_thread = threading.Thread(target=writer._flush_loop, name="raw-log", daemon=True)
+        writer._flush_thread.start()
+        return writer
+
+    def append(self, timestamp_ns, kind, payload):
+        """Ein Ereignis; `timestamp_ns` auf derselben Zeitbasis wie `start_ns`."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer.append(timestamp_ns - self._last_time_ns)
+            self._buffer.append((kind << 32) | (payload & 0xFFFFFFFF))
+            self._last_time_ns = timestamp_ns
+            self.events += 1
+
+    def _flush_loop(self):
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Fehler beim Schreiben des Rohdaten-Logs: {e}")
+
+    def flush(self):
+        """Schreibt den Puffer auf die Karte (write + fsync)."""
+        with self._io_lock:
+            with self._lock:
+                buffer, self._buffer = self._buffer, array('q')
+                file = self._file
+            if file is not None:
+                self._write(file, buffer)
+
+    def close(self):
+        self._stop_event.set()
+        if self._flush_thread is not None and self._flush_thread is not threading.current_thread():
+            self._flush_thread.join()
+        with self._io_lock:
+            with self._lock:
+                buffer, self._buffer = self._buffer, array('q')
+                file, self._file = self._file, None
+            if file is not None:
+                self._write(file, buffer)
+                file.close()
+
+    @staticmethod
+    def _write(file, buffer):
+        if sys.byteorder != "little":
+            buffer.byteswap()
+        buffer.tofile(file)
+        file.flush()
+        os.fsync(file.fileno())
+
+    def discard(self):
+        """Verwirft die Aufnahme (z.B. bei 'Discard Training')."""
+        self.close()
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+    def finalize(self, target_path):
+        """Schließt die Aufnahme und legt sie unter dem Namen des gespeicherten Trainings ab."""
+        self.close()
+        os.replace(self.filepath, target_path)
+        self.filepath = target_path
+
+
+class RawLog:
+    """Liest ein Rohdaten-Log über mmap, ohne es ganz in den Speicher zu laden.
+
+    Ein abgeschnittener letzter Record (Stromausfall mitten im Schreiben) wird ignoriert.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        with open(filepath, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"{filepath} ist kein Rohdaten-Log (zu kurz)")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, self.start_ns, self.wall_time_ns = _HEADER.unpack_from(self._mmap, 0)
+        if magic != RAW_MAGIC or self.version != RAW_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{filepath} ist kein Rohdaten-Log der Version {RAW_VERSION}")
+        end = _HEADER.size + (size - _HEADER.size) // _RECORD_SIZE * _RECORD_SIZE
+        self._records = memoryview(self._mmap)[_HEADER.size:end].cast('q')
+
+    def __len__(self):
+        return len(self._records) // 2
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._records.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def events(self):
+        """Ereignisse (zeit_ns seit dem Start, art, payload) in der Reihenfolge der Datei."""
+        records = self._records
+        swap = sys.byteorder != "little"
+        t = 0
+        for i in range(0, len(records), 2):
+            delta, code = records[i], records[i + 1]
+            if swap:
+                delta, code = _swap(delta), _swap(code)
+            t += delta
+            yield t, code >> 32, code & 0xFFFFFFFF
+
+
+def _swap(value):
+    return int.from_bytes(value.to_bytes(8, sys.byteorder, signed=True), "little", signed=True)
+
+
+def find_captures(directory):
+    """Aufnahmen, die nie einem gespeicherten Training zugeordnet wurden (z.B. nach einem Absturz)."""
+    raw_directory = os.path.join(directory, RAW_DIRECTORY)
+    if not os.path.isdir(raw_directory):
+        return []
+    return sorted(os.path.join(raw_directory, filename) for filename in os.listdir(raw_directory)
+                  if filename.startswith(CAPTURE_PREFIX) and filename.endswith(RAW_SUFFIX))
+
+
+def events_from_raw_log(filepath):
+    """Alle Ereignisse eines Rohdaten-Logs nach Zeit sortiert (z.B. für `ReplayBackend`)."""
+    with RawLog(filepath) as log:
+        events = list(log.events())
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def replay_cadence(events, estimator=None, interval=1.0):
+    """Schickt die CHN-Flanken durch einen Kadenz-Schätzer und fragt ihn alle `interval` Sekunden ab.
+
+    `events` sind nach Zeit sortierte Ereignisse (zeit_ns, art, payload), `estimator` ein Objekt
+    mit `add_edge(sekunden)` und `get_rpm(jetzt)` wie `RPMCalculator` (Standard). Gibt eine Liste
+    von (zeit_sekunden, rpm) zurück, wie die gespeicherte Kadenz einmal pro Sekunde.
+    """
+    if estimator is None:
+        estimator = RPMCalculator()
+    cadence = []
+    next_sample = interval
+    t = 0.0
+    for event_time_ns, kind, payload in events:
+        t = event_time_ns / 1e9
+        while next_sample < t:  # Flanken genau zum Abfragezeitpunkt zählen noch mit
+            cadence.append((next_sample, estimator.get_rpm(next_sample)))
+            next_sample += interval
+        if kind == EVENT_EDGE and payload == EDGE_CHN:
+            estimator.add_edge(t)
+    while next_sample <= t:
+        cadence.append((next_sample, estimator.get_rpm(next_sample)))
+        next_sample += interval
+    return cadence
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show a raw sensor log and replay its cadence.")
+    parser.add_argument("filepath", help="raw log (.bin)")
+    parser.add_argument("--interval", type=float, default=1.0, help="cadence sampling interval in seconds")
+    args = parser.parse_args()
+
+    with RawLog(args.filepath) as log:
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(log.wall_time_ns / 1e9))
+        print(f"{args.filepath}: Version {log.version}, Start {started}, {len(log)} Ereignisse")
+    events = events_from_raw_log(args.filepath)
+    edges = sum(1 for _, kind, payload in events if kind == EVENT_EDGE and payload == EDGE_CHN)
+    quadrature = sum(1 for _, kind, payload in events if kind == EVENT_EDGE and payload & EDGE_AB)
+    heart_rates = sum(1 for _, kind, _ in events if kind == EVENT_HEART_RATE)
+    print(f"CHN-Flanken: {edges}, A/B-Flanken: {quadrature}, Herzfrequenz-Meldungen: {heart_rates}")
+    for time_seconds, rpm in replay_cadence(events, interval=args.interval):
+        print(f"{time_seconds:8.1f} s  {rpm:4} RPM")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Berechnet Power, Speed, Distanz und Zusammenfassungen aller gespeicherten Trainings neu.
+
+Nötig, wenn die Koeffizienten in `power_model` neu kalibriert wurden: die Werte sind in jedem
+Messwert der training_*.json Dateien (und in den Rollups) gespeichert. Aus den Rohdaten (Zeit, Kadenz, Stufe) wird
+alles vektorisiert neu berechnet, die Dateien werden parallel verarbeitet und atomar ersetzt.
+
+    python3 reprocess_sessions.py [--directory DIR] [--workers N] [--dry-run]
+"""
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import power_model
+from live_statistics import LiveTrainingStatistics
+from session_aggregates import compute_session_summary
+from session_index import SessionIndex
+from session_rollups import build_rollups, rollup_path, write_rollups
+
+DEFAULT_DIRECTORY = "/home/pi/MedUniTrainer/training_sessions"
+
+
+def reprocess_file(filepath, dry_run=False):
+    """Verarbeitet eine Trainingsdatei. Gibt die neuen Index-Daten zurück."""
+    with open(filepath, "r") as f:
+        training = json.load(f)
+
+    data = training.get("data", [])
+    if data:
+        times = [entry["time_seconds"] for entry in data]
+        power = power_model.power_array([entry["cadence"] for entry in data],
+                                        [entry["resistance_level"] for entry in data])
+        speed = power_model.speed_array(power)
+        distance = power_model.distance_array(times, speed)
+
+        for entry, p, s, d in zip(data, power.tolist(), speed.tolist(), distance.tolist()):
+            entry["power"] = p
+            entry["speed"] = s
+            entry["distance"] = d
+
+    aggregates, resistance_summary = compute_session_summary(data, LiveTrainingStatistics())
+    training["resistance_summary"] = resistance_summary
+    training["aggregates"] = aggregates
+
+    if not dry_run:
+        tmp_path = filepath + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(training, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+        directory, filename = os.path.split(filepath)
+        write_rollups(rollup_path(directory, filename), build_rollups(data))
+
+    return {
+        "filename": os.path.basename(filepath),
+        "training_name": training.get("training_name", "Unknown"),
+        "timestamp": training.get("timestamp", ""),
+        "resistance_summary": resistance_summary,
+        "aggregates": aggregates,
+    }
+
+
+def reprocess_directory(directory, workers=None, dry_run=False):
+    """Verarbeitet alle Trainings im Verzeichnis mit einem Prozess-Pool und aktualisiert den Index."""
+    filepaths = sorted(
+        os.path.join(directory, filename) for filename in os.listdir(directory)
+        if filename.startswith("training_") and filename.endswith(".json")
+    )
+    index = SessionIndex(directory)
+    index.load()
+
+    processed = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(reprocess_file, filepath, dry_run): filepath for filepath in filepaths}
+        for future, filepath in futures.items():
+            try:
+                result = future.result()
+            except Exception as e:  # eine kaputte Datei darf den Rest nicht abbrechen
+                print(f"Fehler beim Verarbeiten von {filepath}: {type(e).__name__}: {e}")
+                continue
+            processed += 1
+            if not dry_run:
+                index.update(result["filename"], os.stat(filepath), result["training_name"], result["timestamp"],
+                             result["resistance_summary"], result["aggregates"])
+
+    if not dry_run:
+        index.save()
+    return processed, len(filepaths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute power, speed, distance and summaries of stored trainings.")
+    parser.add_argument("--directory", default=DEFAULT_DIRECTORY, help="directory with training_*.json files")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--dry-run", action="store_true", help="compute everything but do not rewrite files")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    processed, total = reprocess_directory(args.directory, args.workers, args.dry_run)
+    print(f"{processed}/{total} Trainings neu berechnet in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from array import array
+
+
+class RingBuffer:
+    """Ringpuffer mit fester Größe auf Basis eines `array('d')`. Der Speicher wächst nie."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._values = array('d', bytes(8 * capacity))
+        self._start = 0
+        self._length = 0
+
+    def append(self, value):
+        """Fügt einen Wert hinzu und gibt den verdrängten Wert zurück (oder None)."""
+        if self._length < self.capacity:
+            self._values[(self._start + self._length) % self.capacity] = value
+            self._length += 1
+            return None
+        evicted = self._values[self._start]
+        self._values[self._start] = value
+        self._start = (self._start + 1) % self.capacity
+        return evicted
+
+    def clear(self):
+        self._start = 0
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ring buffer index out of range")
+        return self._values[(self._start + index) % self.capacity]
+
+    def __iter__(self):
+        for i in range(self._length):
+            yield self._values[(self._start + i) % self.capacity]
+
+    def full(self):
+        return self._length == self.capacity
+
+
+class RollingMean:
+    """Gleitender Mittelwert über die letzten `size` Werte, O(1) pro Wert."""
+
+    def __init__(self, size):
+        self.buffer = RingBuffer(size)
+        self.total = 0.0
+
+    def add(self, value):
+        evicted = self.buffer.append(value)
+        self.total += value
+        if evicted is not None:
+            self.total -= evicted
+        return self.mean
+
+    @property
+    def mean(self):
+        return self.total / len(self.buffer) if len(self.buffer) else 0.0
+
+    def clear(self):
+        self.buffer.clear()
+        self.total = 0.0
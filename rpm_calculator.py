@@ -1,28 +1,164 @@
 import time
 
+from ring_buffer import RingBuffer
+
+
+def _median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
 class RPMCalculator:
-    def __init__(self):
+    """Kadenz aus den Zeitpunkten der Umdrehungs-Impulse (CHN).
+
+    - Die letzten Zeitpunkte liegen in einem Ringpuffer; die RPM werden über die letzten
+      `window_revolutions` Umdrehungen gemittelt (höchstens `window_seconds` zurück).
+    - Ausreißer (z.B. Prellen, doppelte Impulse) werden am Median der letzten Intervalle
+      erkannt statt mit einer festen Mindestzeit. Ein zu früher Impuls wird zurückgehalten:
+      teilt er mit dem nächsten Impuls das Intervall in zwei ähnlich lange Hälften, wird
+      schneller getreten und beide zählen (die Historie beginnt neu), sonst wird er verworfen.
+    - Ein Alpha-Beta-Filter glättet die Werte und folgt Änderungen der Kadenz ohne Verzögerung
+      durch einen langen Mittelwert.
+
+    Pro Impuls ist der Aufwand konstant (Puffer und Fenster haben feste Größe).
+    """
+
+    def __init__(self, window_revolutions=3, window_seconds=6.0, history=9, outlier_threshold=3.0,
+                 min_interval=0.1, similar_ratio=1.4, alpha=0.5, beta=0.1):
+        self.window_revolutions = window_revolutions
+        self.window_seconds = window_seconds
+        self.outlier_threshold = outlier_threshold  # in Vielfachen der mittleren Abweichung vom Median
+        self.min_interval = min_interval  # kürzer ist sicher Prellen (0.1 s = 600 RPM)
+        self.similar_ratio = similar_ratio  # wie ähnlich zwei kurze Intervalle für "schneller treten" sein müssen
+        self.alpha = alpha
+        self.beta = beta
+
+        self.edge_times = RingBuffer(max(window_revolutions + 1, 2))
+        self.intervals = RingBuffer(history)
+        self.reset()
+
+    def reset(self):
+        self.edge_times.clear()
+        self.intervals.clear()
         self.last_round_time = None  # Zeitpunkt der letzten Umdrehung
-        self.rpm = 0  # Aktuelle Kadenz (RPM)
-        self.min_time_difference = 0.5  # Mindestzeitdifferenz in Sekunden (0.5 sekunden = 120 RPM )
+        self.rpm = 0  # Aktuelle Kadenz (RPM), gefiltert
+        self.rpm_rate = 0.0  # Änderung der Kadenz in RPM pro Sekunde (Beta-Anteil des Filters)
+        self.pending_time = None  # zurückgehaltener, zu früher Impuls
+        self.accepted_edges = 0
+        self.rejected_edges = 0
 
     def increment_rounds(self):
-        current_time = time.perf_counter()  # Aktueller Zeitpunkt
+        """Eine Umdrehung jetzt (für Aufrufer ohne eigenen Zeitstempel)."""
+        self.add_edge(time.perf_counter())
+
+    def add_edge(self, timestamp):
+        """Verarbeitet einen Umdrehungs-Impuls zum Zeitpunkt `timestamp` (Sekunden, monoton).
+
+        Gibt True zurück, wenn der Impuls verwendet wurde, False wenn er als Ausreißer verworfen wurde.
+        """
+        if self.last_round_time is None:
+            self._accept(timestamp)
+            return True
+
+        interval = timestamp - self.last_round_time
+        if interval > self.window_seconds:
+            # nach einer Pause neu beginnen, der erste Wert kommt mit dem nächsten Impuls
+            self.edge_times.clear()
+            self.intervals.clear()
+            self.rpm = 0
+            self.rpm_rate = 0.0
+            self.pending_time = None
+            self._accept(timestamp)
+            return True
+
+        if interval < self.min_interval or (self.pending_time is not None and timestamp - self.pending_time < self.min_interval):
+            self.rejected_edges += 1  # Prellen
+            return False
+
+        pending = self.pending_time
+        if pending is not None:
+            self.pending_time = None
+            first, second = pending - self.last_round_time, timestamp - pending
+            if max(first, second) <= self.similar_ratio * min(first, second):
+                # zwei gleich lange, kurze Intervalle: es wird wirklich schneller getreten,
+                # alte Intervalle passen nicht mehr, der Filter übernimmt den neuen Wert direkt
+                self.intervals.clear()
+                self.edge_times.clear()
+                self.edge_times.append(self.last_round_time)
+                self.rpm = 0
+                self._add_interval(pending, first)
+                self._add_interval(timestamp, second)
+                return True
+            self.rejected_edges += 1  # der zurückgehaltene Impuls war ein Ausreißer
+        elif self._is_outlier(interval):
+            self.pending_time = timestamp
+            return False
+
+        self._add_interval(timestamp, interval)
+        return True
+
+    def _add_interval(self, timestamp, interval):
+        self.intervals.append(interval)
+        self._accept(timestamp)
+        self._update_filter(interval)
+
+    def _is_outlier(self, interval):
+        """Nur zu kurze Intervalle (zusätzliche Impulse) sind Ausreißer, längere heißen langsamer treten."""
+        if len(self.intervals) < 3:
+            return False
+        median = _median(self.intervals)
+        deviation = _median([abs(value - median) for value in self.intervals])
+        tolerance = self.outlier_threshold * max(deviation, 0.05 * median)
+        return interval < median - tolerance
 
-        if self.last_round_time is not None:
-            # Berechne die Zeitdifferenz zur letzten Umdrehung
-            time_difference = current_time - self.last_round_time
+    def _accept(self, timestamp):
+        self.edge_times.append(timestamp)
+        self.last_round_time = timestamp
+        self.accepted_edges += 1
 
-            if time_difference > 0:
-                if time_difference >= self.min_time_difference:
-                    self.rpm = 60 / time_difference
-                    #print(f"✅ Valide: time_difference = {time_difference:.3f}, rpm = {self.rpm:.1f}")
-                else:
-                    print(f"⚠️ Ignoriert: time_difference zu kurz ({time_difference:.3f}s)")
+    def _window_rpm(self):
+        """Mittlere RPM über die letzten Umdrehungen im Fenster."""
+        newest = self.edge_times[-1]
+        revolutions = 0
+        oldest = newest
+        for i in range(len(self.edge_times) - 2, -1, -1):
+            timestamp = self.edge_times[i]
+            if newest - timestamp > self.window_seconds and revolutions:
+                break
+            oldest = timestamp
+            revolutions += 1
+        if revolutions == 0 or newest <= oldest:
+            return None
+        return 60 * revolutions / (newest - oldest)
 
-        # Aktualisiere den Zeitpunkt der letzten Umdrehung
-        self.last_round_time = current_time
+    def _update_filter(self, dt):
+        measurement = self._window_rpm()
+        if measurement is None:
+            return
+        if self.rpm == 0:
+            self.rpm = measurement  # erster Wert nach Stillstand: direkt übernehmen
+            self.rpm_rate = 0.0
+            return
+        predicted = self.rpm + self.rpm_rate * dt
+        residual = measurement - predicted
+        self.rpm = max(0.0, predicted + self.alpha * residual)
+        self.rpm_rate += self.beta * residual / dt
 
-    def get_rpm(self):
-        return round(self.rpm)  # Gibt die Kadenz mit 0 Dezimalstellen zurück
+    def get_rpm(self, now=None):
+        """Aktuelle Kadenz (gerundet).
 
+        Bleibt der nächste Impuls länger aus als erwartet, kann die Kadenz höchstens
+        60 / (Zeit seit dem letzten Impuls) sein - so fällt die Anzeige beim Aufhören gleichmäßig ab.
+        """
+        if self.last_round_time is None:
+            return 0
+        if now is None:
+            now = time.perf_counter()
+        rpm = self.rpm
+        elapsed = now - self.last_round_time
+        if elapsed > 0 and rpm > 60 / elapsed:
+            rpm = 60 / elapsed
+        return round(rpm)  # Gibt die Kadenz mit 0 Dezimalstellen zurück
@@ -0,0 +1,99 @@
+import time
+
+
+class DeadlineClock:
+    """Feste Abtastzeitpunkte auf `time.monotonic()` (start + k * interval).
+
+    Statt nach jedem Durchlauf einfach wieder `interval` zu warten (dabei addiert sich die
+    Laufzeit jedes Durchlaufs auf), wird immer auf den nächsten absoluten Zeitpunkt gewartet.
+    Kommt ein Tick zu spät, wird das gezählt; ist sogar ein ganzer Tick ausgefallen, wird der
+    Takt nachgezogen statt Ticks nachzuholen. Verspätungen werden nur gezählt (`stats()`), nicht
+    ausgegeben, weil der Takt auch die Anzeige antreibt und ein ausgelasteter Tk-Thread sonst die
+    Konsole flutet.
+    """
+
+    def __init__(self, interval=1.0, late_tolerance=0.1, clock=time.monotonic):
+        self.interval = interval
+        self.late_tolerance = late_tolerance
+        self.clock = clock
+        self.next_deadline = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.ticks = 0
+        self.late_ticks = 0
+        self.missed_ticks = 0
+        self.max_lateness = 0.0
+
+    def start(self):
+        """Startet den Takt jetzt. Gibt den Zeitpunkt des ersten (sofortigen) Ticks zurück."""
+        now = self.clock()
+        self.next_deadline = now + self.interval
+        self.ticks += 1
+        return now
+
+    def restart(self):
+        """Startet den Takt jetzt neu, ohne sofortigen Tick (z.B. nach einer Pause). Gibt die Startzeit zurück."""
+        now = self.clock()
+        self.next_deadline = now + self.interval
+        return now
+
+    def tick(self):
+        """Wird beim Auslösen eines Ticks aufgerufen. Gibt den tatsächlichen Zeitpunkt zurück."""
+        now = self.clock()
+        lateness = now - self.next_deadline
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+        if lateness > self.late_tolerance:
+            self.late_ticks += 1
+        missed = int(lateness // self.interval) if lateness > 0 else 0
+        self.missed_ticks += missed  # keine Ausgabe hier: steht in stats() und wird mit dem Training gespeichert
+        self.next_deadline += self.interval * (missed + 1)
+        self.ticks += 1
+        return now
+
+    def delay(self):
+        """Sekunden bis zum nächsten Abtastzeitpunkt."""
+        return max(0.0, self.next_deadline - self.clock())
+
+    def stats(self):
+        return {
+            'ticks': self.ticks,
+            'late_ticks': self.late_ticks,
+            'missed_ticks': self.missed_ticks,
+            'max_lateness': round(self.max_lateness, 3),
+        }
+
+
+class TkSamplingScheduler:
+    """Ruft `callback(sample_time)` im Tk-Hauptthread im festen Takt von `DeadlineClock` auf."""
+
+    def __init__(self, widget, callback, interval=1.0):
+        self.widget = widget
+        self.callback = callback
+        self.clock = DeadlineClock(interval)
+        self._after_id = None
+
+    @property
+    def running(self):
+        return self._after_id is not None
+
+    def start(self):
+        """Erster Messwert sofort, danach auf die festen Zeitpunkte."""
+        self.stop()
+        sample_time = self.clock.start()
+        self._after_id = self.widget.after(self._delay_ms(), self._run)
+        self.callback(sample_time)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _run(self):
+        sample_time = self.clock.tick()
+        self._after_id = self.widget.after(self._delay_ms(), self._run)
+        self.callback(sample_time)
+
+    def _delay_ms(self):
+        return int(round(self.clock.delay() * 1000))
@@ -0,0 +1,219 @@
+"""Austauschbare Sensorquellen, damit die ganze Erfassung auch ohne Hardware läuft.
+
+- GPIO / ANT+ (Standard): echte Sensoren, wie bisher in CadenceSensorManager und HeartRateSensor
+- `SyntheticBackend`: erzeugt Kurbel-Flanken nach einem Kadenz-Profil (mit Streuung und Prellen)
+  und eine Herzfrequenz
+- `ReplayBackend`: spielt aufgezeichnete Ereignisse (Flanken, Herzfrequenz) in Echtzeit oder
+  beschleunigt wieder ab
+
+Ein Backend liefert Flanken an `cadence_sink(zeitstempel_ns, art)` (gleiche Schnittstelle wie
+`EdgeQueue.push`, d.h. dieselbe Verarbeitung wie bei den GPIO-Callbacks) und Herzfrequenzen an
+`heart_rate_sink(bpm)`. Die Zeitstempel der Flanken stammen von der Uhr des Backends (`clock()`),
+die bei `speed` > 1 entsprechend schneller läuft: die Abstände der Flanken bleiben wie
+aufgezeichnet, die Kadenz stimmt also auch beim beschleunigten Abspielen, wenn der Consumer
+dieselbe Uhr benutzt (CadenceSensorManager tut das). Ausgewählt wird über die Umgebungsvariable BERKELBIKE_SENSORS:
+
+    BERKELBIKE_SENSORS=synthetic
+    BERKELBIKE_SENSORS=replay:/pfad/training_2025-02-11_101500.json
+    BERKELBIKE_SENSORS=replay:/pfad/raw/training_2025-02-11_101500.bin   # Rohdaten-Log, siehe raw_log
+    BERKELBIKE_REPLAY_SPEED=10   # optional, beschleunigt abspielen
+"""
+import os
+import json
+import heapq
+import math
+import time
+import random
+import threading
+
+from raw_log import EVENT_EDGE, EVENT_HEART_RATE, RAW_SUFFIX, events_from_raw_log
+
+# Kadenz-Profil: (Dauer in Sekunden, RPM); typisches FES-Training mit langsamen Phasen
+DEFAULT_PROFILE = ((30, 0), (120, 25), (120, 40), (60, 55), (120, 35), (30, 0))
+
+
+class SensorBackend:
+    """Basis für Backends mit eigenem Thread, der Ereignisse an die Sinks verteilt."""
+
+    def __init__(self, speed=1.0):
+        self.cadence_sink = None
+        self.heart_rate_sink = None
+        self.speed = speed
+        self._origin_ns = time.perf_counter_ns()  # ab hier läuft die virtuelle Uhr mit `speed`
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def clock_ns(self):
+        """Virtuelle Zeit in ns (Zeitbasis wie time.perf_counter_ns(), läuft `speed`-mal so schnell)."""
+        now = time.perf_counter_ns()
+        return self._origin_ns + int((now - self._origin_ns) * self.speed)
+
+    def clock(self):
+        """Virtuelle Zeit in Sekunden, Ersatz für time.perf_counter()."""
+        return self.clock_ns() / 1e9
+
+    def start(self):
+        """Startet den Thread (mehrfacher Aufruf schadet nicht)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_safely, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+
+    def _run_safely(self):
+        try:
+            self.run()
+        except Exception as e:
+            print(f"Fehler in {type(self).__name__}: {e}")
+
+    def run(self):
+        raise NotImplementedError
+
+    def _emit(self, timestamp_ns, kind, payload):
+        if kind == EVENT_EDGE:
+            sink = self.cadence_sink
+            if sink is not None:
+                sink(timestamp_ns, payload)
+        elif kind == EVENT_HEART_RATE:
+            sink = self.heart_rate_sink
+            if sink is not None:
+                sink(payload)
+
+    def _play(self, events):
+        """Gibt Ereignisse (zeit_ns relativ zum Start, art, payload) zu ihren Zeitpunkten auf der virtuellen Uhr aus."""
+        started = self.clock_ns()
+        for event_time_ns, kind, payload in events:
+            timestamp_ns = started + event_time_ns
+            delay = (timestamp_ns - self.clock_ns()) / self.speed / 1e9
+            if delay > 0 and self._stop_event.wait(delay):
+                return
+            if self._stop_event.is_set():
+                return
+            self._emit(timestamp_ns, kind, payload)  # aufgezeichneter Zeitpunkt, nicht der des Aufrufs
+
+
+def generate_edge_events(profile=DEFAULT_PROFILE, jitter=0.02, bounce_probability=0.02, seed=None):
+    """CHN-Flanken (zeit_ns, EVENT_EDGE, 0) für ein Kadenz-Profil.
+
+    `jitter` ist die relative Streuung jeder Umdrehung, `bounce_probability` die
+    Wahrscheinlichkeit für eine zusätzliche Prell-Flanke wenige Millisekunden danach.
+    """
+    rng = random.Random(seed)
+    t = 0.0
+    for duration, rpm in profile:
+        end = t + duration
+        if rpm <= 0:
+            t = end
+            continue
+        while True:
+            t += 60 / rpm * (1 + rng.uniform(-jitter, jitter))
+            if t >= end:
+                t = end
+                break
+            yield int(t * 1e9), EVENT_EDGE, 0
+            if rng.random() < bounce_probability:
+                yield int((t + rng.uniform(0.002, 0.02)) * 1e9), EVENT_EDGE, 0
+
+
+def generate_heart_rate_events(duration, base=90, amplitude=20, period=300, noise=2, seed=None):
+    """Herzfrequenz einmal pro Sekunde (zeit_ns, EVENT_HEART_RATE, bpm), langsam schwankend."""
+    rng = random.Random(seed)
+    for second in range(int(duration)):
+        bpm = base + amplitude * math.sin(2 * math.pi * second / period) + rng.uniform(-noise, noise)
+        yield second * 1_000_000_000, EVENT_HEART_RATE, int(round(bpm))
+
+
+def merge_events(*streams):
+    """Fügt nach Zeit sortierte Ereignisströme zu einem zusammen."""
+    return heapq.merge(*streams, key=lambda event: event[0])
+
+
+class SyntheticBackend(SensorBackend):
+    """Erzeugt Flanken und Herzfrequenz nach einem Profil, wiederholt es mit `loop`."""
+
+    def __init__(self, profile=DEFAULT_PROFILE, jitter=0.02, bounce_probability=0.02, speed=1.0, loop=True,
+                 seed=None):
+        super().__init__(speed)
+        self.profile = profile
+        self.jitter = jitter
+        self.bounce_probability = bounce_probability
+        self.loop = loop
+        self.seed = seed
+
+    def run(self):
+        duration = sum(seconds for seconds, _ in self.profile)
+        while not self._stop_event.is_set():
+            self._play(merge_events(
+                generate_edge_events(self.profile, self.jitter, self.bounce_probability, self.seed),
+                generate_heart_rate_events(duration, seed=self.seed),
+            ))
+            if not self.loop:
+                return
+
+
+class ReplayBackend(SensorBackend):
+    """Spielt eine Liste von Ereignissen (zeit_ns, art, payload) ab, bei `speed` > 1 beschleunigt."""
+
+    def __init__(self, events, speed=1.0, loop=False):
+        super().__init__(speed)
+        self.events = list(events)
+        self.loop = loop
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self._play(self.events)
+            if not self.loop:
+                return
+
+
+def events_from_training(filepath):
+    """Ereignisse aus einer gespeicherten Trainingsdatei (1 Hz Kadenz und Herzfrequenz).
+
+    Aus der Kadenz jeder Sekunde werden die passenden CHN-Flanken rekonstruiert.
+    """
+    with open(filepath, "r") as f:
+        data = json.load(f).get("data", [])
+    events = []
+    phase = 0.0  # angefangene Umdrehung (0..1) über die Sekunden hinweg
+    previous_time = 0.0
+    for entry in data:
+        time_seconds = entry.get("time_seconds", 0)
+        rpm = entry.get("cadence", 0)
+        if rpm > 0:
+            t = previous_time
+            while True:
+                remaining = (1 - phase) * 60 / rpm
+                if t + remaining > time_seconds:
+                    phase += (time_seconds - t) * rpm / 60
+                    break
+                t += remaining
+                phase = 0.0
+                events.append((int(t * 1e9), EVENT_EDGE, 0))
+        else:
+            phase = 0.0
+        events.append((int(time_seconds * 1e9), EVENT_HEART_RATE, entry.get("heartrate", 0)))
+        previous_time = time_seconds
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def from_environment(environ=os.environ):
+    """Backend laut BERKELBIKE_SENSORS, oder None für die echten Sensoren."""
+    selection = environ.get("BERKELBIKE_SENSORS", "").strip()
+    speed = float(environ.get("BERKELBIKE_REPLAY_SPEED", "1"))
+    if not selection or selection == "hardware":
+        return None
+    if selection == "synthetic":
+        return SyntheticBackend(speed=speed)
+    if selection.startswith("replay:"):
+        path = selection[len("replay:"):]
+        if path.endswith(RAW_SUFFIX):
+            return ReplayBackend(events_from_raw_log(path), speed=speed)  # originale Flanken
+        return ReplayBackend(events_from_training(path), speed=speed)
+    print(f"Unbekannte Sensorquelle '{selection}', verwende die echten Sensoren.")
+    return None
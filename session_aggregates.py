@@ -0,0 +1,98 @@
+class SessionAggregator:
+    """Berechnet alle Kennzahlen eines Trainings in einem einzigen Durchlauf.
+
+    Alle Seiten (Übersicht, Details, Statistik, Graphen) lesen dieselben Werte, daher gelten
+    hier einheitliche Definitionen:
+    - total_time: letzter Zeitstempel + 1 s (die begonnene Sekunde zählt mit)
+    - moving_time: Sekunden mit cadence > 0 (gleich wie die Zeit pro Widerstandsstufe)
+
+    Zeiten werden aus den tatsächlichen Zeitstempeln berechnet: ein Messwert zählt für die Zeit
+    seit dem vorherigen Messwert, der erste für `interval` (die begonnene Sekunde).
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.count = 0
+        self.last_time = 0
+        self.total_distance = 0
+        self.cadence_sum = 0
+        self.power_sum = 0
+        self.speed_sum = 0
+        self.max_power = 0
+        self.max_speed = 0
+        self.max_heartrate = 0
+        self.moving_time = 0
+        self.levels = {}  # level -> [total_time, total_power, count, max_power]
+
+    def add(self, time_seconds, cadence, resistance_level, power, speed, distance, heartrate):
+        dt = time_seconds - self.last_time if self.count else self.interval
+        self.count += 1
+        if time_seconds > self.last_time:
+            self.last_time = time_seconds
+        if distance > self.total_distance:
+            self.total_distance = distance
+        self.cadence_sum += cadence
+        self.power_sum += power
+        self.speed_sum += speed
+        if power > self.max_power:
+            self.max_power = power
+        if speed > self.max_speed:
+            self.max_speed = speed
+        if heartrate > self.max_heartrate:
+            self.max_heartrate = heartrate
+
+        if cadence > 0 and dt > 0:
+            self.moving_time += dt
+            level = self.levels.get(resistance_level)
+            if level is None:
+                level = self.levels[resistance_level] = [0, 0, 0, 0]
+            level[0] += dt
+            level[1] += power
+            level[2] += 1
+            if power > level[3]:
+                level[3] = power
+
+    def add_measurement(self, measurement):
+        self.add(measurement['time_seconds'], measurement['cadence'], measurement['resistance_level'],
+                 measurement['power'], measurement['speed'], measurement['distance'], measurement['heartrate'])
+
+    def aggregates(self):
+        count = self.count
+        return {
+            'sample_count': count,
+            'total_time': self.last_time + self.interval if count else 0,
+            'moving_time': round(self.moving_time, 1),
+            'total_distance': self.total_distance,
+            'avg_cadence': self.cadence_sum / count if count else 0,
+            'avg_power': self.power_sum / count if count else 0,
+            'max_power': self.max_power,
+            'avg_speed': self.speed_sum / count if count else 0,
+            'max_speed': self.max_speed,
+            'max_heartrate': self.max_heartrate,
+        }
+
+    def resistance_summary(self):
+        return [
+            {
+                'resistance_level': level,
+                'total_time': round(total_time, 1),
+                'avg_power': round(total_power / count, 1),
+                'max_power': round(max_power, 1)
+            }
+            for level, (total_time, total_power, count, max_power) in sorted(self.levels.items())
+        ]
+
+
+def compute_session_summary(data, aggregator=None):
+    """Kennzahlen und Widerstandszusammenfassung für einen MeasurementStore (oder eine Liste von Dicts)."""
+    if aggregator is None:
+        aggregator = SessionAggregator()
+    if hasattr(data, 'column'):
+        columns = [data.column(name) for name in
+                   ('time_seconds', 'cadence', 'resistance_level', 'power', 'speed', 'distance', 'heartrate')]
+        for values in zip(*columns):
+            aggregator.add(*values)
+    else:
+        for measurement in data:
+            aggregator.add_measurement(measurement)
+    return aggregator.aggregates(), aggregator.resistance_summary()
@@ -0,0 +1,73 @@
+import os
+import json
+
+
+INDEX_FILENAME = "session_index.json"
+INDEX_VERSION = 2
+
+
+class SessionIndex:
+    """Kleine Sidecar-Datei mit den Kennzahlen aller Trainings.
+
+    Pro Trainingsdatei werden Name, Zeitstempel, Widerstandszusammenfassung und Kennzahlen
+    gespeichert, zusammen mit mtime und Größe der Datei. Stimmen diese noch, muss die
+    Trainingsdatei beim Start nicht mehr geparst werden.
+    """
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, INDEX_FILENAME)
+        self.entries = {}
+        self.dirty = False
+
+    def load(self):
+        """Liest den Index von der Karte. Ein kaputter Index wird einfach neu aufgebaut."""
+        self.entries = {}
+        self.dirty = False
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                content = json.load(f)
+            if content.get("version") == INDEX_VERSION:
+                self.entries = content.get("sessions", {})
+        except (OSError, ValueError) as e:
+            print(f"Fehler beim Lesen des Session-Index {self.path}: {e}")
+
+    def save(self):
+        """Schreibt den Index atomar (erst .tmp, dann umbenennen)."""
+        if not self.dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "sessions": self.entries}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def lookup(self, filename, stat):
+        """Gibt den Eintrag zurück, falls er zur aktuellen Datei (mtime, Größe) passt."""
+        entry = self.entries.get(filename)
+        if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            return entry
+        return None
+
+    def update(self, filename, stat, training_name, timestamp, resistance_summary, aggregates):
+        entry = {
+            "training_name": training_name,
+            "timestamp": timestamp,
+            "resistance_summary": resistance_summary,
+            "aggregates": aggregates,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+        self.entries[filename] = entry
+        self.dirty = True
+        return entry
+
+    def remove(self, filename):
+        if self.entries.pop(filename, None) is not None:
+            self.dirty = True
+
+    def prune(self, existing_filenames):
+        """Entfernt Einträge, deren Trainingsdatei nicht mehr existiert."""
+        for filename in set(self.entries) - set(existing_filenames):
+            self.remove(filename)
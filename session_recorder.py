@@ -0,0 +1,132 @@
+import os
+import json
+import time
+
+
+RECORDING_PREFIX = "recording_"
+RECORDING_SUFFIX = ".jsonl"
+
+
+class SessionRecorder:
+    """Schreibt jeden Messwert sofort in eine Append-only Datei (eine JSON-Zeile pro Messwert).
+
+    Die erste Zeile ist ein Header mit Trainingsname und Startzeit. fsync wird gebündelt
+    (alle `fsync_every` Messwerte oder spätestens nach `fsync_interval` Sekunden), damit die
+    SD-Karte vom Pi nicht bei jedem Messwert blockiert.
+    """
+
+    def __init__(self, filepath, fsync_every=10, fsync_interval=5.0):
+        self.filepath = filepath
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._pending = 0
+        self._last_sync = 0.0
+
+    @classmethod
+    def start(cls, directory, training_name, **kwargs):
+        """Legt eine neue Aufnahmedatei an und schreibt den Header."""
+        started = time.strftime("%Y-%m-%d %H:%M:%S")
+        filename = f"{RECORDING_PREFIX}{started.replace(':', '').replace(' ', '_')}{RECORDING_SUFFIX}"
+        recorder = cls(os.path.join(directory, filename), **kwargs)
+        recorder._file = open(recorder.filepath, "a", encoding="utf-8")
+        header = {"training_name": training_name or started, "timestamp": started}
+        recorder._file.write(json.dumps(header) + "\n")
+        recorder.sync()
+        return recorder
+
+    def append(self, measurement):
+        """Hängt einen Messwert an die Datei an."""
+        self._file.write(json.dumps(measurement, separators=(",", ":")) + "\n")
+        self._pending += 1
+        if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self):
+        """Schreibt gepufferte Zeilen auf die Karte (flush + fsync)."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """Verwirft die Aufnahme (z.B. bei 'Discard Training')."""
+        self.close()
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+    def finalize(self, target_path, metadata):
+        """Erzeugt aus der Aufnahme die normale Trainingsdatei und löscht die Aufnahme."""
+        self.close()
+        finalize_recording(self.filepath, target_path, metadata)
+
+
+def read_recording(filepath):
+    """Liest eine Aufnahmedatei. Gibt (header, messwerte) zurück.
+
+    Eine abgeschnittene letzte Zeile (Stromausfall mitten im Schreiben) wird ignoriert.
+    """
+    header = None
+    measurements = []
+    with open(filepath, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if header is None:
+                header = entry
+            else:
+                measurements.append(entry)
+    return header, measurements
+
+
+def finalize_recording(recording_path, target_path, metadata):
+    """Schreibt die Trainingsdatei im bisherigen Format, indem die gespeicherten Zeilen kopiert werden.
+
+    `metadata` enthält die übrigen Felder der Trainingsdatei (training_name, timestamp, ...).
+    Die Messwerte liegen schon serialisiert vor, daher wird nichts neu in JSON umgewandelt.
+    Die Zieldatei wird zuerst als .tmp geschrieben und dann atomar umbenannt.
+    """
+    tmp_path = target_path + ".tmp"
+    with open(recording_path, "r", encoding="utf-8") as src, open(tmp_path, "w", encoding="utf-8") as dst:
+        dst.write("{")
+        for key, value in metadata.items():
+            dst.write(json.dumps(key) + ": " + json.dumps(value) + ", ")
+        dst.write('"data": [')
+        src.readline()  # Header überspringen
+        first = True
+        for line in src:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                json.loads(line)
+            except json.JSONDecodeError:
+                break  # abgeschnittene letzte Zeile
+            if not first:
+                dst.write(",\n")
+            dst.write(line)
+            first = False
+        dst.write("]}\n")
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(tmp_path, target_path)
+    os.remove(recording_path)
+
+
+def find_recordings(directory):
+    """Liefert alle nicht abgeschlossenen Aufnahmen im Verzeichnis."""
+    return sorted(
+        os.path.join(directory, filename)
+        for filename in os.listdir(directory)
+        if filename.startswith(RECORDING_PREFIX) and filename.endswith(RECORDING_SUFFIX)
+    )
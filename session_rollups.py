@@ -0,0 +1,169 @@
+import os
+import json
+
+
+ROLLUP_DIRECTORY = "rollups"  # Unterordner neben den Trainingsdateien
+ROLLUP_VERSION = 1
+ROLLUP_TIERS = (10, 60, 300)  # Bucketgrößen in Sekunden: 10 s, 1 min, 5 min
+ROLLUP_METRICS = ("cadence", "resistance_level", "power", "speed", "heartrate")
+
+
+class RollupBuilder:
+    """Fasst die Messwerte eines Trainings in einem Durchlauf in Zeit-Buckets zusammen.
+
+    Pro Stufe (`tiers`, Bucketgröße in Sekunden) und Bucket werden Min/Max/Mittelwert jeder
+    Kennzahl, die Distanz am Ende des Buckets und die Zeit pro Widerstandsstufe gespeichert
+    (gleiche Definition wie `SessionAggregator`: Zeit seit dem vorherigen Messwert, nur bei
+    cadence > 0). Die Daten liegen spaltenweise vor, eine Liste pro Feld.
+    """
+
+    def __init__(self, tiers=ROLLUP_TIERS, interval=1.0):
+        self.tiers = tuple(tiers)
+        self.interval = interval
+        self.count = 0
+        self.last_time = 0
+        self.columns = {size: self._empty_columns() for size in self.tiers}
+        self.current = {size: None for size in self.tiers}  # offener Bucket pro Stufe
+
+    @staticmethod
+    def _empty_columns():
+        columns = {"time": [], "count": [], "distance": [], "level_time": []}
+        for metric in ROLLUP_METRICS:
+            columns[metric + "_min"] = []
+            columns[metric + "_max"] = []
+            columns[metric + "_mean"] = []
+        return columns
+
+    def add(self, time_seconds, cadence, resistance_level, power, speed, distance, heartrate):
+        dt = time_seconds - self.last_time if self.count else self.interval
+        self.count += 1
+        self.last_time = time_seconds
+        values = (cadence, resistance_level, power, speed, heartrate)
+        moving = cadence > 0 and dt > 0
+
+        for size in self.tiers:
+            start = int(time_seconds // size) * size
+            bucket = self.current[size]
+            if bucket is None or bucket["time"] != start:
+                if bucket is not None:
+                    self._flush(size, bucket)
+                bucket = self.current[size] = {
+                    "time": start, "count": 0, "distance": distance, "level_time": {},
+                    "min": list(values), "max": list(values), "sum": [0] * len(values),
+                }
+            bucket["count"] += 1
+            bucket["distance"] = distance
+            minimum, maximum, total = bucket["min"], bucket["max"], bucket["sum"]
+            for i, value in enumerate(values):
+                if value < minimum[i]:
+                    minimum[i] = value
+                elif value > maximum[i]:
+                    maximum[i] = value
+                total[i] += value
+            if moving:
+                level_time = bucket["level_time"]
+                level_time[resistance_level] = level_time.get(resistance_level, 0) + dt
+
+    def add_measurement(self, measurement):
+        self.add(measurement['time_seconds'], measurement['cadence'], measurement['resistance_level'],
+                 measurement['power'], measurement['speed'], measurement['distance'], measurement['heartrate'])
+
+    def _flush(self, size, bucket):
+        columns = self.columns[size]
+        count = bucket["count"]
+        columns["time"].append(bucket["time"])
+        columns["count"].append(count)
+        columns["distance"].append(bucket["distance"])
+        # JSON-Schlüssel sind Strings, daher gleich als String ablegen
+        columns["level_time"].append({str(level): round(t, 1) for level, t in bucket["level_time"].items()})
+        for i, metric in enumerate(ROLLUP_METRICS):
+            columns[metric + "_min"].append(bucket["min"][i])
+            columns[metric + "_max"].append(bucket["max"][i])
+            columns[metric + "_mean"].append(round(bucket["sum"][i] / count, 2))
+
+    def rollups(self):
+        """Alle Stufen als JSON-fähiges Dictionary (offene Buckets werden abgeschlossen)."""
+        for size in self.tiers:
+            if self.current[size] is not None:
+                self._flush(size, self.current[size])
+                self.current[size] = None
+        return {
+            "version": ROLLUP_VERSION,
+            "sample_count": self.count,
+            "tiers": {str(size): self.columns[size] for size in self.tiers},
+        }
+
+
+def build_rollups(data, tiers=ROLLUP_TIERS):
+    """Rollups aus einem MeasurementStore oder einer Liste von Messwert-Dictionaries."""
+    builder = RollupBuilder(tiers)
+    if hasattr(data, "column"):
+        columns = [data.column(name) for name in ("time_seconds", "cadence", "resistance_level", "power",
+                                                  "speed", "distance", "heartrate")]
+        for values in zip(*columns):
+            builder.add(*values)
+    else:
+        for measurement in data:
+            builder.add_measurement(measurement)
+    return builder.rollups()
+
+
+def rollup_path(directory, filename):
+    """Pfad der Rollup-Datei zu einer Trainingsdatei (gleicher Name im Unterordner `rollups`)."""
+    return os.path.join(directory, ROLLUP_DIRECTORY, filename)
+
+
+def write_rollups(path, rollups):
+    """Schreibt die Rollups atomar (erst .tmp, dann umbenennen)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(rollups, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def read_rollups(path):
+    """Liest eine Rollup-Datei. Fehlt sie oder ist sie veraltet, kommt None zurück."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rollups = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Fehler beim Lesen der Rollups {path}: {e}")
+        return None
+    if rollups.get("version") != ROLLUP_VERSION:
+        return None
+    return rollups
+
+
+def choose_tier(rollups, max_points):
+    """Kleinste Bucketgröße, deren Bucketanzahl noch in `max_points` passt.
+
+    Gibt (bucketgröße, spalten) zurück, oder None wenn die Rohdaten selbst schon passen.
+    Passt keine Stufe, wird die gröbste genommen.
+    """
+    if rollups.get("sample_count", 0) <= max_points:
+        return None
+    tiers = sorted(rollups["tiers"].items(), key=lambda item: int(item[0]))
+    for size, columns in tiers:
+        if len(columns["time"]) <= max_points:
+            return int(size), columns
+    size, columns = tiers[-1]
+    return int(size), columns
+
+
+def envelope(columns, metric, bucket_seconds, scale=1.0):
+    """Min/Max einer Kennzahl als Linie (zwei Punkte pro Bucket), damit Spitzen sichtbar bleiben.
+
+    `scale` rechnet die Zeitachse um (z.B. 1/60 für Minuten).
+    """
+    times = []
+    values = []
+    for start, minimum, maximum in zip(columns["time"], columns[metric + "_min"], columns[metric + "_max"]):
+        middle = (start + bucket_seconds / 2) * scale
+        times.append(middle)
+        times.append(middle)
+        values.append(minimum)
+        values.append(maximum)
+    return times, values
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+
+TREND_MODES = ("last", "week", "month")
+DEFAULT_LAST_SESSIONS = 20  # Fenster für "last": die letzten N Trainings
+DEFAULT_BUCKETS = 12  # Fenster für "week"/"month": die letzten N Kalenderwochen bzw. -monate bis heute
+
+
+class TrendPoint:
+    """Ein Punkt im Verlauf: ein Training oder alle Trainings einer Woche / eines Monats (`sessions` = 0: kein Training)."""
+    __slots__ = ("label", "max_heartrate", "avg_power", "level_minutes", "sessions")
+
+    def __init__(self, label):
+        self.label = label
+        self.max_heartrate = 0
+        self.avg_power = 0
+        self.level_minutes = {}  # Stufe -> Minuten
+        self.sessions = 0
+
+
+def _bucket_start(date, mode):
+    if mode == "week":
+        monday = date - timedelta(days=date.weekday())
+        return monday.replace(hour=0, minute=0, second=0, microsecond=0)
+    return date.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _previous_bucket_start(start, mode):
+    if mode == "week":
+        return start - timedelta(days=7)
+    return (start - timedelta(days=1)).replace(day=1)
+
+
+def _bucket_label(start, mode):
+    if mode == "week":
+        return start.strftime("%G-KW%V")  # ISO-Jahr dazu, sonst ist KW01 um den Jahreswechsel mehrdeutig
+    return start.strftime("%m/%y")
+
+
+def trend_points(sessions, mode="last", last_sessions=DEFAULT_LAST_SESSIONS, buckets=DEFAULT_BUCKETS, now=None):
+    """Verlauf aus den gespeicherten Kennzahlen (`aggregates`, `resistance_summary`) der Trainings.
+
+    `sessions` muss nach Datum sortiert sein (wie `load_training_sessions()` liefert). Es werden
+    nur die Trainings im Fenster betrachtet, Messwerte werden nie geladen.
+    - "last": ein Punkt pro Training, die letzten `last_sessions`
+    - "week"/"month": ein Punkt pro Kalenderwoche/-monat, die letzten `buckets` bis `now` (Standard:
+      heute), auch ohne Training; max HR ist das Maximum, avg Power der über die Trainingszeit
+      gewichtete Mittelwert, Zeit pro Stufe die Summe
+    """
+    if mode == "last":
+        points = []
+        for training in sessions[-last_sessions:]:
+            point = TrendPoint(training.training_date.strftime("%d.%m."))
+            point.max_heartrate = training.aggregates.get('max_heartrate', 0)
+            point.avg_power = training.aggregates.get('avg_power', 0)
+            _add_levels(point, training.resistance_summary)
+            point.sessions = 1
+            points.append(point)
+        return points
+
+    if mode not in TREND_MODES:
+        raise ValueError(f"Unknown trend mode: {mode}")
+
+    # Kalenderfenster: aufeinanderfolgende Buckets von heute zurück, Lücken bleiben als leere Punkte
+    starts = [_bucket_start(now or datetime.now(), mode)]
+    while len(starts) < buckets:
+        starts.append(_previous_bucket_start(starts[-1], mode))
+    starts.reverse()
+    positions = {start: i for i, start in enumerate(starts)}
+    points = [TrendPoint(_bucket_label(start, mode)) for start in starts]
+    weights = [0] * len(points)
+
+    # von hinten nach vorne, bis das Fenster verlassen wird
+    for training in reversed(sessions):
+        start = _bucket_start(training.training_date, mode)
+        if start < starts[0]:
+            break
+        i = positions.get(start)
+        if i is None:
+            continue  # Datum in der Zukunft
+        point = points[i]
+        aggregates = training.aggregates
+        point.max_heartrate = max(point.max_heartrate, aggregates.get('max_heartrate', 0))
+        weight = aggregates.get('total_time', 0)
+        if weight > 0:
+            total = weights[i] + weight
+            point.avg_power += (aggregates.get('avg_power', 0) - point.avg_power) * weight / total
+            weights[i] = total
+        _add_levels(point, training.resistance_summary)
+        point.sessions += 1
+
+    return points
+
+
+def _add_levels(point, resistance_summary):
+    if not isinstance(resistance_summary, list):
+        return
+    for entry in resistance_summary:
+        level = entry['resistance_level']
+        point.level_minutes[level] = point.level_minutes.get(level, 0) + entry['total_time'] / 60
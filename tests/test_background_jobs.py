@@ -0,0 +1,100 @@
+import time
+import threading
+
+from background_jobs import BackgroundJobs
+
+
+class FakeWidget:
+    """Ersetzt das Tk-Widget: `after`-Callbacks werden gesammelt und vom Test aufgerufen."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+        return len(self.callbacks)
+
+    def after_cancel(self, after_id):
+        pass
+
+
+def run_until_idle(jobs, widget, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while jobs.busy:
+        assert time.monotonic() < deadline, "Jobs werden nicht fertig"
+        time.sleep(0.01)
+        callbacks, widget.callbacks = widget.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def test_results_are_delivered_by_poll():
+    widget = FakeWidget()
+    jobs = BackgroundJobs(widget)
+    results = []
+    errors = []
+    jobs.submit(lambda: 42, on_done=results.append)
+    jobs.submit(lambda: 1 / 0, on_error=errors.append, description="Dividing...")
+    assert results == []  # erst im "Tk-Thread" über after()
+    run_until_idle(jobs, widget)
+    assert results == [42]
+    assert isinstance(errors[0], ZeroDivisionError)
+    jobs.shutdown()
+
+
+def test_duplicate_keys_are_coalesced():
+    widget = FakeWidget()
+    jobs = BackgroundJobs(widget)
+    release = threading.Event()
+    calls = []
+
+    def job(name):
+        def work():
+            if name == "first":
+                release.wait(5)
+            calls.append(name)
+            return name
+        return work
+
+    done = []
+    assert jobs.submit(job("first"), on_done=done.append, key="load")
+    assert not jobs.submit(job("second"), on_done=done.append, key="load")  # nur vorgemerkt
+    assert not jobs.submit(job("third"), on_done=done.append, key="load")  # ersetzt den vorgemerkten
+    assert jobs.is_pending("load")
+    release.set()
+    run_until_idle(jobs, widget)
+    assert calls == ["first", "third"]
+    assert done == ["first", "third"]
+    assert not jobs.is_pending("load")
+    jobs.shutdown()
+
+
+def test_status_text_lists_running_jobs():
+    widget = FakeWidget()
+    jobs = BackgroundJobs(widget)
+    release = threading.Event()
+    statuses = []
+    jobs.add_status_listener(statuses.append)
+    jobs.submit(lambda: release.wait(5), key="save", description="Saving training...")
+    jobs.submit(lambda: None, key="load", description="Loading trainings...")
+    assert jobs.status_text() == "Saving training... · Loading trainings..."
+    release.set()
+    run_until_idle(jobs, widget)
+    assert jobs.status_text() == ""
+    assert statuses[-1] == ""
+    jobs.shutdown()
+
+
+def test_error_in_on_done_does_not_block_other_results():
+    widget = FakeWidget()
+    jobs = BackgroundJobs(widget)
+    results = []
+
+    def broken(result):
+        raise RuntimeError("Anzeige kaputt")
+
+    jobs.submit(lambda: 1, on_done=broken)
+    jobs.submit(lambda: 2, on_done=results.append)
+    run_until_idle(jobs, widget)
+    assert results == [2]
+    jobs.shutdown()
@@ -0,0 +1,64 @@
+from cadence_sensor_manager import CadenceSensorManager, EDGE_CHN
+from edge_queue import EdgeQueue
+
+
+def collect(queue):
+    events = []
+    count = queue.drain(lambda timestamp_ns, kind: events.append((timestamp_ns, kind)))
+    assert count == len(events)
+    return events
+
+
+def test_fifo_order():
+    queue = EdgeQueue(capacity=8)
+    for i in range(5):
+        assert queue.push(i * 10, i)
+    assert len(queue) == 5
+    assert collect(queue) == [(i * 10, i) for i in range(5)]
+    assert len(queue) == 0
+    assert collect(queue) == []
+
+
+def test_wrap_around():
+    queue = EdgeQueue(capacity=4)
+    received = []
+    for i in range(11):
+        queue.push(i)
+        if i % 3 == 2:
+            received += collect(queue)
+    received += collect(queue)
+    assert [timestamp for timestamp, _ in received] == list(range(11))
+    assert queue.dropped == 0
+
+
+def test_full_queue_drops_newest():
+    queue = EdgeQueue(capacity=4)
+    results = [queue.push(i) for i in range(6)]
+    assert results == [True, True, True, True, False, False]
+    assert queue.dropped == 2
+    assert [timestamp for timestamp, _ in collect(queue)] == [0, 1, 2, 3]
+    assert queue.push(6)  # wieder Platz
+    assert queue.dropped == 2
+
+
+def test_clear_discards_pending_and_resets_dropped():
+    queue = EdgeQueue(capacity=4)
+    for i in range(6):
+        queue.push(i)
+    queue.clear()
+    assert len(queue) == 0
+    assert queue.dropped == 0
+    queue.push(100)
+    assert collect(queue) == [(100, 0)]
+
+
+def test_reset_discards_idle_edges():
+    manager = CadenceSensorManager()
+    for i in range(5000):  # Flanken ohne laufendes Training, niemand holt sie ab
+        manager.edges.push(i * 1_000_000_000, EDGE_CHN)
+    manager.reset()
+    assert manager.dropped_edges == 0
+    assert manager.get_Counter() == 0
+    assert manager.rpm_calculator.last_round_time is None
+    manager.edges.push(6000 * 1_000_000_000, EDGE_CHN)
+    assert manager.get_Counter() == 1
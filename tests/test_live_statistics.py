@@ -0,0 +1,51 @@
+import statistics
+
+import pytest
+
+from live_statistics import LiveTrainingStatistics, RunningStats
+from session_aggregates import compute_session_summary
+
+POWERS = [120.0, 95.5, 180.0, 60.0, 150.25, 110.0, 0.0, 200.0]
+
+
+def test_running_stats_match_statistics_module():
+    stats = RunningStats()
+    for value in POWERS:
+        stats.add(value)
+    assert stats.count == len(POWERS)
+    assert stats.mean == pytest.approx(statistics.mean(POWERS))
+    assert stats.variance == pytest.approx(statistics.variance(POWERS))
+    assert stats.std == pytest.approx(statistics.stdev(POWERS))
+    assert (stats.min, stats.max) == (0.0, 200.0)
+
+
+def test_running_stats_with_large_offset():
+    # Welford bleibt auch bei großem Mittelwert und kleiner Streuung genau
+    values = [1e9 + v for v in (4.0, 7.0, 13.0, 16.0)]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.variance == pytest.approx(30.0)
+
+
+def test_running_stats_single_value():
+    stats = RunningStats()
+    stats.add(5.0)
+    assert stats.variance == 0.0
+
+
+def test_live_statistics_match_offline_summary():
+    measurements = [{"time_seconds": t, "cadence": 60, "resistance_level": 1 + t % 2, "power": power,
+                     "speed": 10.0, "distance": t * 2.8, "heartrate": 0 if t < 2 else 110 + t}
+                    for t, power in enumerate(POWERS)]
+    live = LiveTrainingStatistics(power_windows=(3,))
+    for measurement in measurements:
+        live.add_measurement(measurement)
+
+    aggregates, resistance_summary = compute_session_summary(measurements)
+    live_aggregates = live.aggregates()
+    assert {key: live_aggregates[key] for key in aggregates} == aggregates
+    assert live.resistance_summary() == resistance_summary
+    assert live_aggregates["power_std"] == pytest.approx(statistics.stdev(POWERS))
+    assert live_aggregates["avg_heartrate"] == pytest.approx(statistics.mean(110 + t for t in range(2, 8)))
+    assert "max_avg_power_3s" in live_aggregates
@@ -0,0 +1,59 @@
+import pytest
+
+from measurement_store import FIELD_NAMES, MeasurementStore
+
+
+def record(i):
+    return {"time_seconds": float(i), "cadence": 40 + i, "resistance_level": 3, "power": 20.5 + i,
+            "speed": 12.25, "distance": i * 3.4, "heartrate": 90 + i}
+
+
+def test_round_trip_across_chunks():
+    records = [record(i) for i in range(7)]
+    store = MeasurementStore(chunk_size=3)  # wächst mehrmals
+    for r in records[:2]:
+        store.append(r)
+    store.extend(records[2:])
+    assert len(store) == 7
+    assert store.to_records() == records
+    assert MeasurementStore.from_records(records).to_records() == records
+
+
+def test_int_fields_are_rounded_and_missing_values_are_zero():
+    store = MeasurementStore()
+    store.append({"time_seconds": 1, "cadence": 40.6, "power": None})
+    row = store[0]
+    assert row["cadence"] == 41
+    assert row["power"] == 0.0
+    assert row["heartrate"] == 0
+    assert row.get("unknown", "x") == "x"
+    assert list(row.keys()) == list(FIELD_NAMES)
+    with pytest.raises(KeyError):
+        row["unknown"]
+
+
+def test_column_is_a_copy():
+    store = MeasurementStore.from_records([record(i) for i in range(3)])
+    cadence = store.column("cadence")
+    store.append(record(3))
+    cadence[0] = 0
+    assert list(cadence) == [0, 41, 42]  # kein Wert hinzugekommen
+    assert list(store.column("cadence")) == [40, 41, 42, 43]
+
+
+def test_indexing_and_slicing():
+    store = MeasurementStore.from_records([record(i) for i in range(5)])
+    assert store[-1]["time_seconds"] == 4.0
+    assert [m["cadence"] for m in store[1:4:2]] == [41, 43]
+    assert [m["heartrate"] for m in store] == [90, 91, 92, 93, 94]
+    with pytest.raises(IndexError):
+        store[5]
+
+
+def test_clear():
+    store = MeasurementStore.from_records([record(i) for i in range(3)])
+    store.clear()
+    assert len(store) == 0
+    assert store.to_records() == []
+    store.append(record(9))
+    assert store.to_records() == [record(9)]
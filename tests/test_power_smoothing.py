@@ -0,0 +1,25 @@
+import pytest
+
+from power_smoothing import PowerSmoother
+
+
+def test_best_uses_full_windows_only():
+    smoother = PowerSmoother(windows=(3,), np_window=3)
+    for power in [300, 100, 100, 100, 200]:
+        smoother.add(power)
+    # 300 allein zählt nicht als 3-s-Leistung, bestes volles Fenster ist (300+100+100)/3
+    assert smoother.summary()["max_avg_power_3s"] == pytest.approx(500 / 3)
+
+
+def test_session_shorter_than_window_uses_partial_mean():
+    smoother = PowerSmoother(windows=(3, 30))
+    for power in [100, 200, 150, 150, 200]:
+        smoother.add(power)
+    summary = smoother.summary()
+    assert summary["max_avg_power_30s"] == pytest.approx(160)  # statt 0.0
+    assert summary["max_avg_power_3s"] == pytest.approx(500 / 3)
+    assert summary["normalized_power"] == pytest.approx(160)
+
+
+def test_empty_session():
+    assert PowerSmoother(windows=(3,)).summary()["max_avg_power_3s"] == 0
@@ -0,0 +1,118 @@
+from cadence_sensor_manager import CadenceSensorManager, EDGE_AB, EDGE_CHN
+from quadrature import QuadratureDecoder
+
+GRAY = [(0, 0), (0, 1), (1, 1), (1, 0)]  # vorwärts
+
+
+class Encoder:
+    """Simuliert die Kanäle A/B eines Encoders und liefert die Pegel an einen Decoder."""
+
+    def __init__(self, decoder):
+        self.decoder = decoder
+        self.phase = 0
+        decoder.update(*GRAY[0], 0.0)
+
+    def steps(self, count, t, dt=0.001):
+        direction = 1 if count > 0 else -1
+        for _ in range(abs(count)):
+            self.phase = (self.phase + direction) % 4
+            t += dt
+            self.decoder.update(*GRAY[self.phase], t)
+        return t
+
+
+def test_forward_and_backward_steps():
+    decoder = QuadratureDecoder()
+    encoder = Encoder(decoder)
+    encoder.steps(10, 0.0)
+    assert decoder.position == 10
+    encoder.steps(-4, 1.0)
+    assert decoder.position == 6
+    assert decoder.invalid_transitions == 0
+
+
+def test_skipped_state_counts_as_invalid():
+    decoder = QuadratureDecoder()
+    decoder.update(0, 0, 0.0)
+    decoder.update(1, 1, 0.001)  # zwei Zustände übersprungen
+    assert decoder.position == 0
+    assert decoder.invalid_transitions == 1
+
+
+def test_calibration_from_index_pulses():
+    decoder = QuadratureDecoder()
+    encoder = Encoder(decoder)
+    decoder.index()
+    assert not decoder.active
+    t = encoder.steps(400, 0.0)
+    decoder.index()
+    assert decoder.counts_per_revolution == 400
+    encoder.steps(100, t)
+    assert decoder.crank_angle == 90
+
+
+def test_rocking_crank_does_not_calibrate():
+    decoder = QuadratureDecoder()
+    encoder = Encoder(decoder)
+    decoder.index()
+    t = encoder.steps(300, 0.0)
+    t = encoder.steps(-200, t)
+    encoder.steps(300, t)
+    decoder.index()
+    assert decoder.counts_per_revolution is None
+
+
+def test_outlier_count_needs_confirmation():
+    decoder = QuadratureDecoder()
+    encoder = Encoder(decoder)
+    decoder.index()
+    t = encoder.steps(400, 0.0)
+    decoder.index()
+    t = encoder.steps(2, t)
+    decoder.index()  # geprellter Impuls kurz nach dem echten
+    assert decoder.counts_per_revolution == 400
+    t = encoder.steps(401, t)
+    decoder.index()
+    assert decoder.counts_per_revolution == 401  # innerhalb der Toleranz
+
+
+def test_repeated_new_count_replaces_wrong_calibration():
+    decoder = QuadratureDecoder()
+    encoder = Encoder(decoder)
+    decoder.index()
+    t = encoder.steps(200, 0.0)  # erste Umdrehung falsch gemessen (z.B. Impuls verpasst)
+    decoder.index()
+    for _ in range(2):
+        t = encoder.steps(400, t)
+        decoder.index()
+    assert decoder.counts_per_revolution == 400
+
+
+def test_rpm_from_steps():
+    decoder = QuadratureDecoder(counts_per_revolution=400)
+    encoder = Encoder(decoder)
+    t = encoder.steps(200, 0.0, dt=0.0025)  # 400 Schritte/s = 60 RPM
+    assert round(decoder.get_rpm(t)) == 60
+    assert decoder.get_rpm(t + 2.0) == 0  # steht
+
+
+def _push_steps(manager, phase, count, t_ns, dt_ns=1_000_000):
+    for _ in range(count):
+        phase = (phase + 1) % 4
+        a, b = GRAY[phase]
+        t_ns += dt_ns
+        manager.edges.push(t_ns, EDGE_AB | (a << 1) | b)
+    return phase, t_ns
+
+
+def test_chn_bounce_does_not_break_calibration():
+    manager = CadenceSensorManager()
+    manager.edges.push(0, EDGE_AB)
+    manager.edges.push(0, EDGE_CHN)
+    phase, t_ns = _push_steps(manager, 0, 400, 0)
+    manager.edges.push(t_ns, EDGE_CHN)
+    phase, t_ns = _push_steps(manager, phase, 2, t_ns)
+    manager.edges.push(t_ns, EDGE_CHN)  # Prellen 2 ms nach dem echten Impuls
+    manager.process_edges()
+    assert manager.quadrature.counts_per_revolution == 400
+    assert manager.rpm_calculator.rejected_edges == 1
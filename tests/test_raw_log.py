@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from edge_queue import EDGE_AB, EDGE_CHN
+from raw_log import (EVENT_EDGE, EVENT_HEART_RATE, RawLog, RawLogWriter, events_from_raw_log, find_captures,
+                     raw_log_path, replay_cadence)
+from session_recorder import SessionRecorder
+from TrainingDataManager import TrainingDataManager
+
+MEASUREMENT = {"time_seconds": 0, "cadence": 40, "resistance_level": 1, "power": 20, "speed": 10,
+               "distance": 0, "heartrate": 90}
+
+
+def write_log(directory, events, start_ns=1_000_000_000):
+    writer = RawLogWriter.start(str(directory), start_ns=start_ns)
+    for timestamp_ns, kind, payload in events:
+        writer.append(start_ns + timestamp_ns, kind, payload)
+    writer.close()
+    return writer.filepath
+
+
+def test_round_trip(tmp_path):
+    events = [(5_000_000, EVENT_HEART_RATE, 91), (1_000_000_000, EVENT_EDGE, EDGE_CHN),
+              (1_000_500_000, EVENT_EDGE, EDGE_AB | 0b11), (2_000_000_000, EVENT_EDGE, EDGE_CHN)]
+    path = write_log(tmp_path, events)
+    with RawLog(path) as log:
+        assert len(log) == 4
+        assert log.start_ns == 1_000_000_000
+        assert list(log.events()) == events
+
+
+def test_out_of_order_events_are_sorted(tmp_path):
+    # Herzfrequenz wird sofort geschrieben, Flanken erst beim Abholen: negative Abstände
+    path = write_log(tmp_path, [(900_000_000, EVENT_HEART_RATE, 90), (400_000_000, EVENT_EDGE, EDGE_CHN)])
+    assert events_from_raw_log(path) == [(400_000_000, EVENT_EDGE, EDGE_CHN), (900_000_000, EVENT_HEART_RATE, 90)]
+
+
+def test_truncated_last_record_is_ignored(tmp_path):
+    path = write_log(tmp_path, [(1_000_000_000, EVENT_EDGE, EDGE_CHN), (2_000_000_000, EVENT_EDGE, EDGE_CHN)])
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 5)
+    with RawLog(path) as log:
+        assert list(log.events()) == [(1_000_000_000, EVENT_EDGE, EDGE_CHN)]
+
+
+def test_invalid_file_is_rejected(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"x" * 40)
+    with pytest.raises(ValueError):
+        RawLog(str(path))
+    path.write_bytes(b"short")
+    with pytest.raises(ValueError):
+        RawLog(str(path))
+
+
+def test_append_after_close_is_ignored(tmp_path):
+    writer = RawLogWriter.start(str(tmp_path), start_ns=0)
+    writer.append(1, EVENT_EDGE, EDGE_CHN)
+    writer.close()
+    writer.append(2, EVENT_EDGE, EDGE_CHN)
+    writer.close()
+    with RawLog(writer.filepath) as log:
+        assert len(log) == 1
+
+
+def test_replay_cadence_through_estimator(tmp_path):
+    edges = [(i * 1_000_000_000, EVENT_EDGE, EDGE_CHN) for i in range(1, 11)]
+    path = write_log(tmp_path, edges)
+    cadence = replay_cadence(events_from_raw_log(path))
+    assert cadence[-1] == (10.0, 60)
+
+    class CountingEstimator:
+        def __init__(self):
+            self.edges = []
+
+        def add_edge(self, timestamp):
+            self.edges.append(timestamp)
+
+        def get_rpm(self, now):
+            return len(self.edges)
+
+    estimator = CountingEstimator()
+    assert replay_cadence(edges, estimator, interval=5.0) == [(5.0, 5), (10.0, 10)]
+
+
+def test_finalize_and_discard(tmp_path):
+    writer = RawLogWriter.start(str(tmp_path), start_ns=0)
+    target = raw_log_path(str(tmp_path), "training_2025-02-11_101500.json")
+    writer.finalize(target)
+    assert os.path.exists(target)
+    assert find_captures(str(tmp_path)) == []
+
+    writer = RawLogWriter.start(str(tmp_path), start_ns=0)
+    writer.discard()
+    assert find_captures(str(tmp_path)) == []
+
+
+def test_orphaned_capture_is_recovered_with_its_training(tmp_path):
+    directory = str(tmp_path)
+    recorder = SessionRecorder.start(directory, "crashed")
+    recorder.append(MEASUREMENT)
+    recorder.close()
+    writer = RawLogWriter.start(directory, start_ns=0)
+    writer.append(1, EVENT_EDGE, EDGE_CHN)
+    writer.close()
+
+    manager = TrainingDataManager(directory, raw_capture=False)
+    recovered = manager.recover_partial_sessions()
+    assert len(recovered) == 1
+    assert find_captures(directory) == []
+    assert os.path.exists(raw_log_path(directory, os.path.basename(recovered[0])))
+
+
+def test_orphaned_capture_without_training_is_removed(tmp_path):
+    directory = str(tmp_path)
+    writer = RawLogWriter.start(directory, start_ns=0)
+    writer.close()
+    manager = TrainingDataManager(directory, raw_capture=False)
+    assert manager.recover_partial_sessions() == []
+    assert find_captures(directory) == []
@@ -0,0 +1,105 @@
+from rpm_calculator import RPMCalculator
+
+
+def feed(calculator, times):
+    return [calculator.add_edge(t) for t in times]
+
+
+def test_steady_cadence():
+    calculator = RPMCalculator()
+    assert all(feed(calculator, [i * 1.0 for i in range(10)]))
+    assert calculator.get_rpm(9.0) == 60
+
+
+def test_first_edge_gives_no_cadence_yet():
+    calculator = RPMCalculator()
+    calculator.add_edge(0.0)
+    assert calculator.get_rpm(0.5) == 0
+
+
+def test_contact_bounce_is_rejected():
+    calculator = RPMCalculator()
+    feed(calculator, [0, 1, 2, 3, 4])
+    assert calculator.add_edge(4.01) is False  # kürzer als min_interval
+    assert calculator.rejected_edges == 1
+    assert calculator.last_round_time == 4
+    feed(calculator, [5, 6])
+    assert calculator.get_rpm(6) == 60
+
+
+def test_single_early_pulse_is_held_back_and_dropped():
+    calculator = RPMCalculator()
+    feed(calculator, [0, 1, 2, 3, 4])
+    assert calculator.add_edge(4.3) is False  # zurückgehalten
+    assert calculator.add_edge(5.0) is True  # 0.3 / 0.7: keine zwei ähnlichen Hälften -> Ausreißer
+    assert calculator.rejected_edges == 1
+    assert calculator.get_rpm(5.0) == 60
+
+
+def test_step_up_is_taken_over_immediately():
+    calculator = RPMCalculator()
+    feed(calculator, range(6))
+    t = 5.0
+    values = []
+    for _ in range(6):
+        t += 0.5
+        calculator.add_edge(t)
+        values.append(calculator.get_rpm(t))
+    # der erste kurze Impuls wird zurückgehalten, mit dem zweiten gilt die neue Kadenz
+    assert values[1:] == [120] * 5
+    assert calculator.rejected_edges == 0
+
+
+def test_step_down_converges():
+    calculator = RPMCalculator()
+    feed(calculator, range(6))
+    t = 5.0
+    values = []
+    for _ in range(14):
+        t += 2.0
+        calculator.add_edge(t)
+        values.append(calculator.get_rpm(t))
+    assert values[0] < 60
+    assert all(abs(value - 30) <= 3 for value in values[4:])
+
+
+def test_accelerating_cadence_follows():
+    calculator = RPMCalculator()
+    t, interval = 0.0, 2.0
+    values = []
+    for _ in range(15):
+        calculator.add_edge(t)
+        values.append(calculator.get_rpm(t))
+        t += interval
+        interval *= 0.93
+    assert calculator.rejected_edges == 0
+    assert values == sorted(values)  # steigt nur
+    assert values[-1] > 60  # zuletzt etwa 77 RPM
+
+
+def test_stopping_decays_to_zero():
+    calculator = RPMCalculator()
+    feed(calculator, [0, 1, 2, 3, 4])
+    assert calculator.get_rpm(4.5) == 60
+    assert calculator.get_rpm(6) == 30  # höchstens 60 / Zeit seit dem letzten Impuls
+    assert calculator.get_rpm(8) == 15
+    assert calculator.get_rpm(64) == 1
+    assert calculator.get_rpm(200) == 0
+
+
+def test_restart_after_pause():
+    calculator = RPMCalculator()
+    feed(calculator, [0, 1, 2, 3, 4])
+    assert calculator.add_edge(20) is True  # länger als window_seconds: neu beginnen
+    assert calculator.get_rpm(20) == 0
+    calculator.add_edge(21)
+    assert calculator.get_rpm(21) == 60
+
+
+def test_reset():
+    calculator = RPMCalculator()
+    feed(calculator, [0, 1, 2, 3])
+    calculator.reset()
+    assert calculator.last_round_time is None
+    assert calculator.get_rpm(3.5) == 0
+    assert calculator.accepted_edges == 0
@@ -0,0 +1,47 @@
+import pytest
+
+from measurement_store import MeasurementStore
+from session_aggregates import compute_session_summary
+
+
+def measurement(t, cadence, level=1, power=50.0, heartrate=100):
+    return {"time_seconds": t, "cadence": cadence, "resistance_level": level, "power": power if cadence else 0.0,
+            "speed": 10.0 if cadence else 0.0, "distance": t * 2.5, "heartrate": heartrate}
+
+
+# 3 s treten auf Stufe 1, 2 s Pause (Kadenz 0), 1 s auf Stufe 2
+SESSION = [measurement(0, 60), measurement(1, 60, power=70.0), measurement(2, 60),
+           measurement(3, 0), measurement(4, 0), measurement(5, 50, level=2, power=90.0, heartrate=120)]
+
+
+def test_short_session_with_pause():
+    aggregates, resistance_summary = compute_session_summary(SESSION)
+    assert aggregates["sample_count"] == 6
+    assert aggregates["total_time"] == 6  # letzte begonnene Sekunde zählt mit
+    assert aggregates["moving_time"] == 4  # Pause zählt nicht
+    assert aggregates["total_distance"] == 12.5
+    assert aggregates["avg_power"] == pytest.approx(260 / 6)
+    assert aggregates["max_power"] == 90.0
+    assert aggregates["max_heartrate"] == 120
+    assert resistance_summary == [
+        {"resistance_level": 1, "total_time": 3, "avg_power": 56.7, "max_power": 70.0},
+        {"resistance_level": 2, "total_time": 1, "avg_power": 90.0, "max_power": 90.0},
+    ]
+
+
+def test_store_and_records_give_the_same_result():
+    assert compute_session_summary(MeasurementStore.from_records(SESSION)) == compute_session_summary(SESSION)
+
+
+def test_gap_in_timestamps_counts_real_time():
+    # Abtastung hing 2 s: der nächste Messwert zählt für die ganze Zeit seit dem vorherigen
+    aggregates, resistance_summary = compute_session_summary([measurement(0, 60), measurement(3, 60)])
+    assert aggregates["moving_time"] == 4
+    assert resistance_summary[0]["total_time"] == 4
+
+
+def test_empty_session():
+    aggregates, resistance_summary = compute_session_summary([])
+    assert aggregates["total_time"] == 0
+    assert aggregates["avg_cadence"] == 0
+    assert resistance_summary == []
@@ -0,0 +1,61 @@
+import os
+import json
+
+from session_index import INDEX_FILENAME, SessionIndex
+
+AGGREGATES = {"avg_power": 80.0}
+
+
+def write_training(path, content):
+    path.write_text(json.dumps(content))
+    return os.stat(path)
+
+
+def test_round_trip(tmp_path):
+    stat = write_training(tmp_path / "training_a.json", {"data": []})
+    index = SessionIndex(str(tmp_path))
+    index.update("training_a.json", stat, "A", "2025-02-11 10:15:00", {}, AGGREGATES)
+    index.save()
+    assert not index.dirty
+
+    loaded = SessionIndex(str(tmp_path))
+    loaded.load()
+    assert loaded.lookup("training_a.json", stat)["aggregates"] == AGGREGATES
+
+
+def test_rewritten_file_invalidates_entry(tmp_path):
+    path = tmp_path / "training_a.json"
+    stat = write_training(path, {"data": []})
+    index = SessionIndex(str(tmp_path))
+    index.update("training_a.json", stat, "A", "2025-02-11 10:15:00", {}, AGGREGATES)
+
+    # andere Größe
+    assert index.lookup("training_a.json", write_training(path, {"data": [1, 2, 3]})) is None
+    # gleiche Größe, aber neuer Zeitstempel
+    stat = write_training(path, {"data": []})
+    index.update("training_a.json", stat, "A", "2025-02-11 10:15:00", {}, AGGREGATES)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert index.lookup("training_a.json", os.stat(path)) is None
+    assert index.lookup("training_b.json", stat) is None
+
+
+def test_broken_or_old_index_is_ignored(tmp_path):
+    (tmp_path / INDEX_FILENAME).write_text("{kaputt")
+    index = SessionIndex(str(tmp_path))
+    index.load()
+    assert index.entries == {}
+
+    (tmp_path / INDEX_FILENAME).write_text(json.dumps({"version": 1, "sessions": {"a.json": {}}}))
+    index.load()
+    assert index.entries == {}
+
+
+def test_prune_removes_deleted_files(tmp_path):
+    stat = write_training(tmp_path / "training_a.json", {})
+    index = SessionIndex(str(tmp_path))
+    for filename in ("training_a.json", "training_b.json"):
+        index.update(filename, stat, filename, "", {}, {})
+    index.save()
+    index.prune(["training_a.json"])
+    assert index.dirty
+    assert list(index.entries) == ["training_a.json"]
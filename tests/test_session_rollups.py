@@ -0,0 +1,52 @@
+from session_rollups import build_rollups, choose_tier, envelope, read_rollups, rollup_path, write_rollups
+
+
+def measurement(t, cadence=60, level=1, power=100.0):
+    return {"time_seconds": t, "cadence": cadence, "resistance_level": level, "power": power,
+            "speed": 20.0, "distance": t * 5.0, "heartrate": 100}
+
+
+def session(seconds):
+    return [measurement(t, power=100.0 + t % 7) for t in range(seconds)]
+
+
+def test_buckets_min_max_mean():
+    data = [measurement(0, power=80.0), measurement(5, level=2, power=200.0), measurement(9, cadence=0, power=0.0),
+            measurement(10, power=120.0)]
+    tier = build_rollups(data, tiers=(10,))["tiers"]["10"]
+    assert tier["time"] == [0, 10]
+    assert tier["count"] == [3, 1]
+    assert tier["power_min"] == [0.0, 120.0]
+    assert tier["power_max"] == [200.0, 120.0]
+    assert tier["power_mean"] == [93.33, 120.0]
+    assert tier["distance"] == [45.0, 50.0]
+    # Zeit pro Stufe seit dem vorherigen Messwert, nur beim Treten
+    assert tier["level_time"] == [{"1": 1, "2": 5}, {"1": 1}]
+
+
+def test_choose_tier_thresholds():
+    rollups = build_rollups(session(3600))  # 360 / 60 / 12 Buckets
+    assert choose_tier(rollups, 3600) is None  # Rohdaten passen noch
+    assert choose_tier(rollups, 360)[0] == 10
+    assert choose_tier(rollups, 359)[0] == 60
+    assert choose_tier(rollups, 60)[0] == 60
+    assert choose_tier(rollups, 59)[0] == 300
+    size, columns = choose_tier(rollups, 5)  # nichts passt: gröbste Stufe
+    assert size == 300 and len(columns["time"]) == 12
+
+
+def test_envelope_has_two_points_per_bucket():
+    columns = build_rollups(session(120), tiers=(60,))["tiers"]["60"]
+    times, values = envelope(columns, "power", 60, scale=1 / 60)
+    assert times == [0.5, 0.5, 1.5, 1.5]
+    assert values == [100.0, 106.0, 100.0, 106.0]
+
+
+def test_write_and_read(tmp_path):
+    path = rollup_path(str(tmp_path), "training_a.json")
+    rollups = build_rollups(session(30))
+    write_rollups(path, rollups)
+    assert read_rollups(path) == rollups
+    assert read_rollups(rollup_path(str(tmp_path), "missing.json")) is None
+    write_rollups(path, dict(rollups, version=0))
+    assert read_rollups(path) is None
@@ -0,0 +1,50 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from session_trends import trend_points
+
+
+def training(date, max_heartrate=120, avg_power=100, total_time=600, levels=((1, 600),)):
+    return SimpleNamespace(
+        training_date=datetime.strptime(date, "%Y-%m-%d %H:%M"),
+        aggregates={"max_heartrate": max_heartrate, "avg_power": avg_power, "total_time": total_time},
+        resistance_summary=[{"resistance_level": level, "total_time": seconds} for level, seconds in levels],
+    )
+
+
+SESSIONS = [  # nach Datum sortiert
+    training("2025-11-20 18:00"),
+    training("2025-12-31 18:00", max_heartrate=150, avg_power=100, total_time=600),
+    training("2026-01-02 09:00", max_heartrate=140, avg_power=200, total_time=1800, levels=((2, 1200),)),
+    training("2026-01-06 18:00", avg_power=80),
+]
+
+
+def test_weeks_across_year_boundary():
+    points = trend_points(SESSIONS, mode="week", buckets=3, now=datetime(2026, 1, 7, 12, 0))
+    assert [p.label for p in points] == ["2025-KW52", "2026-KW01", "2026-KW02"]
+    assert [p.sessions for p in points] == [0, 2, 1]  # Mi 31.12. und Fr 2.1. liegen in derselben ISO-Woche
+    week = points[1]
+    assert week.max_heartrate == 150
+    assert week.avg_power == pytest.approx(175)  # nach Trainingszeit gewichtet
+    assert week.level_minutes == {1: 10, 2: 20}
+
+
+def test_months_across_year_boundary():
+    points = trend_points(SESSIONS, mode="month", buckets=3, now=datetime(2026, 2, 15))
+    assert [p.label for p in points] == ["12/25", "01/26", "02/26"]
+    assert [p.sessions for p in points] == [1, 2, 0]  # November liegt außerhalb des Fensters
+    assert points[1].avg_power == pytest.approx((200 * 1800 + 80 * 600) / 2400)
+
+
+def test_last_sessions():
+    points = trend_points(SESSIONS, mode="last", last_sessions=2)
+    assert [p.label for p in points] == ["02.01.", "06.01."]
+    assert points[0].level_minutes == {2: 20}
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        trend_points(SESSIONS, mode="year")
@@ -0,0 +1,47 @@
+from session_recorder import find_recordings
+from TrainingDataManager import TrainingDataManager
+
+MEASUREMENT = {"time_seconds": 1, "cadence": 40, "resistance_level": 1, "power": 20, "speed": 10,
+               "distance": 0, "heartrate": 90}
+
+
+def test_late_measurement_after_discard_is_dropped(tmp_path):
+    directory = str(tmp_path)
+    manager = TrainingDataManager(directory, raw_capture=False)
+    manager.start_session()
+    manager.add_measurement(MEASUREMENT)
+    assert len(find_recordings(directory)) == 1
+
+    manager.reset_values()  # 'Discard Training'
+    manager.add_measurement(dict(MEASUREMENT, time_seconds=2))  # Abtast-Thread war noch nicht fertig
+    assert find_recordings(directory) == []
+    assert len(manager.current_training_data) == 0
+    assert manager.recover_partial_sessions() == []
+
+
+def test_measurements_are_accepted_again_after_start_session(tmp_path):
+    directory = str(tmp_path)
+    manager = TrainingDataManager(directory, raw_capture=False)
+    manager.add_measurement(MEASUREMENT)  # noch kein Training gestartet
+    assert len(manager.current_training_data) == 0
+
+    manager.start_session()
+    manager.add_measurement(MEASUREMENT)
+    assert len(manager.current_training_data) == 1
+    assert manager.save_training_session() is not None
+    manager.add_measurement(MEASUREMENT)  # nach dem Speichern
+    assert find_recordings(directory) == []
+
+
+def test_recovery_skips_the_running_training(tmp_path):
+    directory = str(tmp_path)
+    manager = TrainingDataManager(directory, raw_capture=False)
+    manager.training_name = "running"
+    manager.start_session()
+    manager.add_measurement(MEASUREMENT)
+
+    # Wiederherstellung läuft beim Start im Hintergrund, das Training wurde schon gestartet
+    assert manager.recover_partial_sessions() == []
+    assert find_recordings(directory) == [manager.recorder.filepath]
+    manager.add_measurement(dict(MEASUREMENT, time_seconds=2))
+    assert manager.save_training_session() is not None
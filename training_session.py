@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+
+
+class SampleCache:
+    """LRU-Cache für geladene Messwerte. Es bleiben höchstens `max_sessions` Trainings im Speicher.
+
+    Wird aus dem Tk-Thread und aus den Hintergrund-Jobs benutzt, daher ein Lock. Geladen wird
+    außerhalb des Locks; wurde der Eintrag währenddessen verworfen (Training gelöscht), wird das
+    Ergebnis nicht mehr aufgenommen.
+    """
+
+    def __init__(self, max_sessions=3):
+        self.max_sessions = max_sessions
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0  # zählt discard()/clear(), damit ein laufendes Laden nichts Veraltetes einträgt
+
+    def get(self, key, loader):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            generation = self._generation
+
+        data = loader()
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = data
+                while len(self._entries) > self.max_sessions:
+                    self._entries.popitem(last=False)  # am längsten nicht benutztes Training verwerfen
+        return data
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+
+class TrainingSession:
+    """Ein gespeichertes Training.
+
+    Name, Zeitstempel, Widerstandszusammenfassung und Kennzahlen sind immer da. Die
+    Messwerte (`data`) werden erst beim ersten Zugriff geladen und liegen im gemeinsamen
+    SampleCache, der sie nach LRU wieder freigibt.
+    """
+
+    def __init__(self, filename, training_name, timestamp, training_date, resistance_summary, aggregates,
+                 loader, cache):
+        self.filename = filename
+        self.training_name = training_name
+        self.timestamp = timestamp
+        self.training_date = training_date
+        self.resistance_summary = resistance_summary
+        self.aggregates = aggregates
+        self._loader = loader
+        self._cache = cache
+
+    @property
+    def data(self):
+        """Messwerte als MeasurementStore, bei Bedarf von der Karte geladen."""
+        return self._cache.get(self.filename, lambda: self._loader(self))
+
+    @property
+    def data_loaded(self):
+        return self.filename in self._cache
+
+    def release(self):
+        """Gibt die geladenen Messwerte wieder frei."""
+        self._cache.discard(self.filename)
+
+    def __repr__(self):
+        return f"TrainingSession({self.training_name!r}, {self.filename!r})"